@@ -1,2153 +1,3838 @@
-import streamlit as st
-import pandas as pd
-from datetime import datetime
-import os
-import requests
-import base64
-
-from datetime import datetime, date
-import calendar
-import plotly.graph_objects as go
-import plotly.express as px
-# -------------------------------------------------
-# GitHub Config (from Streamlit Secrets)
-# -------------------------------------------------
-
-BRANCH = "main"
-
-# -------------------------------------------------
-# Data Setup
-# -------------------------------------------------
-DATA_DIR = "data"
-CLIENTS_FILE = os.path.join(DATA_DIR, "clients.csv")
-HOURS_FILE = os.path.join(DATA_DIR, "hours.csv")
-GOALS_FILE = os.path.join(DATA_DIR, "goals.csv")
-CATEGORIES_FILE = os.path.join(DATA_DIR, "categories.csv")
-DAYS_OFF_FILE = os.path.join(DATA_DIR, "days_off.csv")
-UNENTERED_HOURS_FILE = os.path.join(DATA_DIR, "unentered_hours.csv")
-TODOS_FILE = os.path.join(DATA_DIR, "todos.csv")
-
-os.makedirs(DATA_DIR, exist_ok=True)
-st.set_page_config(layout="wide")
-
-# -------------------------------------------------
-# Custom CSS for Dark Theme and Boxed Forms
-# -------------------------------------------------
-# -------------------------------------------------
-# Improved Dark Theme CSS
-# -------------------------------------------------
-st.markdown("""
-<style>
-.todo-row-spacer { height: 10px; }
-
-.todo-colorbar {
-  width: 10px;
-  height: 48px;
-  border-radius: 6px;
-}
-
-.todo-text {
-  font-size: 1.05rem;
-  font-weight: 650;
-  color: #ffffff;
-  line-height: 1.1;
-}
-.todo-subtext {
-  font-size: 0.85rem;
-  color: #a1a1aa;
-  margin-top: 2px;
-}
-</style>
-""", unsafe_allow_html=True)
-
-
-
-# -------------------------------------------------
-# GitHub Functions
-# -------------------------------------------------
-
-
-
-
-# -------------------------------------------------
-# GitHub Config — public-safe defaults
-# -------------------------------------------------
-BRANCH = "main"
-
-# Your public repo full name (owner/repo)
-GITHUB_REPO = "cole-nash-plante/hours_app"
-
-# Read token from Streamlit Cloud secrets if set.
-# On a public repo, reads can be unauthenticated; writes need a token.
-GITHUB_TOKEN = None
-try:
-    # You can store this in Streamlit Cloud → App → Settings → Edit secrets
-    GITHUB_TOKEN = st.secrets.get("GITHUB_TOKEN", None)
-except Exception:
-    GITHUB_TOKEN = None
-
-# Build headers conditionally. Add 'Accept' for GitHub API v3.
-BASE_HEADERS = {"Accept": "application/vnd.github.v3+json"}
-AUTH_HEADERS = (
-    {**BASE_HEADERS, "Authorization": f"token {GITHUB_TOKEN}"}
-    if GITHUB_TOKEN
-    else BASE_HEADERS
-)
-
-# -------------------------------------------------
-# Data Setup
-# -------------------------------------------------
-DATA_DIR = "data"
-CLIENTS_FILE = os.path.join(DATA_DIR, "clients.csv")
-HOURS_FILE = os.path.join(DATA_DIR, "hours.csv")
-GOALS_FILE = os.path.join(DATA_DIR, "goals.csv")
-CATEGORIES_FILE = os.path.join(DATA_DIR, "categories.csv")
-TODOS_FILE = os.path.join(DATA_DIR, "todos.csv")
-PERIOD_FILE = os.path.join(DATA_DIR, "period_settings.csv")
-os.makedirs(DATA_DIR, exist_ok=True)
-st.set_page_config(layout="wide")
-
-# -------------------------------------------------
-# GitHub Functions
-# -------------------------------------------------
-def fetch_from_github(file_path: str):
-    """
-    Fetch file content from the public GitHub repo and save loly.
-    Works without a token if the repo/content is public.
-    """
-    url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{file_path}?ref={BRANCH}"
-    resp = requests.get(url, headers=AUTH_HEADERS)
-
-    if resp.status_code == 200:
-        j = resp.json()
-        content_b64 = j.get("content", "")
-        if content_b64:
-            content = base64.b64decode(content_b64).decode("utf-8")
-            # Ensure parent dirs exist
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
-        else:
-            st.warning(f"No content for {file_path} in GitHub response.")
-    elif resp.status_code == 404:
-        # File not yet in repo; create loly and push later if desired
-        st.info(f"'{file_path}' not found in GitHub (404). Will create locally.")
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        if file_path.endswith(".css"):
-            # start with empty css if missing
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write("")
-        # For CSVs, they’ll be created below from init_files
-    else:
-        st.warning(
-            f"Could not fetch '{file_path}' (HTTP {resp.status_code}). "
-            f"Response: {resp.text[:200]}"
-        )
-
-def push_to_github(file_path: str, commit_message: str):
-    """
-    Push local file to GitHub. Requires GITHUB_TOKEN with 'repo' scope.
-    """
-    if not GITHUB_TOKEN:
-        st.error(
-            "GitHub token not set. Add GITHUB_TOKEN in Streamlit secrets to enable pushing."
-        )
-        return False
-
-    url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{file_path}"
-    # Read local content
-    with open(file_path, "rb") as f:
-        content_b64 = base64.b64encode(f.read()).decode("utf-8")
-
-    # Check if file exists to get SHA
-    get_resp = requests.get(url, headers=AUTH_HEADERS)
-    sha = None
-    if get_resp.status_code == 200:
-        sha = get_resp.json().get("sha")
-
-    payload = {"message": commit_message, "content": content_b64, "branch": BRANCH}
-    if sha:
-        payload["sha"] = sha
-
-    put_resp = requests.put(url, json=payload, headers=AUTH_HEADERS)
-    if put_resp.status_code in (200, 201):
-        return True
-    st.error(
-        f"Failed to push '{file_path}' (HTTP {put_resp.status_code}). "
-        f"Response: {put_resp.text[:300]}"
-    )
-    return False
-
-def apply_css_from_github(css_path="data/style.css"):
-    """
-    Fetch CSS from GitHub (public read) and apply to the Streamlit app.
-    """
-    url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{css_path}?ref={BRANCH}"
-    resp = requests.get(url, headers=AUTH_HEADERS)
-    if resp.status_code == 200:
-        content = base64.b64decode(resp.json()["content"]).decode("utf-8")
-        st.markdown(f"<style>{content}</style>", unsafe_allow_html=True)
-    elif os.path.exists(css_path):
-        # Fallback: local CSS
-        with open(css_path, "r", encoding="utf-8") as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-    else:
-        st.warning(f"CSS file '{css_path}' not found in GitHub or locally.")
-
-# -------------------------------------------------
-# Initialize Data
-# -------------------------------------------------
-def apply_css_from_github(css_path="data/style.css"):
-    """Fetch CSS from GitHub using token and apply to Streamlit app."""
-    url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{css_path}?ref={BRANCH}"
-    response = requests.get(url, headers={"Authorization": f"token {GITHUB_TOKEN}"})
-    
-    if response.status_code == 200:
-        # Decode base64 content
-        content = base64.b64decode(response.json()["content"]).decode("utf-8")
-        # Inject CSS into Streamlit
-        st.markdown(f"<style>{content}</style>", unsafe_allow_html=True)
-    else:
-        st.warning(f"CSS file '{css_path}' not found in GitHub.")
-
-# Call this early in your app (after st.set_page_config)
-#apply_css_from_github()
-
-
-
-
-# Sync Files from GitHub
-for file in ["data/clients.csv", "data/period_settings.csv","data/hours.csv", "data/goals.csv", "data/days_off.csv", "data/categories.csv", "data/todos.csv", "data/style.css"]:
-    fetch_from_github(file)
-
-st.markdown('<link rel="stylesheet" href="YOUR_GITHUB_RAW_CSS_URL">', unsafe_allow_html=True)
-# Ensure files exist locally
-
-# Sync public files from GitHub
-for file in [
-    "data/clients.csv",
-    "data/hours.csv",
-    "data/goals.csv",
-    "data/categories.csv",
-    "data/unentered_hours.csv",
-    "data/todos.csv",
-    "data/style.css",
-    "data/period_settings.csv"
-]:
-    fetch_from_github(file)
-
-# Optionally apply CSS from the synced file
-
-
-# Ensure files exist locally (create empty CSVs if missing, then attempt to push if you have a token)
-init_files = [
-    ("data/clients.csv", ["Client"]),
-    ("data/hours.csv", ["Date", "Client", "Hours", "Description"]),
-    ("data/goals.csv", ["Month", "GoalHours"]),
-    ("data/categories.csv", ["Client", "Category"]),
-    ("data/todos.csv", ["Client", "Category", "Task", "Priority", "DateCreated", "DateCompleted"]),
-    ("data/days_off.csv", ["Date"]),
-    ("data/period_settings.csv", ["StartDate", "EndDate", "HoursGoal"]),
-    ("data/unentered_hours.csv", ["Date", "Client", "Hours", "Description"]),
-]
-for file, cols in init_files:
-    if not os.path.exists(file):
-        os.makedirs(os.path.dirname(file), exist_ok=True)
-        pd.DataFrame(columns=cols).to_csv(file, index=False)
-        # Push only if token exists (safe on public)
-        push_to_github(file, f"Initialize {file}")
-
-# -------------------------------------------------
-# Sidebar Navigation
-# -------------------------------------------------
-st.sidebar.title("Navigation")
-pages = ["Home", "Reports", "Data Entry", "Archive"]
-selected_page = st.sidebar.radio("Go to", pages)
-
-
-
-st.markdown("""
-<style>
-/* Dark Theme for Streamlit App */
-:root {
-  --bg-primary: #0f0f23;
-  --bg-secondary: #1a1a2e;
-  --bg-tertiary: #16213e;
-  --text-primary: #FFFFFF;
-  --text-secondary: #a1a1aa;
-  --accent: #9333ea;
-  --accent-hover: #a855f7;
-  --border: #27272a;
-  
-  /* Priority Colors */
-  --priority-high: #ef4444;
-  --priority-medium: #f97316;
-  --priority-low: #22c55e;
-  
-  /* Client Colors - Match these in your Streamlit app */
-  --client-1: #3b82f6;
-  --client-2: #10b981;
-  --client-3: #f59e0b;
-  --client-4: #ec4899;
-  --client-5: #8b5cf6;
-  --client-6: #06b6d4;
-}
-
-
-
-.stTextInput > div > div > input,
-.stNumberInput > div > div > input,
-.stTextArea textarea,
-.stSelectbox > div > div,
-.stDateInput > div > div > input {
-    color: #FFFFFF !important; /* Force white text */
-    font-size: 16px !important;
-    padding: 0.75rem !important;
-}
-/* Main Background */
-.stApp {
-  background-color: var(--bg-primary) !important;
-  color: var(--text-primary) !important;
-}
-
-/* Sidebar */
-section[data-testid="stSidebar"] {
-  background-color: var(--bg-secondary) !important;
-  border-right: 1px solid var(--border) !important;
-}
-
-/* Sidebar text and navigation */
-section[data-testid="stSidebar"] * {
-  color: var(--text-primary) !important;
-}
-
-section[data-testid="stSidebar"] label {
-  color: var(--text-primary) !important;
-  font-weight: 500 !important;
-}
-
-/* Radio buttons in sidebar navigation */
-section[data-testid="stSidebar"] [role="radiogroup"] label {
-  color: var(--text-primary) !important;
-}
-
-/* Selected navigation item */
-section[data-testid="stSidebar"] [data-baseweb="radio"] input:checked ~ div {
-  background-color: var(--accent) !important;
-  border-color: var(--accent) !important;
-}
-
-/* Headers */
-h1, h2, h3, h4, h5, h6 {
-  color: var(--text-primary) !important;
-  font-weight: 600 !important;
-}
-
-h1 {
-  font-size: 2rem !important;
-  margin-bottom: 1.5rem !important;
-}
-
-/* Tabs */
-.stTabs [data-baseweb="tab-list"] {
-  background-color: var(--bg-secondary) !important;
-  border-radius: 0.5rem !important;
-  padding: 0.25rem !important;
-  gap: 0.5rem !important;
-}
-
-.stTabs [data-baseweb="tab"] {
-  background-color: transparent !important;
-  color: var(--text-secondary) !important;
-  border-radius: 0.375rem !important;
-  padding: 0.5rem 1rem !important;
-  transition: all 0.2s !important;
-}
-
-.stTabs [aria-selected="true"] {
-  background-color: var(--accent) !important;
-  color: white !important;
-}
-
-/* Input Fields */
-.stTextInput > div > div > input,
-.stNumberInput > div > div > input,
-.stTextArea textarea,
-.stSelectbox > div > div,
-.stDateInput > div > div > input {
-  background-color: var(--bg-tertiary) !important;
-  color: var(--text-primary) !important;
-  border: 1px solid var(--border) !important;
-  border-radius: 0.375rem !important;
-  padding: 0.5rem !important;
-}
-
-.stTextInput > div > div > input:focus,
-.stNumberInput > div > div > input:focus,
-.stTextArea textarea:focus,
-.stSelectbox > div > div:focus,
-.stDateInput > div > div > input:focus {
-  border-color: var(--accent) !important;
-  box-shadow: 0 0 0 1px var(--accent) !important;
-}
-
-/* Buttons */
-.stButton > button {
-  background-color: var(--accent) !important;
-  color: white !important;
-  border: none !important;
-  border-radius: 0.375rem !important;
-  padding: 0.5rem 1.5rem !important;
-  font-weight: 500 !important;
-  transition: all 0.2s !important;
-}
-
-.stButton > button:hover {
-  background-color: var(--accent-hover) !important;
-  transform: translateY(-1px) !important;
-}
-
-/* Data Editor / DataFrame */
-.stDataFrame {
-  background-color: var(--bg-secondary) !important;
-  border-radius: 0.5rem !important;
-  overflow: hidden !important;
-}
-
-.stDataFrame [data-testid="stDataFrameResizable"] {
-  background-color: var(--bg-secondary) !important;
-}
-
-
-
-/* Priority Color Coding for To-Do List */
-.todo-high {
-  border-left: 4px solid var(--priority-high) !important;
-  background-color: rgba(239, 68, 68, 0.1) !important;
-  padding: 0.75rem !important;
-  margin: 0.5rem 0 !important;
-  border-radius: 0.375rem !important;
-}
-
-.todo-medium {
-  border-left: 4px solid var(--priority-medium) !important;
-  background-color: rgba(249, 158, 6, 0.1) !important;
-  padding: 0.75rem !important;
-  margin: 0.5rem 0 !important;
-  border-radius: 0.375rem !important;
-}
-
-.todo-low {
-  border-left: 4px solid var(--priority-low) !important;
-  background-color: rgba(34, 197, 94, 0.1) !important;
-  padding: 0.75rem !important;
-  margin: 0.5rem 0 !important;
-  border-radius: 0.375rem !important;
-}
-
-/* Priority Badges */
-.priority-badge {
-  display: inline-block;
-  padding: 0.25rem 0.75rem;
-  border-radius: 9999px;
-  font-size: 0.75rem;
-  font-weight: 600;
-  text-transform: uppercase;
-  letter-spacing: 0.05em;
-}
-
-.priority-high-badge {
-  background-color: var(--priority-high);
-  color: red;
-}
-
-.priority-medium-badge {
-  background-color: var(--priority-medium);
-  color: green;
-}
-
-.priority-low-badge {
-  background-color: var(--priority-low);
-  color: white;
-}
-
-.stMetric label {
-  color: var(--text-secondary) !important;
-}
-
-.stMetric [data-testid="stMetricValue"] {
-  color: var(--text-primary) !important;
-}
-
-/* Charts */
-.js-plotly-plot .plotly {
-  background-color: var(--bg-secondary) !important;
-  border-radius: 0.5rem !important;
-}
-
-.js-plotly-plot .plotly .bg {
-  fill: var(--bg-secondary) !important;
-}
-
-
-/* Success/Error Messages */
-.stSuccess {
-  background-color: rgba(34, 197, 94, 0.1) !important;
-  border-left: 4px solid var(--priority-low) !important;
-  color: var(--text-primary) !important;
-}
-
-.stError {
-  background-color: rgba(239, 68, 68, 0.1) !important;
-  border-left: 4px solid var(--priority-high) !important;
-  color: var(--text-primary) !important;
-}
-
-.stWarning {
-  background-color: rgba(249, 158, 6, 0.1) !important;
-  border-left: 4px solid var(--priority-medium) !important;
-  color: var(--text-primary) !important;
-}
-
-/* Scrollbar */
-::-webkit-scrollbar {
-  width: 8px;
-  height: 8px;
-}
-
-::-webkit-scrollbar-track {
-  background: var(--bg-primary);
-}
-
-::-webkit-scrollbar-thumb {
-  background: var(--border);
-  border-radius: 4px;
-}
-
-::-webkit-scrollbar-thumb:hover {
-  background: #3f3f46;
-}
-
-/* Radio Buttons and Checkboxes */
-.stRadio > div,
-.stCheckbox > div {
-  color: var(--text-primary) !important;
-}
-
-
-/* Make all form labels white */
-.stTextInput label,
-.stDateInput label,
-.stNumberInput label,
-.stTextArea label,
-.stSelectbox label,
-.stSlider label {
-    color: #FFFFFF !important;
-    font-weight: 600; /* Optional: make them bold */
-}
-
-/* Override the problematic padding */
-.stSelectbox > div > div {
-    padding: 0 !important; /* Remove extra padding */
-    display: flex !important;
-    align-items: center !important;
-}
-
-/* Style the actual text inside the select box */
-.stSelectbox div[data-baseweb="select"] span {
-    color: #D3D3D3 !important;
-    font-size: 16px !important;
-    line-height: 1.4 !important;
-}
-
-/* Dropdown options */
-ul[role="listbox"] li {
-    color: #D3D3D3 !important;
-    font-size: 16px !important;
-}
-</style>
-""", unsafe_allow_html=True)
-
-
-
-# Inject custom CSS for styling
-st.markdown("""
-<style>
-/* Dark background for the entire app */
-body {
-    background-color: #121212;
-    color: #e0e0e0;
-}
-
-/* Table styling */
-[data-testid="stDataFrame"] table {
-    border-collapse: collapse;
-    width: 100%;
-    background-color: #1e1e1e;
-    color: #f5f5f5;
-    border-radius: 8px;
-    overflow: hidden;
-}
-
-/* Remove unnecessary borders */
-[data-testid="stDataFrame"] table th, 
-[data-testid="stDataFrame"] table td {
-    border: none !important;
-    padding: 8px 12px;
-}
-
-/* Header styling */
-[data-testid="stDataFrame"] table th {
-    font-size: 14px; /* Smaller headers */
-    font-weight: 600;
-    background-color: #2c2c2c;
-    color: #ffffff;
-    text-transform: uppercase;
-}
-
-/* Row hover effect */
-[data-testid="stDataFrame"] table tr:hover {
-    background-color: #333333;
-}
-
-/* Rounded corners for the table container */
-[data-testid="stDataFrame"] {
-    border-radius: 10px;
-    box-shadow: 0 4px 10px rgba(0,0,0,0.3);
-}
-</style>
-""", unsafe_allow_html=True)
-
-# -------------------------------------------------
-# Page: Data Entry
-# -------------------------------------------------
-
-if selected_page == "Home":
-    # Load required data
-    df_clients = pd.read_csv(CLIENTS_FILE)
-    df_todos = pd.read_csv(TODOS_FILE)
-    df_categories = pd.read_csv(CATEGORIES_FILE)
-    df_hours = pd.read_csv(HOURS_FILE)
-
-    # Ensure required columns exist in df_todos
-    required_cols = ["Client", "Category", "Task", "Priority", "DateCreated", "DateCompleted", "Notes"]
-    for col in required_cols:
-        if col not in df_todos.columns:
-            df_todos[col] = ""
-
-    
-
-    # -------------------------------
-    # Add To-Do Item Section
-    # -------------------------------
-    st.subheader("Add To-Do Item")
-    if len(df_clients) == 0:
-        st.warning("Add clients first!")
-    else:
-        col_date, col_client, col_task, col_priority, col_btn = st.columns([0.8, 1.5, 1.5, 3, 1])
-        with col_date:
-            todo_date = st.date_input("Date Created", datetime.today(), key="todo_date")
-        with col_client:
-            todo_client = st.selectbox("Client", df_clients["Client"].tolist(), key="todo_client")
-        with col_task:
-            todo_task = st.text_input("Task", key="todo_task")
-        with col_priority:
-            priority = st.slider("Priority", 1, 5, 3, key="todo_priority")
-        with col_btn:
-            if st.button("Add Task", key="add_task"):
-                if todo_task.strip() != "No categories":
-                    df_todos.loc[len(df_todos)] = [todo_client, "General", todo_task, priority, str(todo_date), "", ""]
-                    df_todos.to_csv(TODOS_FILE, index=False)
-                    push_to_github("data/todos.csv", "Added new task")
-                    st.success("Task added successfully!")
-                else:
-                    st.error("Please enter a valid task and category.")
-
-    # -------------------------------
-    # Active To-Dos (ONE ROW + AUTO-SAVE PRIORITY)
-    # -------------------------------
-    st.subheader("Active To-Dos")
-
-    # Ensure required columns exist
-    required_cols = ["Client", "Category", "Task", "Priority", "DateCreated", "DateCompleted"]
-    for col in required_cols:
-        if col not in df_todos.columns:
-            df_todos[col] = ""
-
-    # Normalize fields
-    df_todos["Client"] = df_todos["Client"].astype(str).fillna("").str.strip()
-    df_todos["Category"] = df_todos["Category"].astype(str).fillna("").str.strip()
-    df_todos["Task"] = df_todos["Task"].astype(str).fillna("").str.strip()
-    df_todos["DateCompleted"] = df_todos["DateCompleted"].astype(str).fillna("").str.strip()
-    df_todos["Priority"] = pd.to_numeric(df_todos["Priority"], errors="coerce").fillna(3).astype(int)
-
-    # Active = not completed AND task not blank
-    active_todos_all = df_todos[(df_todos["DateCompleted"] == "") & (df_todos["Task"] != "")].copy()
-
-    # Build client filter options (keep your default behavior: only clients w/ active tasks selected by default)
-    all_clients = sorted(set(
-        df_clients["Client"].dropna().astype(str).str.strip().tolist()
-        + df_todos["Client"].dropna().astype(str).str.strip().tolist()
-    ))
-    clients_with_active = sorted(active_todos_all["Client"].dropna().unique().tolist())
-
-    selected_clients = st.multiselect(
-        "Filter by Client",
-        options=all_clients,
-        default=clients_with_active,
-        key="filter_clients"
-    )
-
-    active_todos = active_todos_all[active_todos_all["Client"].isin(selected_clients)].copy()
-
-    if active_todos.empty:
-        st.info("No active tasks for selected clients.")
-    else:
-        # Sort: highest priority first, then newest date created if parseable
-        active_todos["_DateCreatedTs"] = pd.to_datetime(active_todos["DateCreated"], errors="coerce")
-        active_todos = active_todos.sort_values(by=["Priority", "_DateCreatedTs"], ascending=[False, False])
-
-        # Client -> color map
-        client_color_map = {}
-        if "Color" in df_clients.columns:
-            tmp = df_clients.dropna(subset=["Client"]).copy()
-            tmp["Client"] = tmp["Client"].astype(str).str.strip()
-            tmp["Color"] = tmp["Color"].astype(str).fillna("")
-            client_color_map = dict(zip(tmp["Client"], tmp["Color"]))
-
-        # Render: one row per todo
-        for idx, row in active_todos.iterrows():
-            client = row["Client"]
-            category = row.get("Category", "")
-            task = row["Task"]
-            created = row.get("DateCreated", "")
-            priority = int(row.get("Priority", 3))
-            color = client_color_map.get(client, "#333333")
-
-            # Layout: color | text | slider | button
-            c0, c1, c2, c3 = st.columns([0.2, 0.54, 0.22, 0.05], vertical_alignment="center")
-
-            with c0:
-                st.markdown(f"<div class='todo-colorbar' style='background:{color};'></div>", unsafe_allow_html=True)
-
-            with c1:
-                st.markdown(f"<div class='todo-text'>{task}</div>", unsafe_allow_html=True)
-                st.markdown(
-                    f"<div class='todo-subtext'>{client} • {category} • Created: {created}</div>",
-                    unsafe_allow_html=True
-                )
-
-            # Priority slider (AUTO-SAVE)
-            with c2:
-                new_priority = st.slider(
-                    "Priority",
-                    1, 5, max(1, min(5, priority)),
-                    key=f"prio_{idx}",
-                    label_visibility="collapsed"
-                )
-
-            # Marked as entered button
-            with c3:
-                if st.button("✓", key=f"entered_{idx}", use_container_width=True):
-                    df_todos.at[idx, "DateCompleted"] = str(datetime.today().date())
-                    df_todos.to_csv(TODOS_FILE, index=False)
-                    push_to_github("data/todos.csv", "Marked task as entered/completed")
-                    st.rerun()
-
-            # If slider moved, save immediately
-            if int(new_priority) != int(priority):
-                df_todos.at[idx, "Priority"] = int(new_priority)
-                df_todos.to_csv(TODOS_FILE, index=False)
-                push_to_github("data/todos.csv", "Auto-updated task priority")
-                # Optional: tiny toast-like feedback
-                # st.success("Priority saved!", icon="✅")
-
-            # spacing between items
-            st.markdown("<div class='todo-row-spacer'></div>", unsafe_allow_html=True)
-    # -------------------------------
-    # Log Hours Section
-    # -------------------------------
-    st.subheader("Log Hours")
-    if len(df_clients) == 0:
-        st.warning("Add clients first!")
-    else:
-        col1, col2, col3, col4, col5 = st.columns([2, 2, 1, 3, 1])
-        with col1:
-            client = st.selectbox("Client", df_clients["Client"].tolist(), key="log_client")
-        with col2:
-            date_val = st.date_input("Date", datetime.today(), key="log_date")
-        with col3:
-            hours = st.number_input("Hours", min_value=0.0, step=0.25, key="log_hours")
-        with col4:
-            description = st.text_input("Description", key="log_description")
-        with col5:
-            if st.button("Save Hours", key="save_hours"):
-                new_row = {
-                    "Date": str(date_val),
-                    "Client": client,
-                    "Hours": hours,
-                    "Description": description
-                }
-            
-                # Load unentered hours
-                if os.path.exists(UNENTERED_HOURS_FILE):
-                    unentered_df = pd.read_csv(UNENTERED_HOURS_FILE)
-                else:
-                    unentered_df = pd.DataFrame(
-                        columns=["Date", "Client", "Hours", "Description"]
-                    )
-            
-                unentered_df = pd.concat(
-                    [unentered_df, pd.DataFrame([new_row])],
-                    ignore_index=True
-                )
-            
-                unentered_df.to_csv(UNENTERED_HOURS_FILE, index=False)
-                push_to_github(
-                    "data/unentered_hours.csv",
-                    "Added new unentered hours"
-                )
-            
-                st.success("Hours added to unentered backlog.")
-             
-  # -------------------------------
-    # Unentered Hours (Persistent Backlog)
-    # -------------------------------
-    st.subheader("Unentered Hours")
-    
-    # Ensure file exists
-    if not os.path.exists(UNENTERED_HOURS_FILE):
-        pd.DataFrame(columns=["Date", "Client", "Hours", "Description"]).to_csv(
-            UNENTERED_HOURS_FILE, index=False
-        )
-    
-    raw = pd.read_csv(UNENTERED_HOURS_FILE)
-    
-    # Ensure required columns exist (defensive)
-    for col in ["Date", "Client", "Hours", "Description"]:
-        if col not in raw.columns:
-            raw[col] = "" if col != "Hours" else 0
-    
-    # Normalize types
-    raw["Client"] = raw["Client"].astype(str).str.strip()
-    raw["Description"] = raw["Description"].astype(str).fillna("").str.strip()
-    raw["Hours"] = pd.to_numeric(raw["Hours"], errors="coerce").fillna(0)
-    
-    # Parse dates -> keep as date (not timestamp)
-    raw["Date"] = pd.to_datetime(raw["Date"], errors="coerce").dt.date
-    
-    # IMPORTANT: Strip any previously-saved TOTAL rows (cleans “polluted” files)
-    is_total = raw["Description"].str.upper().eq("TOTAL")
-    stale_total_count = int(is_total.sum())
-    raw = raw[~is_total].copy()
-    
-    if stale_total_count > 0:
-        st.info(
-            f"Found {stale_total_count} stale TOTAL row(s) in unentered_hours.csv. "
-            "They will not be used and will be removed next time you save."
-        )
-    
-    # Drop empty rows
-    raw = raw.dropna(subset=["Date"])
-    raw = raw[raw["Client"] != ""].copy()
-    # -----------------
-    # Filters
-    # -----------------
-    st.markdown("### Filters")
-    
-    filtered_raw = raw.copy()
-    
-    if len(raw) > 0:
-    
-        # Available dates from unentered_hours.csv only, newest first
-        available_dates = sorted(
-            raw["Date"].dropna().unique(),
-            reverse=True
-        )
-    
-        selected_dates = st.multiselect(
-            "Dates",
-            options=available_dates,
-            default=available_dates,
-            format_func=lambda x: x.strftime("%Y-%m-%d"),
-            key="unentered_date_filter"
-        )
-    
-        # Apply date filter
-        if selected_dates:
-            filtered_raw = filtered_raw[
-                filtered_raw["Date"].isin(selected_dates)
-            ].copy()
-        else:
-            filtered_raw = filtered_raw.iloc[0:0].copy()
-    
-        # Available clients after selected date filter
-        available_clients = sorted(
-            filtered_raw["Client"]
-            .dropna()
-            .astype(str)
-            .unique()
-            .tolist()
-        )
-    
-        selected_unentered_client = st.selectbox(
-            "Client",
-            options=["All Clients"] + available_clients,
-            index=0,
-            key="unentered_client_filter"
-        )
-    
-        # Apply client filter
-        if selected_unentered_client != "All Clients":
-            filtered_raw = filtered_raw[
-                filtered_raw["Client"] == selected_unentered_client
-            ].copy()
-    
-    else:
-        filtered_raw = raw.copy()
-    
-    # -----------------
-    # Build editable display table
-    # -----------------
-    if filtered_raw.empty:
-        st.info("No unentered hours match the selected filters.")
-    
-        edited_unentered = pd.DataFrame(
-            columns=["Date", "Client", "Hours", "Description"]
-        )
-    
-    else:
-        # Detail rows for editing
-        detail = filtered_raw.copy()
-        detail["Date"] = pd.to_datetime(
-            detail["Date"],
-            errors="coerce"
-        ).dt.strftime("%Y-%m-%d")
-    
-        detail = detail.sort_values(
-            by=["Client", "Date"]
-        ).reset_index(drop=True)
-    
-        # Computed totals for display only
-        totals = (
-            filtered_raw.groupby(
-                ["Client", "Date"],
-                as_index=False
-            )["Hours"]
-            .sum()
-            .sort_values(
-                by=["Date", "Client"]
-            )
-            .reset_index(drop=True)
-        )
-    
-        totals["Description"] = "TOTAL"
-        totals["Date"] = pd.to_datetime(
-            totals["Date"],
-            errors="coerce"
-        ).dt.strftime("%Y-%m-%d")
-    
-        # Display details first, totals at bottom
-        unentered_display = pd.concat(
-            [detail, totals],
-            ignore_index=True
-        )
-    
-        edited_unentered = st.data_editor(
-            unentered_display,
-            num_rows="dynamic",
-            hide_index=True,
-            key="unentered_hours_editor"
-        )
-    
-    col_save, col_mark = st.columns([1, 1])
-    
-    # -----------------
-    # Save edits
-    # IMPORTANT:
-    # This saves the currently filtered/visible rows only.
-    # -----------------
-    with col_save:
-        if st.button("Save Unentered Changes", key="save_unentered_changes"):
-    
-            cleaned = edited_unentered.dropna(how="all").copy()
-    
-            # Normalize again from edited grid
-            for col in ["Date", "Client", "Hours", "Description"]:
-                if col not in cleaned.columns:
-                    cleaned[col] = "" if col != "Hours" else 0
-    
-            cleaned["Client"] = cleaned["Client"].astype(str).str.strip()
-            cleaned["Description"] = cleaned["Description"].astype(str).fillna("").str.strip()
-            cleaned["Hours"] = pd.to_numeric(cleaned["Hours"], errors="coerce").fillna(0)
-            cleaned["Date"] = pd.to_datetime(cleaned["Date"], errors="coerce")
-    
-            # Keep ONLY detail rows, exclude TOTAL rows
-            cleaned = cleaned[
-                ~cleaned["Description"].str.upper().eq("TOTAL")
-            ].copy()
-    
-            # Drop junk rows
-            cleaned = cleaned.dropna(subset=["Date"])
-            cleaned = cleaned[cleaned["Client"] != ""].copy()
-    
-            # Store canonical date format
-            cleaned["Date"] = cleaned["Date"].dt.strftime("%Y-%m-%d")
-    
-            # Save only real rows from current edited table
-            cleaned[["Date", "Client", "Hours", "Description"]].to_csv(
-                UNENTERED_HOURS_FILE,
-                index=False
-            )
-    
-            push_to_github(
-                "data/unentered_hours.csv",
-                "Updated unentered hours backlog"
-            )
-    
-            st.success("Unentered hours saved. Totals are computed, not stored.")
-            st.rerun()
-    
-    # -----------------
-    # Mark as entered
-    # -----------------
-    with col_mark:
-    
-        detail_only = edited_unentered.copy()
-    
-        for col in ["Date", "Client", "Hours", "Description"]:
-            if col not in detail_only.columns:
-                detail_only[col] = "" if col != "Hours" else 0
-    
-        detail_only["Client"] = detail_only["Client"].astype(str).str.strip()
-        detail_only["Description"] = detail_only["Description"].astype(str).fillna("").str.strip()
-    
-        # Exclude TOTAL rows
-        detail_only = detail_only[
-            ~detail_only["Description"].str.upper().eq("TOTAL")
-        ].copy()
-    
-        detail_only = detail_only[detail_only["Client"] != ""].copy()
-    
-        clients_in_table = sorted(
-            detail_only["Client"]
-            .dropna()
-            .unique()
-            .tolist()
-        )
-    
-        if clients_in_table:
-            selected_client_to_enter = st.selectbox(
-                "Mark entries as entered by client",
-                clients_in_table,
-                key="mark_unentered_client"
-            )
-    
-            if st.button("✓", key="mark_unentered_entered"):
-    
-                to_post = detail_only[
-                    detail_only["Client"] == selected_client_to_enter
-                ].copy()
-    
-                # Load full unentered file again so clearing does not accidentally depend on filtered view
-                full_unentered = pd.read_csv(UNENTERED_HOURS_FILE)
-    
-                for col in ["Date", "Client", "Hours", "Description"]:
-                    if col not in full_unentered.columns:
-                        full_unentered[col] = "" if col != "Hours" else 0
-    
-                full_unentered["Client"] = full_unentered["Client"].astype(str).str.strip()
-                full_unentered["Description"] = full_unentered["Description"].astype(str).fillna("").str.strip()
-                full_unentered["Hours"] = pd.to_numeric(full_unentered["Hours"], errors="coerce").fillna(0)
-                full_unentered["Date"] = pd.to_datetime(full_unentered["Date"], errors="coerce").dt.strftime("%Y-%m-%d")
-    
-                # Normalize posted rows
-                to_post["Hours"] = pd.to_numeric(to_post["Hours"], errors="coerce").fillna(0)
-                to_post["Date"] = pd.to_datetime(to_post["Date"], errors="coerce").dt.strftime("%Y-%m-%d")
-    
-                # Append to hours.csv
-                hours_df = pd.read_csv(HOURS_FILE)
-    
-                for col in ["Date", "Client", "Hours", "Description"]:
-                    if col not in hours_df.columns:
-                        hours_df[col] = "" if col != "Hours" else 0
-    
-                combined = pd.concat(
-                    [
-                        hours_df[["Date", "Client", "Hours", "Description"]],
-                        to_post[["Date", "Client", "Hours", "Description"]]
-                    ],
-                    ignore_index=True
-                )
-    
-                combined["Date"] = pd.to_datetime(
-                    combined["Date"],
-                    errors="coerce"
-                ).dt.strftime("%Y-%m-%d")
-    
-                combined["Hours"] = pd.to_numeric(
-                    combined["Hours"],
-                    errors="coerce"
-                ).fillna(0)
-    
-                combined.to_csv(HOURS_FILE, index=False)
-    
-                push_to_github(
-                    "data/hours.csv",
-                    f"Entered hours for {selected_client_to_enter}"
-                )
-    
-                # Remove only rows that were actually posted from the full unentered file
-                post_keys = to_post[["Date", "Client", "Hours", "Description"]].copy()
-                post_keys["Hours"] = pd.to_numeric(post_keys["Hours"], errors="coerce").fillna(0)
-    
-                full_compare = full_unentered[["Date", "Client", "Hours", "Description"]].copy()
-                full_compare["Hours"] = pd.to_numeric(full_compare["Hours"], errors="coerce").fillna(0)
-    
-                rows_to_remove = full_compare.merge(
-                    post_keys.drop_duplicates(),
-                    on=["Date", "Client", "Hours", "Description"],
-                    how="left",
-                    indicator=True
-                )["_merge"].eq("both")
-    
-                remaining = full_unentered.loc[~rows_to_remove].copy()
-    
-                remaining[["Date", "Client", "Hours", "Description"]].to_csv(
-                    UNENTERED_HOURS_FILE,
-                    index=False
-                )
-    
-                push_to_github(
-                    "data/unentered_hours.csv",
-                    f"Cleared unentered hours for {selected_client_to_enter}"
-                )
-    
-                st.success(
-                    f"Hours for {selected_client_to_enter} marked as entered."
-                )
-    
-                st.rerun()
-    
-        else:
-            st.info("No unentered hours.")
-
-    
-
-elif selected_page == "Reports":
-    st.title("Reports")
-
-    # -----------------------------
-    # File paths (use global constants where possible)
-    # -----------------------------
-    HOURS_FILE = os.path.join(DATA_DIR, "hours.csv")
-    DAYS_OFF_FILE = os.path.join(DATA_DIR, "days_off.csv")
-    CLIENTS_FILE = os.path.join(DATA_DIR, "clients.csv")
-    PERIOD_FILE = os.path.join(DATA_DIR, "period_settings.csv")
-    ARCHIVE_CLIENTS = os.path.join(DATA_DIR, "archive_clients.csv")
-
-    # -----------------------------
-    # Ensure required files exist (safe defaults)
-    # -----------------------------
-    if not os.path.exists(HOURS_FILE):
-        pd.DataFrame(columns=["Date", "Client", "Hours", "Description"]).to_csv(HOURS_FILE, index=False)
-
-    if not os.path.exists(DAYS_OFF_FILE):
-        pd.DataFrame(columns=["Date"]).to_csv(DAYS_OFF_FILE, index=False)
-
-    if not os.path.exists(CLIENTS_FILE):
-        pd.DataFrame(columns=["Client", "Color"]).to_csv(CLIENTS_FILE, index=False)
-
-    if not os.path.exists(ARCHIVE_CLIENTS):
-        pd.DataFrame(columns=["Client", "Color"]).to_csv(ARCHIVE_CLIENTS, index=False)
-
-    # period_settings.csv is single-row source of truth
-    if not os.path.exists(PERIOD_FILE):
-        # Create a default single-row period + goal
-        today_tmp = date.today()
-        pd.DataFrame([{
-            "StartDate": str(date(today_tmp.year, 1, 1)),
-            "EndDate": str(date(today_tmp.year, 12, 31)),
-            "HoursGoal": 0
-        }]).to_csv(PERIOD_FILE, index=False)
-        push_to_github("data/period_settings.csv", "Initialized period_settings.csv (single row)")
-
-    # -----------------------------
-    # Load data
-    # -----------------------------
-    hours_df = pd.read_csv(HOURS_FILE)
-    days_off_df = pd.read_csv(DAYS_OFF_FILE)
-    df_clients_active = pd.read_csv(CLIENTS_FILE)
-    df_archive = pd.read_csv(ARCHIVE_CLIENTS)
-
-    # Combine active + archive clients for charts/colors
-    df_clients = pd.concat([df_clients_active, df_archive], ignore_index=True)
-
-    # Safe conversions
-    hours_df["Date"] = pd.to_datetime(hours_df.get("Date", None), errors="coerce")
-    hours_df["Hours"] = pd.to_numeric(hours_df.get("Hours", 0), errors="coerce").fillna(0)
-
-    days_off_df["Date"] = pd.to_datetime(days_off_df.get("Date", None), errors="coerce")
-
-    hours_df = hours_df.dropna(subset=["Date"])
-    days_off_df = days_off_df.dropna(subset=["Date"])
-
-    # -----------------------------
-    # Load period settings (single row)
-    # -----------------------------
-    period_settings = pd.read_csv(PERIOD_FILE)
-    period_settings.columns = [c.strip() for c in period_settings.columns]  # handle whitespace
-    # Ensure columns exist
-    for col in ["StartDate", "EndDate", "HoursGoal"]:
-        if col not in period_settings.columns:
-            period_settings[col] = ""
-
-    period_start = pd.to_datetime(period_settings["StartDate"].iloc[0], errors="coerce")
-    period_end = pd.to_datetime(period_settings["EndDate"].iloc[0], errors="coerce")
-    hours_goal = pd.to_numeric(period_settings["HoursGoal"].iloc[0], errors="coerce")
-
-    if pd.isna(period_start) or pd.isna(period_end) or pd.isna(hours_goal):
-        st.error("period_settings.csv must contain valid StartDate, EndDate, and HoursGoal (single row).")
-        st.stop()
-
-    period_start = period_start.date()
-    period_end = period_end.date()
-    hours_goal = float(hours_goal)
-
-    now = datetime.today()
-    today = now.date()
-
-    # -----------------------------
-    # Helper functions (business-day aware)
-    # -----------------------------
-    def business_days(start_d: date, end_d: date):
-        """Return list of business-day dates (Mon-Fri) between start_d and end_d inclusive."""
-        if start_d > end_d:
-            return []
-        rng = pd.date_range(start=start_d, end=end_d, freq="B")
-        return [d.date() for d in rng]
-
-    def time_off_count(start_d: date, end_d: date):
-        """Count time off days in [start_d, end_d] that are business days (weekdays only)."""
-        bdays = set(business_days(start_d, end_d))
-        off_days = set(days_off_df["Date"].dt.date.tolist())
-        return len(bdays.intersection(off_days))
-
-    def clamp_to_period(start_d: date, end_d: date):
-        """Clamp a date range to the performance period."""
-        s = max(start_d, period_start)
-        e = min(end_d, period_end)
-        if s > e:
-            return None, None
-        return s, e
-
-    # -----------------------------
-    # Period-scoped slices
-    # -----------------------------
-    # Hours to date in period (only dates within [period_start, min(today, period_end)])
-    period_to_date_end = min(today, period_end)
-    if period_to_date_end < period_start:
-        hours_to_date_in_period = 0.0
-    else:
-        hours_to_date_in_period = float(
-            hours_df.loc[
-                (hours_df["Date"].dt.date >= period_start) &
-                (hours_df["Date"].dt.date <= period_to_date_end),
-                "Hours"
-            ].sum()
-        )
-
-    remaining_hours_in_period = max(hours_goal - hours_to_date_in_period, 0.0)
-
-    # Remaining business days in period: "weekdays left" -> exclude today
-    remaining_start = max(period_start, (pd.Timestamp(today) + pd.Timedelta(days=1)).date())
-    if remaining_start > period_end:
-        remaining_bdays = []
-    else:
-        remaining_bdays = business_days(remaining_start, period_end)
-
-    remaining_time_off = time_off_count(remaining_start, period_end) if remaining_bdays else 0
-    remaining_workdays = max(len(remaining_bdays) - remaining_time_off, 0)
-
-    # BAN 1: Required Avg Hours/Day for remainder of period
-    if remaining_workdays > 0:
-        req_avg_hours_per_day = remaining_hours_in_period / remaining_workdays
-    else:
-        req_avg_hours_per_day = 0.0
-
-    # Week boundaries (Mon-Fri)
-    start_of_week = (pd.Timestamp(today) - pd.Timedelta(days=pd.Timestamp(today).weekday())).date()  # Monday
-    end_of_week = (pd.Timestamp(start_of_week) + pd.Timedelta(days=4)).date()  # Friday
-
-    # Clamp week to period
-    wk_s, wk_e = clamp_to_period(start_of_week, end_of_week)
-    if wk_s is None:
-        week_workdays_in_period = 0
-        time_off_this_week = 0
-        actual_hours_this_week = 0.0
-    else:
-        week_workdays_in_period = len(business_days(wk_s, wk_e))
-        time_off_this_week = time_off_count(wk_s, wk_e)
-        actual_hours_this_week = float(
-            hours_df.loc[
-                (hours_df["Date"].dt.date >= wk_s) &
-                (hours_df["Date"].dt.date <= wk_e),
-                "Hours"
-            ].sum()
-        )
-
-    # BAN 2 & Row2 Goal week hours
-    goal_hours_this_week = req_avg_hours_per_day * max(week_workdays_in_period - time_off_this_week, 0)
-
-    # Month boundaries (calendar month)
-    month_start = date(today.year, today.month, 1)
-    month_end = date(today.year, today.month, calendar.monthrange(today.year, today.month)[1])
-
-    # Clamp month to period
-    mo_s, mo_e = clamp_to_period(month_start, month_end)
-    if mo_s is None:
-        month_workdays_in_period = 0
-        time_off_this_month = 0
-        actual_hours_this_month = 0.0
-    else:
-        month_workdays_in_period = len(business_days(mo_s, mo_e))
-        time_off_this_month = time_off_count(mo_s, mo_e)
-        actual_hours_this_month = float(
-            hours_df.loc[
-                (hours_df["Date"].dt.date >= mo_s) &
-                (hours_df["Date"].dt.date <= min(today, mo_e)),
-                "Hours"
-            ].sum()
-        )
-
-    # Month goal based on BAN daily requirement * planned working days in month (period-only, weekdays only)
-    month_goal_hours = req_avg_hours_per_day * max(month_workdays_in_period - time_off_this_month, 0)
-
-    # Remaining workdays in month (exclude today for "remaining")
-    remaining_month_start = max(mo_s, (pd.Timestamp(today) + pd.Timedelta(days=1)).date())
-    if mo_s is None or remaining_month_start > mo_e:
-        remaining_month_workdays = 0
-        remaining_month_time_off = 0
-    else:
-        rem_month_bdays = business_days(remaining_month_start, mo_e)
-        remaining_month_time_off = time_off_count(remaining_month_start, mo_e)
-        remaining_month_workdays = max(len(rem_month_bdays) - remaining_month_time_off, 0)
-
-    # BAN 3: Required Avg Hours/Workday to hit THIS month's goal
-    remaining_month_hours_needed = max(month_goal_hours - actual_hours_this_month, 0.0)
-    if remaining_month_workdays > 0:
-        req_avg_hours_per_day_month = remaining_month_hours_needed / remaining_month_workdays
-    else:
-        req_avg_hours_per_day_month = 0.0
-
-    # Pace since start of period excluding time off (your Q10)
-    period_elapsed_end = min(today, period_end)
-    if period_elapsed_end < period_start:
-        pace_period = 0.0
-    else:
-        elapsed_bdays = business_days(period_start, period_elapsed_end)
-        elapsed_time_off = time_off_count(period_start, period_elapsed_end) if elapsed_bdays else 0
-        elapsed_workdays = max(len(elapsed_bdays) - elapsed_time_off, 0)
-        if elapsed_workdays > 0:
-            pace_period = hours_to_date_in_period / elapsed_workdays
-        else:
-            pace_period = 0.0
-    
-     # ===========================
-    # BANS — WEEK / MONTH / PERIOD
-    # ===========================
-    
-    def ban_row(label, avg_req, goal, actual, delta_label, delta_value):
-        st.markdown(f"### {label}")
-        c1, c2, c3 = st.columns([2, 1, 1])
-    
-        with c1:
-            st.metric(
-                "Avg Hours / Day (Required)",
-                f"{avg_req:.2f}",
-                delta=f"{delta_label}: {delta_value:.2f}"
-            )
-        with c2:
-            st.metric("Goal Hours", f"{goal:.2f}")
-        with c3:
-            st.metric("Actual Hours", f"{actual:.2f}")
-    
-        st.markdown("---")
-    
-    
-    st.markdown('<div class="form-box">', unsafe_allow_html=True)
-    
-    # WEEK
-    remaining_week_days = max(week_workdays_in_period - time_off_this_week, 1)
-    req_avg_week = max(
-        (goal_hours_this_week - actual_hours_this_week) / remaining_week_days,
-        0
-    )
-    
-    ban_row(
-        "WEEK",
-        req_avg_week,
-        goal_hours_this_week,
-        actual_hours_this_week,
-        "Change since week start",
-        req_avg_week - req_avg_hours_per_day
-    )
-    
-    # MONTH
-    ban_row(
-        "MONTH",
-        req_avg_hours_per_day_month,
-        month_goal_hours,
-        actual_hours_this_month,
-        "Change since month start",
-        req_avg_hours_per_day_month - req_avg_hours_per_day
-    )
-    
-    # PERIOD
-    ban_row(
-        "PERIOD",
-        req_avg_hours_per_day,
-        hours_goal,
-        hours_to_date_in_period,
-        "Change since period start",
-        req_avg_hours_per_day - pace_period
-    )
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-    # -----------------------------
-    # ROW 3: Weekly Snapshot (KEEP AS IS)
-    # -----------------------------
-    st.markdown('<div class="form-box">', unsafe_allow_html=True)
-    if "week_offset" not in st.session_state:
-        st.session_state.week_offset = 0
-
-    today_ts = pd.Timestamp.today()
-    start_of_week_ts = (today_ts + pd.Timedelta(weeks=st.session_state.week_offset)).normalize() - pd.Timedelta(days=today_ts.weekday())
-    end_of_week_ts = start_of_week_ts + pd.Timedelta(days=6)
-    week_label = f"{start_of_week_ts.strftime('%b %d')} - {end_of_week_ts.strftime('%b %d')}"
-
-    st.subheader(f"Weekly Snapshot: Billed Hours by Client ({week_label})")
-
-    nav_col1, nav_col2 = st.columns([1, 1])
-    with nav_col1:
-        if st.button("⬅ Previous Week"):
-            st.session_state.week_offset -= 1
-    with nav_col2:
-        if st.button("Next Week ➡"):
-            st.session_state.week_offset += 1
-
-    weekly_data = hours_df[(hours_df["Date"] >= start_of_week_ts) & (hours_df["Date"] <= end_of_week_ts)]
-
-    # Client colors map (safe fallback)
-    client_colors = {}
-    if "Client" in df_clients.columns:
-        if "Color" in df_clients.columns:
-            client_colors = {row["Client"]: row["Color"] for _, row in df_clients.dropna(subset=["Client"]).iterrows()}
-
-    weekdays = pd.date_range(start_of_week_ts, end_of_week_ts, freq="D")
-    weekdays = [d for d in weekdays if d.weekday() < 5]
-
-    fig_weekly = go.Figure()
-    for client in weekly_data["Client"].dropna().unique():
-        client_df = (
-            weekly_data[weekly_data["Client"] == client]
-            .groupby("Date")["Hours"]
-            .sum()
-            .reindex(weekdays, fill_value=0)
-        )
-        fig_weekly.add_trace(go.Scatter(
-            x=[d.strftime("%a") for d in weekdays],
-            y=client_df.values,
-            mode="lines+markers",
-            name=client,
-            line=dict(color=client_colors.get(client, "#FFFFFF"), width=4),
-            marker=dict(size=10),
-            hovertemplate="Client: " + str(client) + "<br>Day: %{x}<br>Hours: %{y}<extra></extra>"
-        ))
-
-    fig_weekly.update_layout(
-        plot_bgcolor="#0f0f23",
-        paper_bgcolor="#0f0f23",
-        font=dict(color="#FFFFFF", size=14),
-        xaxis=dict(title="Day of Week", color="#FFFFFF", tickfont=dict(color="#FFFFFF"), showgrid=True, gridcolor="#FFFFFF"),
-        yaxis=dict(title="Hours", color="#FFFFFF", tickfont=dict(color="#FFFFFF"), showgrid=True, gridcolor="#FFFFFF"),
-        legend=dict(font=dict(color="#FFFFFF", size=18, family="Arial Bold"), orientation="h", yanchor="bottom", y=-0.3, xanchor="center", x=0.5),
-        margin=dict(l=40, r=40, t=40, b=80)
-    )
-    st.plotly_chart(fig_weekly, use_container_width=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-
-    # -----------------------------
-    # ROW 4: Monthly Planned vs Actual + Pie (30 days default + date range picker)
-    # -----------------------------
-    st.markdown('<div class="form-box">', unsafe_allow_html=True)
-    col_left, col_right = st.columns([2, 1])
-
-    # Build all-time monthly actuals
-    hours_df["MonthDate"] = hours_df["Date"].dt.to_period("M").dt.to_timestamp()
-    monthly_actual_all = (
-        hours_df.groupby("MonthDate", as_index=False)["Hours"]
-        .sum()
-        .rename(columns={"Hours": "ActualHours"})
-        .sort_values("MonthDate")
-        .reset_index(drop=True)
-    )
-
-    # Build monthly planned for months in period only
-    # PlannedHours(month) = BAN1_req_avg_hours_per_day * (business days in month within period - time off in month within period)
-    period_months = pd.date_range(start=period_start, end=period_end, freq="MS")
-    planned_rows = []
-    # Total business days in the full period
-    period_bdays = business_days(period_start, period_end)
-    period_time_off = time_off_count(period_start, period_end)
-    period_total_workdays = max(len(period_bdays) - period_time_off, 1)
-    for m in period_months:
-        m_start = m.date()
-        m_end = date(m_start.year, m_start.month, calendar.monthrange(m_start.year, m_start.month)[1])
-        # Clamp this month window to period
-        s, e = clamp_to_period(m_start, m_end)
-        if s is None:
-            continue
-        bdays_in_month = len(business_days(s, e))
-        off_in_month = time_off_count(s, e)
-        workdays_in_month = max(bdays_in_month - off_in_month, 0)
-        planned_rows.append({
-        "MonthDate": pd.Timestamp(m_start),
-        "PlannedHours": hours_goal * (workdays_in_month / period_total_workdays)
-    })
-
-    planned_df = pd.DataFrame(planned_rows)
-    if len(planned_df) == 0:
-        planned_df = pd.DataFrame(columns=["MonthDate", "PlannedHours"])
-
-    # Merge for plotting across the full timeline:
-    # - actual: all-time months
-    # - planned: only months in the performance period (others remain NaN)
-    merged_monthly = monthly_actual_all.merge(planned_df, on="MonthDate", how="left")
-    merged_monthly["MonthLabel"] = merged_monthly["MonthDate"].dt.strftime("%b %Y")
-
-    with col_left:
-        st.subheader("Monthly Actual vs Planned Hours")
-
-        fig_line = go.Figure()
-        # Planned line (only shows where PlannedHours exists)
-        fig_line.add_trace(go.Scatter(
-            x=merged_monthly["MonthLabel"],
-            y=merged_monthly["PlannedHours"],
-            mode="lines+markers",
-            name="Planned Hours (Period Only)",
-            line=dict(color="#ff0000", width=3),
-            marker=dict(color="#ff0000", size=8),
-            connectgaps=False
-        ))
-        # Actual line (all-time)
-        fig_line.add_trace(go.Scatter(
-            x=merged_monthly["MonthLabel"],
-            y=merged_monthly["ActualHours"],
-            mode="lines+markers",
-            name="Actual Hours (All Time)",
-            line=dict(color="#00ff2f", width=3),
-            marker=dict(color="#00ff2f", size=8)
-        ))
-
-        fig_line.update_layout(
-            showlegend=True,
-            plot_bgcolor="#0f0f23",
-            paper_bgcolor="#0f0f23",
-            font=dict(color="#FFFFFF", size=14),
-            xaxis=dict(type="category", title="Month", color="#FFFFFF", tickfont=dict(color="#FFFFFF"), showgrid=True, gridcolor="#FFFFFF"),
-            yaxis=dict(title="Hours", color="#FFFFFF", tickfont=dict(color="#FFFFFF"), showgrid=True, gridcolor="#FFFFFF"),
-            margin=dict(l=40, r=40, t=40, b=40)
-        )
-        st.plotly_chart(fig_line, use_container_width=True)
-
-    with col_right:
-        st.subheader("Hours by Client (Rolling Window)")
-
-        # Default rolling 30-day window
-        default_end = date.today()
-        default_start = (pd.Timestamp(default_end) - pd.Timedelta(days=30)).date()
-
-        pie_start, pie_end = st.date_input(
-            "Pie Date Range",
-            value=(default_start, default_end),
-            key="pie_date_range"
-        )
-
-        # Ensure correct ordering
-        if pie_start > pie_end:
-            st.error("Pie start date must be on or before end date.")
-            filtered_pie = hours_df.iloc[0:0].copy()
-        else:
-            filtered_pie = hours_df[
-                (hours_df["Date"].dt.date >= pie_start) &
-                (hours_df["Date"].dt.date <= pie_end)
-            ].copy()
-
-        if len(filtered_pie) > 0:
-            pie_fig = px.pie(
-                filtered_pie,
-                names="Client",
-                values="Hours",
-                color="Client",
-                color_discrete_map=client_colors if client_colors else None
-            )
-            pie_fig.update_layout(
-                showlegend=True,
-                plot_bgcolor="#0f0f23",
-                paper_bgcolor="#0f0f23",
-                font=dict(color="#FFFFFF", size=14),
-                legend=dict(font=dict(color="#FFFFFF", size=14), orientation="v", x=1.05, y=0.5, bgcolor="rgba(0,0,0,0)")
-            )
-            st.plotly_chart(pie_fig, use_container_width=True)
-        else:
-            st.info("No hours logged in the selected pie date range.")
-
-    st.markdown("</div>", unsafe_allow_html=True)
-
-
-
-
-
-
-
-
-
-    
-
-
-
-
-elif selected_page == "Data Entry":
-    st.title("History")
-
-    # Load data
-    df_hours = pd.read_csv(HOURS_FILE)
-    df_todos = pd.read_csv(TODOS_FILE)
-    df_clients = pd.read_csv(CLIENTS_FILE)
-    df_categories = pd.read_csv(CATEGORIES_FILE)
-
-    # Convert date columns for compatibility
-    df_hours["Date"] = pd.to_datetime(df_hours["Date"], errors="coerce")
-    df_todos["DateCreated"] = pd.to_datetime(df_todos["DateCreated"], errors="coerce")
-    df_todos["DateCompleted"] = pd.to_datetime(df_todos["DateCompleted"], errors="coerce")
-
-    df_hours = df_hours.sort_values(by = ['Date','Client'])
-
-    #--------------------------
-    # Enter data
-    #--------------------------
-    #--------------------------
-    # Enter data
-    #--------------------------
-    st.subheader("Add Client Category")
-    
-    col1, col2, col3 = st.columns([2, 2, 1])
-    
-    with col1:
-        category_client = st.selectbox(
-            "Client",
-            df_clients["Client"].tolist(),
-            key="de_category_client"   # unique key (avoid collisions with other pages)
-        )
-    
-    with col2:
-        category_name = st.text_input(
-            "Category",
-            key="de_category_name"
-        )
-    
-    with col3:
-        if st.button("Save Category", key="de_save_category"):
-            if str(category_name).strip() == "":
-                st.error("Category cannot be blank.")
-            else:
-                # Only store what categories.csv actually needs: Client + Category
-                new_row = {"Client": str(category_client), "Category": str(category_name).strip()}
-                df_categories = pd.concat([df_categories, pd.DataFrame([new_row])], ignore_index=True)
-    
-                # Optional: prevent duplicates (same client/category)
-                df_categories = df_categories.drop_duplicates(subset=["Client", "Category"]).reset_index(drop=True)
-    
-                # Save correct dataframe -> correct file
-                df_categories.to_csv(CATEGORIES_FILE, index=False)
-    
-                # Push correct file
-                push_to_github("data/categories.csv", "Added/updated category")
-    
-                st.success("Hours logged successfully!")
-
-    # -------------------------
-    # Client Filter
-    # -------------------------
-    st.markdown('\n', unsafe_allow_html=True)
-    # -------------------------
-    # Time Off (PTO) Section
-    # -------------------------
-    st.markdown("\n", unsafe_allow_html=True)
-    st.subheader("Time Off")
-    
-    # Load or initialize days_off.csv (keeps schema: Date only)
-    if not os.path.exists(DAYS_OFF_FILE):
-        pd.DataFrame(columns=["Date"]).to_csv(DAYS_OFF_FILE, index=False)
-    
-    days_off_df = pd.read_csv(DAYS_OFF_FILE)
-    if "Date" not in days_off_df.columns:
-        # Safety: keep structure minimal + compatible with Reports
-        days_off_df = pd.DataFrame(columns=["Date"])
-    
-    # Parse existing dates safely
-    days_off_df["Date"] = pd.to_datetime(days_off_df["Date"], errors="coerce")
-    days_off_df = days_off_df.dropna(subset=["Date"]).copy()
-    
-    left_col, right_col = st.columns(2)
-    
-    with left_col:
-        st.markdown("### Add Time Off")
-    
-        start_date = st.date_input("Start Date", value=date.today(), key="pto_start_date")
-        end_date = st.date_input("End Date", value=date.today(), key="pto_end_date")
-        weekdays_only = st.checkbox("Weekdays only (Mon–Fri)", value=True, key="pto_weekdays_only")
-    
-        if start_date > end_date:
-            st.error("Start Date must be on or before End Date.")
-        else:
-            if st.button("Save Time Off", key="save_time_off"):
-                # Expand range into individual dates (stored as one row per date)
-                rng = pd.date_range(start=start_date, end=end_date, freq="D")
-                if weekdays_only:
-                    rng = [d for d in rng if d.weekday() < 5]  # Mon-Fri only
-    
-                new_dates = pd.DataFrame({"Date": [d.strftime("%Y-%m-%d") for d in rng]})
-    
-                # Combine + de-duplicate
-                combined = pd.concat(
-                    [days_off_df.assign(Date=days_off_df["Date"].dt.strftime("%Y-%m-%d")), new_dates],
-                    ignore_index=True
-                ).drop_duplicates(subset=["Date"])
-    
-                # Save back (keep schema: Date)
-                combined = combined.sort_values("Date").reset_index(drop=True)
-                combined.to_csv(DAYS_OFF_FILE, index=False)
-    
-                # Push to GitHub (optional; uses your existing helper)
-                push_to_github("data/days_off.csv", "Updated days off / time off")
-    
-                st.success("Time off saved!")
-    
-    with right_col:
-        st.markdown("### Upcoming Time Off (Editable)")
-    
-        # Build an editable view of upcoming time off dates
-        today_dt = pd.to_datetime(date.today())
-        upcoming_df = days_off_df[days_off_df["Date"] >= today_dt].copy()
-        upcoming_df = upcoming_df.sort_values("Date").reset_index(drop=True)
-    
-        # Display as strings for editing consistency
-        upcoming_display = upcoming_df.copy()
-        upcoming_display["Date"] = upcoming_display["Date"].dt.strftime("%Y-%m-%d")
-    
-        edited_upcoming = st.data_editor(
-            upcoming_display[["Date"]],
-            num_rows="dynamic",        # allows delete rows + add rows
-            hide_index=True,
-            key="pto_upcoming_editor"
-        )
-    
-        col_save, col_delete = st.columns([1, 1])
-    
-        with col_save:
-            if st.button("Save Upcoming Changes", key="pto_save_upcoming"):
-                # Clean + validate
-                cleaned = edited_upcoming.dropna(how="all").copy()
-                cleaned["Date"] = cleaned["Date"].astype(str).str.strip()
-                cleaned["Date"] = pd.to_datetime(cleaned["Date"], errors="coerce")
-                cleaned = cleaned.dropna(subset=["Date"]).copy()
-    
-                # Enforce weekdays only
-                cleaned = cleaned[cleaned["Date"].dt.weekday < 5].copy()
-    
-                # Merge back with past time-off dates (so editing upcoming doesn't wipe history)
-                past_df = days_off_df[days_off_df["Date"] < today_dt].copy()
-                combined = pd.concat([past_df, cleaned], ignore_index=True)
-    
-                # De-dupe + sort
-                combined["Date"] = combined["Date"].dt.strftime("%Y-%m-%d")
-                combined = combined.drop_duplicates(subset=["Date"]).sort_values("Date").reset_index(drop=True)
-    
-                combined.to_csv(DAYS_OFF_FILE, index=False)
-                push_to_github("data/days_off.csv", "Updated upcoming time off (editable table)")
-                st.success("Upcoming time off updated!")
-    
-        with col_delete:
-            # Optional: quick multi-delete without editing rows
-            if len(upcoming_display) > 0:
-                to_delete = st.multiselect(
-                    "Delete selected dates",
-                    upcoming_display["Date"].tolist(),
-                    key="pto_delete_dates"
-                )
-                if st.button("Delete Selected", key="pto_delete_selected"):
-                    if to_delete:
-                        remaining = days_off_df.copy()
-                        remaining["DateStr"] = remaining["Date"].dt.strftime("%Y-%m-%d")
-                        remaining = remaining[~remaining["DateStr"].isin(to_delete)].copy()
-                        remaining = remaining.drop(columns=["DateStr"])
-                        remaining["Date"] = remaining["Date"].dt.strftime("%Y-%m-%d")
-                        remaining = remaining.drop_duplicates(subset=["Date"]).sort_values("Date").reset_index(drop=True)
-    
-                        remaining.to_csv(DAYS_OFF_FILE, index=False)
-                        push_to_github("data/days_off.csv", "Deleted selected time off dates")
-                        st.success("Selected dates deleted!")
-                    else:
-                        st.info("No dates selected.")
-            else:
-                st.info("No upcoming time off saved.")
-
-    st.subheader("Filter by Client")
-    all_clients = sorted(set(df_hours["Client"].dropna().tolist() + df_todos["Client"].dropna().tolist()))
-    selected_clients = st.multiselect("Select Clients", all_clients, default=all_clients)
-    st.markdown('\n', unsafe_allow_html=True)
-
-    # Apply client filter
-    filtered_hours = df_hours[df_hours["Client"].isin(selected_clients)] if len(selected_clients) > 0 else df_hours
-    filtered_todos = df_todos[df_todos["Client"].isin(selected_clients)] if len(selected_clients) > 0 else df_todos
-
-    # -------------------------
-    # Search Filter
-    # -------------------------
-    st.markdown('\n', unsafe_allow_html=True)
-    search_query = st.text_input("Search (applies to both tables):").strip().lower()
-
-    if search_query:
-        # Filter hours table
-        filtered_hours = filtered_hours[
-            filtered_hours.apply(lambda row: row.astype(str).str.lower().str.contains(search_query).any(), axis=1)
-        ]
-        # Filter todos table
-        filtered_todos = filtered_todos[
-            filtered_todos.apply(lambda row: row.astype(str).str.lower().str.contains(search_query).any(), axis=1)
-        ]
-
-    # -------------------------
-    # Editable Hours + To-Do History
-    # -------------------------
-    st.markdown('\n', unsafe_allow_html=True)
-    col1, col2 = st.columns(2)
-
-    # Editable Hours History
-    with col1:
-        st.subheader("Logged Hours History")
-        if len(filtered_hours) == 0:
-            st.info("No hours logged for selected client(s) or search term.")
-        else:
-            sort_hours_by = st.selectbox("Sort Hours By", ["Date (Newest)", "Date (Oldest)", "Hours (High to Low)", "Hours (Low to High)"])
-            if sort_hours_by == "Date (Newest)":
-                filtered_hours = filtered_hours.sort_values(by="Date", ascending=False)
-            elif sort_hours_by == "Date (Oldest)":
-                filtered_hours = filtered_hours.sort_values(by="Date", ascending=True)
-            elif sort_hours_by == "Hours (High to Low)":
-                filtered_hours = filtered_hours.sort_values(by="Hours", ascending=False)
-            elif sort_hours_by == "Hours (Low to High)":
-                filtered_hours = filtered_hours.sort_values(by="Hours", ascending=True)
-
-            edited_hours = st.data_editor(
-                filtered_hours[["Date", "Client", "Hours", "Description"]].reset_index(drop=True),
-                num_rows="dynamic", width="stretch", hide_index=True
-            )
-
-            if st.button("Save Hours Changes"):
-                cleaned_hours = edited_hours.dropna(how="all")
-                cleaned_hours = cleaned_hours[(cleaned_hours != "").any(axis=1)]
-                cleaned_hours.to_csv(HOURS_FILE, index=False)
-                push_to_github("data/hours.csv", "Updated hours history (removed empty rows)")
-                st.success("Hours history updated! Empty rows deleted.")
-
-    # Editable To-Do History
-    with col2:
-        st.subheader("To-Do History")
-        if len(filtered_todos) == 0:
-            st.info("No tasks recorded for selected client(s) or search term.")
-        else:
-            sort_todos_by = st.selectbox("Sort To-Dos By", ["Priority (High to Low)", "Priority (Low to High)", "Date Created (Newest)", "Date Created (Oldest)"])
-            if sort_todos_by == "Priority (High to Low)":
-                filtered_todos = filtered_todos.sort_values(by="Priority", ascending=False)
-            elif sort_todos_by == "Priority (Low to High)":
-                filtered_todos = filtered_todos.sort_values(by="Priority", ascending=True)
-            elif sort_todos_by == "Date Created (Newest)":
-                filtered_todos = filtered_todos.sort_values(by="DateCreated", ascending=False)
-            elif sort_todos_by == "Date Created (Oldest)":
-                filtered_todos = filtered_todos.sort_values(by="DateCreated", ascending=True)
-
-            edited_todos = st.data_editor(
-                filtered_todos[["Client", "Category", "Task", "Priority", "DateCreated", "DateCompleted", "Notes"]].reset_index(drop=True),
-                num_rows="dynamic", width="stretch", hide_index=True
-            )
-
-            if st.button("Save To-Do Changes"):
-                cleaned_todos = edited_todos.dropna(how="all")
-                cleaned_todos = cleaned_todos[(cleaned_todos != "").any(axis=1)]
-                cleaned_todos.to_csv(TODOS_FILE, index=False)
-                push_to_github("data/todos.csv", "Updated To-Do history (removed empty rows)")
-                st.success("To-Do history updated! Empty rows deleted.")
-
-    # =========================================================
-    # Period Settings (Bottom of Data Entry)
-    # =========================================================
-    st.markdown("\n", unsafe_allow_html=True)
-    st.subheader("Performance Period Settings")
-    
-    # Ensure the file exists with the expected columns
-    if not os.path.exists(PERIOD_FILE):
-        pd.DataFrame(columns=["StartDate", "EndDate", "HoursGoal"]).to_csv(PERIOD_FILE, index=False)
-    
-    period_df = pd.read_csv(PERIOD_FILE)
-    
-    # Normalize column names (handles your " HoursGoal" header)
-    period_df.columns = [c.strip() for c in period_df.columns]
-    
-    # Ensure required columns exist
-    for col in ["StartDate", "EndDate", "HoursGoal"]:
-        if col not in period_df.columns:
-            period_df[col] = ""
-    
-    # Coerce dates safely for UI defaults
-    period_df["StartDate"] = pd.to_datetime(period_df["StartDate"], errors="coerce")
-    period_df["EndDate"] = pd.to_datetime(period_df["EndDate"], errors="coerce")
-    
-    # Coerce HoursGoal to numeric safely (handles " 653")
-    period_df["HoursGoal"] = pd.to_numeric(period_df["HoursGoal"], errors="coerce")
-    
-    # Default values (use first row if it exists)
-    default_start = period_df["StartDate"].iloc[0].date() if len(period_df) > 0 and pd.notna(period_df["StartDate"].iloc[0]) else date.today()
-    default_end = period_df["EndDate"].iloc[0].date() if len(period_df) > 0 and pd.notna(period_df["EndDate"].iloc[0]) else date.today()
-    default_goal = float(period_df["HoursGoal"].iloc[0]) if len(period_df) > 0 and pd.notna(period_df["HoursGoal"].iloc[0]) else 0.0
-    
-    # Quick entry row (start/end/hours + save)
-    c1, c2, c3, c4 = st.columns([1, 1, 1, 1])
-    with c1:
-        ps_start = st.date_input("Start Date", value=default_start, key="ps_start")
-    with c2:
-        ps_end = st.date_input("End Date", value=default_end, key="ps_end")
-    with c3:
-        ps_goal = st.number_input("Hours Goal", min_value=0.0, step=1.0, value=default_goal, key="ps_goal")
-    with c4:
-        if st.button("Save Period", key="ps_save_period", use_container_width=True):
-            if ps_start > ps_end:
-                st.error("Start Date must be on or before End Date.")
-            else:
-                # Store as a single-row settings file (overwrite row 0)
-                new_settings = pd.DataFrame([{
-                    "StartDate": ps_start.strftime("%Y-%m-%d"),
-                    "EndDate": ps_end.strftime("%Y-%m-%d"),
-                    "HoursGoal": ps_goal
-                }])
-    
-                new_settings.to_csv(PERIOD_FILE, index=False)
-                push_to_github("data/period_settings.csv", "Updated period settings (dates + hours goal)")
-                st.success("Period settings saved!")
-    
-    # Editable view (for quick edits)
-    st.markdown("### Edit period_settings.csv")
-    editable = period_df.copy()
-    # Convert back to strings for display/editing
-    editable["StartDate"] = editable["StartDate"].dt.strftime("%Y-%m-%d")
-    editable["EndDate"] = editable["EndDate"].dt.strftime("%Y-%m-%d")
-    editable["HoursGoal"] = editable["HoursGoal"].fillna(0)
-    
-    edited_period = st.data_editor(
-        editable[["StartDate", "EndDate", "HoursGoal"]],
-        num_rows="dynamic",
-        hide_index=True,
-        key="ps_editor"
-    )
-    
-    if st.button("Save Period Settings Changes", key="ps_save_editor"):
-        cleaned = edited_period.dropna(how="all").copy()
-    
-        # Strip whitespace
-        for col in ["StartDate", "EndDate"]:
-            cleaned[col] = cleaned[col].astype(str).str.strip()
-    
-        # Validate and coerce
-        cleaned["StartDate"] = pd.to_datetime(cleaned["StartDate"], errors="coerce")
-        cleaned["EndDate"] = pd.to_datetime(cleaned["EndDate"], errors="coerce")
-        cleaned["HoursGoal"] = pd.to_numeric(cleaned["HoursGoal"], errors="coerce").fillna(0)
-    
-        cleaned = cleaned.dropna(subset=["StartDate", "EndDate"])
-    
-        # Validate date order per row
-        bad_rows = cleaned[cleaned["StartDate"] > cleaned["EndDate"]]
-        if len(bad_rows) > 0:
-            st.error("One or more rows have StartDate after EndDate. Fix and try again.")
-        else:
-            # Save in consistent format
-            cleaned["StartDate"] = cleaned["StartDate"].dt.strftime("%Y-%m-%d")
-            cleaned["EndDate"] = cleaned["EndDate"].dt.strftime("%Y-%m-%d")
-            cleaned = cleaned[["StartDate", "EndDate", "HoursGoal"]].reset_index(drop=True)
-    
-            cleaned.to_csv(PERIOD_FILE, index=False)
-            push_to_github("data/period_settings.csv", "Edited period settings table")
-            st.success("period_settings.csv updated!")
-
-
-
-
-elif selected_page == "Archive":
-    st.title("Archive Clients")
-
-    # Load active data
-    df_clients = pd.read_csv(CLIENTS_FILE)
-    df_categories = pd.read_csv(CATEGORIES_FILE)
-    df_todos = pd.read_csv(TODOS_FILE)
-    df_hours = pd.read_csv(HOURS_FILE)
-
-    # Archive file paths
-    ARCHIVE_CLIENTS = os.path.join(DATA_DIR, "archive_clients.csv")
-    ARCHIVE_CATEGORIES = os.path.join(DATA_DIR, "archive_categories.csv")
-    ARCHIVE_TODOS = os.path.join(DATA_DIR, "archive_todos.csv")
-    ARCHIVE_HOURS = os.path.join(DATA_DIR, "archive_hours.csv")
-
-    # Ensure archive files exist
-    archive_files = [
-        (ARCHIVE_CLIENTS, ["Client", "Color"]),
-        (ARCHIVE_CATEGORIES, ["Client", "Category"]),
-        (ARCHIVE_TODOS, ["Client", "Category", "Task", "Priority", "DateCreated", "DateCompleted"]),
-        (ARCHIVE_HOURS, ["Date", "Client", "Hours", "Description"])
-    ]
-    for file, cols in archive_files:
-        if not os.path.exists(file):
-            pd.DataFrame(columns=cols).to_csv(file, index=False)
-
-    # Load archive data
-    df_archive_clients = pd.read_csv(ARCHIVE_CLIENTS)
-    df_archive_categories = pd.read_csv(ARCHIVE_CATEGORIES)
-    df_archive_todos = pd.read_csv(ARCHIVE_TODOS)
-    df_archive_hours = pd.read_csv(ARCHIVE_HOURS)
-
-    # -------------------------------
-    # Archive Client Action
-    # -------------------------------
-    st.markdown('<div class="form-box">', unsafe_allow_html=True)
-    st.subheader("Archive a Client")
-    if len(df_clients) == 0:
-        st.warning("No clients available to archive.")
-    else:
-        selected_client = st.selectbox("Select Client to Archive", df_clients["Client"].tolist(), key="archive_client")
-        if st.button("Archive Client"):
-            # Move data to archive
-            df_archive_clients = pd.concat([df_archive_clients, df_clients[df_clients["Client"] == selected_client]], ignore_index=True)
-            df_archive_categories = pd.concat([df_archive_categories, df_categories[df_categories["Client"] == selected_client]], ignore_index=True)
-            df_archive_todos = pd.concat([df_archive_todos, df_todos[df_todos["Client"] == selected_client]], ignore_index=True)
-
-            # Remove from active files
-            df_clients = df_clients[df_clients["Client"] != selected_client]
-            df_categories = df_categories[df_categories["Client"] != selected_client]
-            df_todos = df_todos[df_todos["Client"] != selected_client]
-
-            # Save all files
-            df_clients.to_csv(CLIENTS_FILE, index=False)
-            df_categories.to_csv(CATEGORIES_FILE, index=False)
-            df_todos.to_csv(TODOS_FILE, index=False)
-            df_hours.to_csv(HOURS_FILE, index=False)
-            df_archive_clients.to_csv(ARCHIVE_CLIENTS, index=False)
-            df_archive_categories.to_csv(ARCHIVE_CATEGORIES, index=False)
-            df_archive_todos.to_csv(ARCHIVE_TODOS, index=False)
-
-            # Push to GitHub
-            push_to_github("data/clients.csv", "Archived client")
-            push_to_github("data/categories.csv", "Archived client categories")
-            push_to_github("data/todos.csv", "Archived client todos")
-            push_to_github("data/hours.csv", "Archived client hours")
-            push_to_github("data/archive_clients.csv", "Updated archive clients")
-            push_to_github("data/archive_categories.csv", "Updated archive categories")
-            push_to_github("data/archive_todos.csv", "Updated archive todos")
-
-            st.success(f"Client '{selected_client}' archived successfully!")
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    # -------------------------------
-    # Undo Archive Client Action
-    # -------------------------------
-    st.markdown('<div class="form-box">', unsafe_allow_html=True)
-    st.subheader("Undo Archive")
-    if len(df_archive_clients) == 0:
-        st.warning("No archived clients available.")
-    else:
-        undo_client = st.selectbox("Select Archived Client to Restore", df_archive_clients["Client"].tolist(), key="undo_client")
-        if st.button("Restore Client"):
-            # Move data back to active
-            df_clients = pd.concat([df_clients, df_archive_clients[df_archive_clients["Client"] == undo_client]], ignore_index=True)
-            df_categories = pd.concat([df_categories, df_archive_categories[df_archive_categories["Client"] == undo_client]], ignore_index=True)
-            df_todos = pd.concat([df_todos, df_archive_todos[df_archive_todos["Client"] == undo_client]], ignore_index=True)
-            df_hours = pd.concat([df_hours, df_archive_hours[df_archive_hours["Client"] == undo_client]], ignore_index=True)
-
-            # Remove from archive files
-            df_archive_clients = df_archive_clients[df_archive_clients["Client"] != undo_client]
-            df_archive_categories = df_archive_categories[df_archive_categories["Client"] != undo_client]
-            df_archive_todos = df_archive_todos[df_archive_todos["Client"] != undo_client]
-            df_archive_hours = df_archive_hours[df_archive_hours["Client"] != undo_client]
-
-            # Save all files
-            df_clients.to_csv(CLIENTS_FILE, index=False)
-            df_categories.to_csv(CATEGORIES_FILE, index=False)
-            df_todos.to_csv(TODOS_FILE, index=False)
-            df_hours.to_csv(HOURS_FILE, index=False)
-            df_archive_clients.to_csv(ARCHIVE_CLIENTS, index=False)
-            df_archive_categories.to_csv(ARCHIVE_CATEGORIES, index=False)
-            df_archive_todos.to_csv(ARCHIVE_TODOS, index=False)
-            df_archive_hours.to_csv(ARCHIVE_HOURS, index=False)
-
-            # Push to GitHub
-            push_to_github("data/clients.csv", "Restored client")
-            push_to_github("data/categories.csv", "Restored client categories")
-            push_to_github("data/todos.csv", "Restored client todos")
-            push_to_github("data/hours.csv", "Restored client hours")
-            push_to_github("data/archive_clients.csv", "Updated archive clients after restore")
-            push_to_github("data/archive_categories.csv", "Updated archive categories after restore")
-            push_to_github("data/archive_todos.csv", "Updated archive todos after restore")
-            push_to_github("data/archive_hours.csv", "Updated archive hours after restore")
-
-            st.success(f"Client '{undo_client}' restored successfully!")
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    # -------------------------------
-    # Edit Client Colors
-    # -------------------------------
-    st.markdown('<div class="form-box">', unsafe_allow_html=True)
-    st.subheader("Edit Client Colors")
-    if len(df_clients) > 0:
-        for i, row in df_clients.iterrows():
-            col1, col2 = st.columns([2, 1])
-            with col1:
-                st.text(row["Client"])
-            with col2:
-                default_color = (
-                    row["Color"]
-                    if isinstance(row["Color"], str) and row["Color"].startswith("#") and len(row["Color"]) == 7
-                    else "#1f77b4"
-                )
-                
-                new_color = st.color_picker("", default_color, key=f"color_{i}")
-                df_clients.at[i, "Color"] = new_color
-        if st.button("Save Color Changes"):
-            df_clients.to_csv(CLIENTS_FILE, index=False)
-            st.success("Client colors updated!")
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    # -------------------------------
-    # Show Archive History Tables
-    # -------------------------------
-    st.markdown('<div class="form-box">', unsafe_allow_html=True)
-    st.subheader("Archive History")
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown("### Archived Hours")
-        st.dataframe(df_archive_hours.sort_values(by="Date", ascending=False).reset_index(drop=True), width="stretch", hide_index=True)
-    with col2:
-        st.markdown("### Archived To-Dos")
-        st.dataframe(df_archive_todos.sort_values(by="DateCreated", ascending=False)[
-            ["Client", "Category", "Task", "Priority", "DateCreated", "DateCompleted"]
-        ].reset_index(drop=True), width="stretch", hide_index=True)
-    st.markdown('</div>', unsafe_allow_html=True)
-
+import streamlit as st
+import pandas as pd
+import numpy as np
+from datetime import datetime
+import os
+import requests
+import base64
+import csv
+import hashlib
+import json
+import random
+import re
+import sqlite3
+import tempfile
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from datetime import datetime, date
+import calendar
+import plotly.graph_objects as go
+import plotly.express as px
+# -------------------------------------------------
+# GitHub Config (from Streamlit Secrets)
+# -------------------------------------------------
+
+BRANCH = "main"
+
+# -------------------------------------------------
+# Data Setup
+# -------------------------------------------------
+DATA_DIR = "data"
+CLIENTS_FILE = os.path.join(DATA_DIR, "clients.csv")
+HOURS_FILE = os.path.join(DATA_DIR, "hours.csv")
+GOALS_FILE = os.path.join(DATA_DIR, "goals.csv")
+CATEGORIES_FILE = os.path.join(DATA_DIR, "categories.csv")
+DAYS_OFF_FILE = os.path.join(DATA_DIR, "days_off.csv")
+UNENTERED_HOURS_FILE = os.path.join(DATA_DIR, "unentered_hours.csv")
+TODOS_FILE = os.path.join(DATA_DIR, "todos.csv")
+
+os.makedirs(DATA_DIR, exist_ok=True)
+st.set_page_config(layout="wide")
+
+# -------------------------------------------------
+# Custom CSS for Dark Theme and Boxed Forms
+# -------------------------------------------------
+# -------------------------------------------------
+# Improved Dark Theme CSS
+# -------------------------------------------------
+st.markdown("""
+<style>
+.todo-row-spacer { height: 10px; }
+
+.todo-colorbar {
+  width: 10px;
+  height: 48px;
+  border-radius: 6px;
+}
+
+.todo-text {
+  font-size: 1.05rem;
+  font-weight: 650;
+  color: #ffffff;
+  line-height: 1.1;
+}
+.todo-subtext {
+  font-size: 0.85rem;
+  color: #a1a1aa;
+  margin-top: 2px;
+}
+</style>
+""", unsafe_allow_html=True)
+
+
+
+# -------------------------------------------------
+# GitHub Functions
+# -------------------------------------------------
+
+
+
+
+# -------------------------------------------------
+# GitHub Config — public-safe defaults
+# -------------------------------------------------
+BRANCH = "main"
+
+# Your public repo full name (owner/repo)
+GITHUB_REPO = "cole-nash-plante/hours_app"
+
+# Read token from Streamlit Cloud secrets if set.
+# On a public repo, reads can be unauthenticated; writes need a token.
+GITHUB_TOKEN = None
+try:
+    # You can store this in Streamlit Cloud → App → Settings → Edit secrets
+    GITHUB_TOKEN = st.secrets.get("GITHUB_TOKEN", None)
+except Exception:
+    GITHUB_TOKEN = None
+
+# "tree": one Git Trees listing of data/ per sync + only the blobs that changed
+# (consistent snapshot at one commit). "contents": one Contents API call per file.
+SYNC_MODE = "tree"
+try:
+    SYNC_MODE = st.secrets.get("SYNC_MODE", "tree")
+except Exception:
+    SYNC_MODE = "tree"
+
+# How long (seconds) a pull from GitHub stays fresh for every session in this
+# process. 0 = pull once per browser session instead.
+SYNC_TTL_SECONDS = 0
+try:
+    SYNC_TTL_SECONDS = int(st.secrets.get("SYNC_TTL_SECONDS", 0))
+except Exception:
+    SYNC_TTL_SECONDS = 0
+
+# Local storage for the data/ tables. "csv" reads and writes the CSVs directly.
+# "parquet" / "feather" (needs pyarrow) keep a typed, compressed copy next to
+# each CSV that all reads and writes go through; the CSV is exported from it
+# when the file is pushed (or on demand) and re-imported when a sync brings a newer one.
+STORAGE_BACKEND = "csv"
+try:
+    STORAGE_BACKEND = st.secrets.get("STORAGE_BACKEND", "csv")
+except Exception:
+    STORAGE_BACKEND = "csv"
+
+# Build headers conditionally. Add 'Accept' for GitHub API v3.
+BASE_HEADERS = {"Accept": "application/vnd.github.v3+json"}
+AUTH_HEADERS = (
+    {**BASE_HEADERS, "Authorization": f"token {GITHUB_TOKEN}"}
+    if GITHUB_TOKEN
+    else BASE_HEADERS
+)
+
+# -------------------------------------------------
+# Data Setup
+# -------------------------------------------------
+DATA_DIR = "data"
+CLIENTS_FILE = os.path.join(DATA_DIR, "clients.csv")
+HOURS_FILE = os.path.join(DATA_DIR, "hours.csv")
+GOALS_FILE = os.path.join(DATA_DIR, "goals.csv")
+CATEGORIES_FILE = os.path.join(DATA_DIR, "categories.csv")
+TODOS_FILE = os.path.join(DATA_DIR, "todos.csv")
+PERIOD_FILE = os.path.join(DATA_DIR, "period_settings.csv")
+# Local-only record of each file's last known GitHub ETag + blob SHA (never pushed)
+SYNC_META_FILE = os.path.join(DATA_DIR, ".sync_meta.json")
+# Metadata key for the last known branch head {"commit": sha, "tree": sha}
+HEAD_META_KEY = "__head__"
+os.makedirs(DATA_DIR, exist_ok=True)
+st.set_page_config(layout="wide")
+
+# -------------------------------------------------
+# GitHub Functions
+# -------------------------------------------------
+class GitHubClient:
+    """
+    Process-wide GitHub API client: one pooled keep-alive Session (so TLS is
+    set up once per process, not once per request), connect/read timeouts on
+    every call so a hung handshake can't freeze the app, and retries with
+    jittered exponential backoff for idempotent requests.
+    """
+    TIMEOUT = (3.05, 15)  # (connect, read) seconds
+    MAX_RETRIES = 3
+    BACKOFF_SECONDS = 0.5
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    # POST/PATCH (blob/tree/commit creation, ref moves) are never retried blindly
+    IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE"}
+
+    def __init__(self, headers: dict):
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        # Large enough for the concurrent sync / blob upload thread pools
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, url: str, **kwargs):
+        method = method.upper()
+        kwargs.setdefault("timeout", self.TIMEOUT)
+        retries = self.MAX_RETRIES if method in self.IDEMPOTENT_METHODS else 0
+        for attempt in range(retries + 1):
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == retries:
+                    raise
+            else:
+                if resp.status_code not in self.RETRY_STATUSES or attempt == retries:
+                    return resp
+            time.sleep(self.BACKOFF_SECONDS * 2 ** attempt * random.uniform(0.5, 1.5))
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url: str, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+@st.cache_resource
+def get_github_client():
+    return GitHubClient(AUTH_HEADERS)
+
+def write_file_atomic(file_path: str, content: bytes):
+    """
+    Write bytes to file_path through a temp file + rename, so a reader
+    (or a crashed sync) never sees a half-written CSV.
+    """
+    parent = os.path.dirname(file_path) or "."
+    os.makedirs(parent, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=parent, prefix=".tmp_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, file_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def load_sync_meta():
+    """Return {file_path: {"etag": ..., "sha": ...}} from the local metadata store."""
+    if not os.path.exists(SYNC_META_FILE):
+        return {}
+    try:
+        with open(SYNC_META_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        # Corrupt/partial store: just fall back to unconditional fetches
+        return {}
+
+def update_sync_meta(updates: dict):
+    """Replace per-file entries in the metadata store (None removes an entry)."""
+    with get_sync_state()["meta_lock"]:
+        meta = load_sync_meta()
+        for file_path, entry in updates.items():
+            if entry is None:
+                meta.pop(file_path, None)
+            else:
+                meta[file_path] = entry
+        write_file_atomic(SYNC_META_FILE, json.dumps(meta, indent=2, sort_keys=True).encode("utf-8"))
+
+def fetch_from_github(file_path: str, etag: str = None):
+    """
+    Fetch file content from the public GitHub repo and save locally.
+    Works without a token if the repo/content is public.
+
+    If etag is given (the ETag from the last sync of an unchanged local file)
+    the request is conditional: a 304 means nothing changed, so neither the
+    download nor the disk rewrite happens and the file's mtime is untouched.
+    304s also don't count against the GitHub rate limit.
+
+    Runs on sync worker threads, so it does not call st.* itself; it returns
+    a result dict (status, level, message, elapsed, etag, sha) for the caller.
+    """
+    started = time.perf_counter()
+    result = {"file": file_path, "status": None, "level": None, "message": "", "etag": None, "sha": None}
+    url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{file_path}?ref={BRANCH}"
+    headers = {"If-None-Match": etag} if etag else None
+    try:
+        resp = get_github_client().get(url, headers=headers)
+    except requests.RequestException as e:
+        result["level"] = "warning"
+        result["message"] = f"Could not fetch '{file_path}': {e}"
+        result["elapsed"] = time.perf_counter() - started
+        return result
+
+    result["status"] = resp.status_code
+    if resp.status_code == 304:
+        # Unchanged since the last sync: keep the local file as-is
+        result["etag"] = etag
+    elif resp.status_code == 200:
+        j = resp.json()
+        content_b64 = j.get("content", "")
+        if content_b64:
+            write_file_atomic(file_path, base64.b64decode(content_b64))
+            result["etag"] = resp.headers.get("ETag")
+            result["sha"] = j.get("sha")
+        else:
+            result["level"] = "warning"
+            result["message"] = f"No content for {file_path} in GitHub response."
+    elif resp.status_code == 404:
+        # File not yet in repo; create locally and push later if desired. A
+        # partition the shared client manifest lists but GitHub lacks just has no rows.
+        if partition_owner(file_path) is None:
+            result["level"] = "info"
+            result["message"] = f"'{file_path}' not found in GitHub (404). Will create locally."
+        if file_path.endswith(".css"):
+            # start with empty css if missing
+            write_file_atomic(file_path, b"")
+        # For CSVs, they’ll be created below from init_files
+    else:
+        result["level"] = "warning"
+        result["message"] = (
+            f"Could not fetch '{file_path}' (HTTP {resp.status_code}). "
+            f"Response: {resp.text[:200]}"
+        )
+    result["elapsed"] = time.perf_counter() - started
+    return result
+
+def sync_from_github(files):
+    """
+    Fetch every data file concurrently (one thread per file), so the cold
+    start costs the slowest single request instead of the sum of all of them.
+    Duplicate paths are fetched once. Returns the per-file results.
+    """
+    # Files with unpushed local edits are newer than GitHub; leave them alone
+    pending = load_push_queue()["pending"]
+    files = [fp for fp in dict.fromkeys(files) if fp not in pending]
+    if not files:
+        return []
+    meta = load_sync_meta()
+
+    def fetch(file_path):
+        # Only trust a stored ETag if the local copy it describes still exists
+        etag = meta.get(file_path, {}).get("etag") if os.path.exists(file_path) else None
+        return fetch_from_github(file_path, etag)
+
+    with ThreadPoolExecutor(max_workers=len(files)) as pool:
+        results = list(pool.map(fetch, files))
+
+    # Persist new ETags/SHAs once, from the script thread
+    updates = {}
+    for r in results:
+        if r["status"] == 200 and r["etag"]:
+            updates[r["file"]] = {"etag": r["etag"], "sha": r["sha"]}
+        elif r["status"] == 404:
+            if meta.get(r["file"], {}).get("sha") and os.path.exists(r["file"]):
+                # GitHub had it and no longer does: deleted / moved elsewhere
+                os.remove(r["file"])
+            updates[r["file"]] = None
+    if updates:
+        update_sync_meta(updates)
+
+    report_sync_results(results)
+    return results
+
+def report_sync_results(results):
+    """Show sync warnings/info from the script thread (st.* is not safe on worker threads)."""
+    for r in results:
+        if r["level"] == "warning":
+            st.warning(r["message"])
+        elif r["level"] == "info":
+            st.info(r["message"])
+
+def git_blob_sha(content: bytes) -> str:
+    """SHA-1 git assigns to a blob with this content (matches tree entry SHAs)."""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+def local_blob_sha(file_path: str):
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, "rb") as f:
+        return git_blob_sha(f.read())
+
+def fetch_blob_from_github(file_path: str, sha: str):
+    """Download one blob by SHA and write it to file_path (sync worker thread)."""
+    started = time.perf_counter()
+    result = {"file": file_path, "status": None, "level": None, "message": "", "etag": None, "sha": sha}
+    url = f"https://api.github.com/repos/{GITHUB_REPO}/git/blobs/{sha}"
+    try:
+        resp = get_github_client().get(url)
+        result["status"] = resp.status_code
+        if resp.status_code == 200:
+            write_file_atomic(file_path, base64.b64decode(resp.json().get("content", "")))
+        else:
+            result["level"] = "warning"
+            result["message"] = (
+                f"Could not fetch '{file_path}' (HTTP {resp.status_code}). "
+                f"Response: {resp.text[:200]}"
+            )
+    except requests.RequestException as e:
+        result["level"] = "warning"
+        result["message"] = f"Could not fetch '{file_path}': {e}"
+    result["elapsed"] = time.perf_counter() - started
+    return result
+
+def sync_tree_from_github(files):
+    """
+    Snapshot the whole data/ directory at one commit: resolve the branch head
+    once, list the tree once, then download (concurrently) only the blobs
+    whose SHA differs from the local file. N per-file requests become one
+    listing plus the changed blobs, and hours.csv / unentered_hours.csv can
+    no longer come from different commits.
+
+    Returns (results, head_sha), or None if the listing is unavailable so the
+    caller can fall back to per-file Contents API fetches.
+    """
+    started = time.perf_counter()
+    # Read before the listing: a file the push worker commits while we list is
+    # still pending here, so a listing that predates its push can't overwrite
+    # or delete it
+    meta = load_sync_meta()
+    pending = set(load_push_queue()["pending"])
+    github = get_github_client()
+    try:
+        ref_resp = github.get(f"https://api.github.com/repos/{GITHUB_REPO}/git/ref/heads/{BRANCH}")
+        if ref_resp.status_code != 200:
+            return None
+        head_sha = ref_resp.json()["object"]["sha"]
+        tree_resp = github.get(f"https://api.github.com/repos/{GITHUB_REPO}/git/trees/{head_sha}?recursive=1")
+        if tree_resp.status_code != 200 or tree_resp.json().get("truncated"):
+            return None
+    except (requests.RequestException, KeyError, ValueError):
+        return None
+
+    remote = {
+        entry["path"]: entry["sha"]
+        for entry in tree_resp.json().get("tree", [])
+        if entry.get("type") == "blob" and entry["path"].startswith(f"{DATA_DIR}/")
+    }
+    listing = {
+        "file": f"{DATA_DIR}/ @ {head_sha[:7]}",
+        "status": tree_resp.status_code,
+        "level": None,
+        "message": "",
+        "elapsed": time.perf_counter() - started,
+    }
+
+    # ...and files saved (queued) while we listed are newer than the listing too
+    pending |= set(load_push_queue()["pending"])
+    results, to_download, updates = [], [], {}
+    for file_path, sha in remote.items():
+        if file_path in pending:
+            # Unpushed local edits are newer than GitHub; leave them alone
+            results.append({"file": file_path, "status": "pending push", "level": None, "message": "", "elapsed": 0.0})
+        elif local_blob_sha(file_path) == sha:
+            results.append({"file": file_path, "status": "same sha", "level": None, "message": "", "elapsed": 0.0})
+            if meta.get(file_path, {}).get("sha") != sha:
+                updates[file_path] = {**meta.get(file_path, {}), "sha": sha}
+        else:
+            to_download.append((file_path, sha))
+
+    if to_download:
+        with ThreadPoolExecutor(max_workers=len(to_download)) as pool:
+            downloaded = list(pool.map(lambda item: fetch_blob_from_github(*item), to_download))
+        for r in downloaded:
+            if r["status"] == 200:
+                # Contents-API ETag no longer describes the new local bytes
+                updates[r["file"]] = {"sha": r["sha"]}
+        results.extend(downloaded)
+
+    # Files GitHub had (we hold their SHA) that the branch no longer does were
+    # deleted or moved (e.g. a client archived on another deployment)
+    for file_path, entry in meta.items():
+        if (
+            file_path.startswith(f"{DATA_DIR}/") and file_path not in remote and file_path not in pending
+            and isinstance(entry, dict) and entry.get("sha")
+        ):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            results.append({"file": file_path, "status": "deleted", "level": None, "message": "", "elapsed": 0.0})
+            updates[file_path] = None
+
+    # Requested files the branch doesn't have yet (same handling as a 404)
+    for file_path in dict.fromkeys(files):
+        if file_path not in remote:
+            results.append({
+                "file": file_path,
+                "status": 404,
+                "level": "info",
+                "message": f"'{file_path}' not found in GitHub (404). Will create locally.",
+                "elapsed": 0.0,
+            })
+            updates[file_path] = None
+            if file_path.endswith(".css") and not os.path.exists(file_path):
+                write_file_atomic(file_path, b"")
+
+    updates[HEAD_META_KEY] = {"commit": head_sha, "tree": tree_resp.json().get("sha")}
+    update_sync_meta(updates)
+    report_sync_results(results)
+    return [listing] + results, head_sha
+
+@st.cache_resource
+def get_sync_state():
+    """Process-wide sync bookkeeping, shared by every session and rerun."""
+    return {
+        "lock": threading.Lock(),
+        "meta_lock": threading.Lock(),
+        "last_sync": 0.0,
+        "results": [],
+        "wall_time": 0.0,
+        "head_sha": None,
+        "stale": False,
+    }
+
+def request_sync():
+    """Make the next rerun pull from GitHub (refresh button, rejected pushes)."""
+    st.session_state["sync_requested"] = True
+
+def sync_is_due(state) -> bool:
+    if state["stale"]:
+        return True
+    if SYNC_TTL_SECONDS > 0:
+        return time.time() - state["last_sync"] >= SYNC_TTL_SECONDS
+    return not st.session_state.get("synced_this_session", False)
+
+def sync_gate(files):
+    """
+    Pull from GitHub only when needed: once per session (or once per TTL
+    across sessions), when the user forces a refresh, or after a push was
+    rejected because the remote moved on. Files still waiting in the push
+    queue are never overwritten by a pull. Every other rerun (slider drags,
+    button clicks, week navigation) works from the local files.
+    """
+    state = get_sync_state()
+    forced = st.session_state.pop("sync_requested", False)
+    if forced or sync_is_due(state):
+        with state["lock"]:
+            # Another session may have pulled while we waited on the lock
+            if forced or sync_is_due(state):
+                started = time.perf_counter()
+                snapshot = sync_tree_from_github(files) if SYNC_MODE == "tree" else None
+                if snapshot is not None:
+                    state["results"], state["head_sha"] = snapshot
+                else:
+                    results = sync_from_github(files)
+                    # Single-file tables not yet split into partitions (no manifest here or in GitHub)
+                    legacy = [table for table in PARTITIONED_TABLES if not os.path.exists(manifest_path(table))]
+                    if legacy:
+                        results += sync_from_github(legacy)
+                    # Partition files listed in the manifests that were just pulled
+                    partitions = list(dict.fromkeys(
+                        fp for table in PARTITIONED_TABLES for fp in table_files(table)
+                        if fp not in files and not partition_spec(fp)
+                    ))
+                    if partitions:
+                        results += sync_from_github(partitions)
+                    state["results"], state["head_sha"] = results, None
+                state["wall_time"] = time.perf_counter() - started
+                state["last_sync"] = time.time()
+                state["stale"] = False
+        st.session_state["synced_this_session"] = True
+    return state
+
+def github_put_file(file_path: str, commit_message: str):
+    """
+    Push one local file with the Contents API.
+    The PUT uses the blob SHA remembered from the last sync or push, so a
+    write is normally a single round trip; only if GitHub rejects that SHA
+    (409/422, the file moved on remotely) do we GET the current SHA and retry.
+    Returns (ok, http_status, error_message); never calls st.*, so the
+    background push worker can use it.
+    """
+    github = get_github_client()
+    url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{file_path}"
+    # Read local content
+    with open(file_path, "rb") as f:
+        content_b64 = base64.b64encode(f.read()).decode("utf-8")
+
+    sha = load_sync_meta().get(file_path, {}).get("sha")
+    for attempt in range(2):
+        if attempt == 1:
+            # Cached SHA was stale (or missing and the file exists): ask GitHub
+            get_resp = github.get(url)
+            sha = get_resp.json().get("sha") if get_resp.status_code == 200 else None
+
+        payload = {"message": commit_message, "content": content_b64, "branch": BRANCH}
+        if sha:
+            payload["sha"] = sha
+
+        put_resp = github.put(url, json=payload)
+        if put_resp.status_code not in (409, 422):
+            break
+
+    if put_resp.status_code in (200, 201):
+        # Remote now matches the local file; the old ETag no longer applies
+        j = put_resp.json()
+        new_sha = (j.get("content") or {}).get("sha")
+        commit = j.get("commit") or {}
+        update_sync_meta({
+            file_path: {"sha": new_sha} if new_sha else None,
+            HEAD_META_KEY: (
+                {"commit": commit["sha"], "tree": commit["tree"]["sha"]}
+                if commit.get("sha") and (commit.get("tree") or {}).get("sha")
+                else None
+            ),
+        })
+        return True, put_resp.status_code, ""
+    return False, put_resp.status_code, (
+        f"Failed to push '{file_path}' (HTTP {put_resp.status_code}). "
+        f"Response: {put_resp.text[:300]}"
+    )
+
+def github_commit_files(file_paths, commit_message: str, deleted_paths=()):
+    """
+    Push several local files to GitHub as ONE commit using the Git Data API
+    (blobs -> tree -> commit -> move the branch ref). Related CSV changes land
+    together or not at all, instead of one GET+PUT round trip and one commit
+    per file with half-applied states if something fails midway.
+    deleted_paths are removed from the branch in the same commit.
+    Returns (ok, http_status, error_message); never calls st.*.
+    """
+    file_paths = list(dict.fromkeys(file_paths))
+    deleted_paths = [fp for fp in dict.fromkeys(deleted_paths) if fp not in file_paths]
+    if not file_paths and not deleted_paths:
+        return True, None, ""
+    github = get_github_client()
+    api = f"https://api.github.com/repos/{GITHUB_REPO}/git"
+    # Blobs GitHub already stores under some path (e.g. a file we only moved) need no upload
+    known_shas = {entry.get("sha") for entry in load_sync_meta().values() if isinstance(entry, dict)}
+
+    def create_blob(file_path):
+        sha = local_blob_sha(file_path)
+        if sha in known_shas:
+            return sha
+        with open(file_path, "rb") as f:
+            content_b64 = base64.b64encode(f.read()).decode("utf-8")
+        resp = github.post(f"{api}/blobs", json={"content": content_b64, "encoding": "base64"})
+        return resp.json().get("sha") if resp.status_code == 201 else None
+
+    # Blobs don't depend on the branch head, so upload them once, concurrently
+    with ThreadPoolExecutor(max_workers=max(1, len(file_paths))) as pool:
+        blob_shas = dict(zip(file_paths, pool.map(create_blob, file_paths)))
+    failed = [fp for fp, sha in blob_shas.items() if not sha]
+    if failed:
+        return False, None, f"Failed to upload {', '.join(failed)} to GitHub."
+
+    # Start from the head remembered by the last sync/push (no ref + commit
+    # GETs); if the branch has moved since, the ref update is rejected as a
+    # non-fast-forward and we re-read the real head and try again.
+    head = load_sync_meta().get(HEAD_META_KEY)
+    for _attempt in range(3):
+        if not head:
+            last_resp = github.get(f"{api}/ref/heads/{BRANCH}")
+            if last_resp.status_code != 200:
+                break
+            head_sha = last_resp.json()["object"]["sha"]
+            head = {
+                "commit": head_sha,
+                "tree": github.get(f"{api}/commits/{head_sha}").json()["tree"]["sha"],
+            }
+
+        tree_resp = github.post(f"{api}/trees", json={
+            "base_tree": head["tree"],
+            "tree": [
+                {"path": fp, "mode": "100644", "type": "blob", "sha": sha}
+                for fp, sha in blob_shas.items()
+            ] + [
+                {"path": fp, "mode": "100644", "type": "blob", "sha": None}
+                for fp in deleted_paths
+            ],
+        })
+        new_tree = tree_resp.json()["sha"]
+        commit_resp = github.post(f"{api}/commits", json={
+            "message": commit_message,
+            "tree": new_tree,
+            "parents": [head["commit"]],
+        })
+        new_commit = commit_resp.json()["sha"]
+
+        last_resp = github.patch(f"{api}/refs/heads/{BRANCH}", json={"sha": new_commit})
+        if last_resp.status_code == 200:
+            update_sync_meta({
+                **{fp: {"sha": sha} for fp, sha in blob_shas.items()},
+                **{fp: None for fp in deleted_paths},
+                HEAD_META_KEY: {"commit": new_commit, "tree": new_tree},
+            })
+            return True, last_resp.status_code, ""
+        if last_resp.status_code != 422:
+            break
+        head = None
+        # 422: not a fast-forward (the branch moved since we read it); go again
+
+    return False, last_resp.status_code, (
+        f"Failed to push {', '.join(file_paths + deleted_paths)} (HTTP {last_resp.status_code}). "
+        f"Response: {last_resp.text[:300]}"
+    )
+
+# -------------------------------------------------
+# Write-behind push queue
+# -------------------------------------------------
+# Saves write the local file and return immediately; a background worker
+# pushes queued files later. The queue lives on disk so pending pushes survive
+# a restart, and repeated writes to the same file collapse into one entry, so
+# five priority-slider changes push the final todos.csv once.
+PUSH_QUEUE_FILE = os.path.join(DATA_DIR, ".push_queue.json")
+PUSH_DEBOUNCE_SECONDS = 2.0     # quiet period before a flush, lets bursts coalesce
+PUSH_MAX_BACKOFF_SECONDS = 300
+
+def load_push_queue():
+    """
+    Return the durable queue:
+    {"pending": {path: {"message", "seq"}}, "seq", "attempts", "next_try", "last_error"}
+    """
+    queue = {"pending": {}, "seq": 0, "attempts": 0, "next_try": 0.0, "last_error": None}
+    if os.path.exists(PUSH_QUEUE_FILE):
+        try:
+            with open(PUSH_QUEUE_FILE, "r", encoding="utf-8") as f:
+                queue.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+    return queue
+
+def save_push_queue(queue):
+    write_file_atomic(PUSH_QUEUE_FILE, json.dumps(queue, indent=2, sort_keys=True).encode("utf-8"))
+
+def record_push_failure(worker, error: str):
+    """Back off before the next attempt and keep error for the sidebar."""
+    with worker["lock"]:
+        queue = load_push_queue()
+        queue["attempts"] += 1
+        backoff = min(PUSH_MAX_BACKOFF_SECONDS, 2 ** queue["attempts"])
+        queue["next_try"] = time.time() + backoff * random.uniform(0.5, 1.5)
+        queue["last_error"] = error
+        save_push_queue(queue)
+
+def flush_push_queue(worker):
+    """Push everything pending as one commit (worker thread; no st.* calls)."""
+    with worker["lock"]:
+        queue = load_push_queue()
+        batch = dict(queue["pending"])
+    if not batch:
+        return
+
+    for fp in batch:
+        export_csv(fp)  # binary storage backends write the CSV lazily
+    # Skip files whose bytes GitHub already has (e.g. the untouched months of a partitioned table)
+    meta = load_sync_meta()
+    paths = [
+        fp for fp in batch
+        if os.path.exists(fp) and (meta.get(fp) or {}).get("sha") != local_blob_sha(fp)
+    ]
+    # Queued files that no longer exist locally were moved away (archive / restore)
+    deleted = [fp for fp in batch if not os.path.exists(fp) and (meta.get(fp) or {}).get("sha")]
+    messages = list(dict.fromkeys(entry["message"] for entry in batch.values()))
+    commit_message = messages[0] if len(messages) == 1 else "; ".join(messages)
+    try:
+        if not paths and not deleted:
+            ok, status, error = True, None, ""
+        elif len(paths) == 1 and not deleted:
+            ok, status, error = github_put_file(paths[0], commit_message)
+        else:
+            ok, status, error = github_commit_files(paths, commit_message, deleted)
+    except (requests.RequestException, KeyError, ValueError, OSError) as e:
+        ok, status, error = False, None, f"Push failed: {e}"
+    if status in (409, 422):
+        # Remote moved on; refresh the files we aren't holding local edits for
+        get_sync_state()["stale"] = True
+
+    if not ok:
+        record_push_failure(worker, error)
+        return
+    with worker["lock"]:
+        queue = load_push_queue()
+        # Keep entries that were re-queued while this push was in flight
+        for fp, entry in batch.items():
+            if queue["pending"].get(fp, {}).get("seq") == entry["seq"]:
+                queue["pending"].pop(fp)
+        queue["attempts"], queue["next_try"], queue["last_error"] = 0, 0.0, None
+        save_push_queue(queue)
+
+def push_worker_loop(worker):
+    while True:
+        worker["wake"].wait(timeout=5)
+        worker["wake"].clear()
+        try:
+            with worker["lock"]:
+                queue = load_push_queue()
+            if not queue["pending"] or time.time() < queue["next_try"]:
+                continue
+            quiet_for = time.time() - worker["last_enqueued"]
+            if quiet_for < PUSH_DEBOUNCE_SECONDS:
+                time.sleep(PUSH_DEBOUNCE_SECONDS - quiet_for)
+                worker["wake"].set()
+                continue
+            flush_push_queue(worker)
+        except Exception as e:
+            # Anything unexpected (an odd API payload, a damaged queue file) is
+            # retried with backoff like a failed push instead of ending the worker
+            try:
+                record_push_failure(worker, f"Push failed: {e!r}")
+            except Exception:
+                pass  # the queue file itself is unusable; retry on the next wake
+
+@st.cache_resource
+def get_push_worker():
+    """Start (once per process) the background thread that drains the push queue."""
+    worker = {"lock": threading.Lock(), "wake": threading.Event(), "last_enqueued": 0.0}
+    worker["thread"] = threading.Thread(target=push_worker_loop, args=(worker,), daemon=True)
+    worker["thread"].start()
+    worker["wake"].set()  # flush anything left over from a previous run
+    return worker
+
+def queue_push(file_paths, commit_message: str):
+    """
+    Queue local files for pushing and return immediately. Files queued in one
+    call are pushed in the same commit. Requires GITHUB_TOKEN with 'repo' scope.
+    """
+    if not GITHUB_TOKEN:
+        st.error(
+            "GitHub token not set. Add GITHUB_TOKEN in Streamlit secrets to enable pushing."
+        )
+        return False
+    worker = get_push_worker()
+    with worker["lock"]:
+        queue = load_push_queue()
+        # A partitioned table is pushed as its manifest + partition files
+        for file_path in dict.fromkeys(fp for path in file_paths for fp in table_files(path)):
+            queue["seq"] += 1
+            queue["pending"][file_path] = {"message": commit_message, "seq": queue["seq"]}
+        save_push_queue(queue)
+        worker["last_enqueued"] = time.time()
+    worker["wake"].set()
+    return True
+
+def retry_pushes_now():
+    """Sidebar button: skip the current backoff and push again."""
+    worker = get_push_worker()
+    with worker["lock"]:
+        queue = load_push_queue()
+        queue["next_try"] = 0.0
+        save_push_queue(queue)
+    worker["wake"].set()
+
+def push_to_github(file_path: str, commit_message: str):
+    """Queue one local file for pushing to GitHub (see queue_push)."""
+    return queue_push([file_path], commit_message)
+
+def commit_files_to_github(file_paths, commit_message: str):
+    """Queue related files so they are pushed together as one commit."""
+    return queue_push(file_paths, commit_message)
+
+def apply_css_from_github(css_path="data/style.css"):
+    """
+    Fetch CSS from GitHub (public read) and apply to the Streamlit app.
+    """
+    url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{css_path}?ref={BRANCH}"
+    resp = get_github_client().get(url)
+    if resp.status_code == 200:
+        content = base64.b64decode(resp.json()["content"]).decode("utf-8")
+        st.markdown(f"<style>{content}</style>", unsafe_allow_html=True)
+    elif os.path.exists(css_path):
+        # Fallback: local CSS
+        with open(css_path, "r", encoding="utf-8") as f:
+            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    else:
+        st.warning(f"CSS file '{css_path}' not found in GitHub or locally.")
+
+# -------------------------------------------------
+# Initialize Data
+# -------------------------------------------------
+def apply_css_from_github(css_path="data/style.css"):
+    """Fetch CSS from GitHub using token and apply to Streamlit app."""
+    url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{css_path}?ref={BRANCH}"
+    response = get_github_client().get(url)
+    
+    if response.status_code == 200:
+        # Decode base64 content
+        content = base64.b64decode(response.json()["content"]).decode("utf-8")
+        # Inject CSS into Streamlit
+        st.markdown(f"<style>{content}</style>", unsafe_allow_html=True)
+    else:
+        st.warning(f"CSS file '{css_path}' not found in GitHub.")
+
+# Call this early in your app (after st.set_page_config)
+#apply_css_from_github()
+
+
+
+
+
+st.markdown('<link rel="stylesheet" href="YOUR_GITHUB_RAW_CSS_URL">', unsafe_allow_html=True)
+# Ensure files exist locally
+
+# Optionally apply CSS from the synced file
+
+
+# -------------------------------------------------
+# Table Schemas
+# -------------------------------------------------
+# One declaration per table: column -> (type, default). Reads, writes, empty-file
+# creation and data-editor clean-up all go through these, so a column list or a
+# date format lives in exactly one place.
+ARCHIVE_CLIENTS_FILE = os.path.join(DATA_DIR, "archive_clients.csv")
+ARCHIVE_CATEGORIES_FILE = os.path.join(DATA_DIR, "archive_categories.csv")
+ARCHIVE_TODOS_FILE = os.path.join(DATA_DIR, "archive_todos.csv")
+ARCHIVE_HOURS_FILE = os.path.join(DATA_DIR, "archive_hours.csv")
+# Completed to-dos live apart from the open ones (todos.csv), see "Hot / Cold To-Dos"
+COMPLETED_TODOS_FILE = os.path.join(DATA_DIR, "completed_todos.csv")
+ARCHIVE_COMPLETED_TODOS_FILE = os.path.join(DATA_DIR, "archive_completed_todos.csv")
+
+# Canonical on-disk format for every date column
+DATE_FORMAT = "%Y-%m-%d"
+
+HOURS_SCHEMA = {
+    "Date": ("date", None),
+    "Client": ("text", ""),
+    "Hours": ("float", 0.0),
+    "Description": ("text", ""),
+}
+TODOS_SCHEMA = {
+    "Client": ("text", ""),
+    "Category": ("text", ""),
+    "Task": ("text", ""),
+    "Priority": ("int", 3),
+    "DateCreated": ("date", None),
+    "DateCompleted": ("date", None),
+    "Notes": ("text", ""),
+}
+CLIENTS_SCHEMA = {
+    "Client": ("text", ""),
+    "Color": ("text", ""),
+}
+CATEGORIES_SCHEMA = {
+    "Client": ("text", ""),
+    "Category": ("text", ""),
+}
+DAYS_OFF_SCHEMA = {
+    "Date": ("date", None),
+    "Reason": ("text", ""),
+}
+PERIOD_SCHEMA = {
+    "StartDate": ("date", None),
+    "EndDate": ("date", None),
+    "HoursGoal": ("float", None),
+}
+GOALS_SCHEMA = {
+    "Month": ("text", ""),
+    "GoalHours": ("float", 0.0),
+}
+
+TABLE_SCHEMAS = {os.path.normpath(path): schema for path, schema in {
+    HOURS_FILE: HOURS_SCHEMA,
+    UNENTERED_HOURS_FILE: HOURS_SCHEMA,
+    ARCHIVE_HOURS_FILE: HOURS_SCHEMA,
+    TODOS_FILE: TODOS_SCHEMA,
+    ARCHIVE_TODOS_FILE: TODOS_SCHEMA,
+    COMPLETED_TODOS_FILE: TODOS_SCHEMA,
+    ARCHIVE_COMPLETED_TODOS_FILE: TODOS_SCHEMA,
+    CLIENTS_FILE: CLIENTS_SCHEMA,
+    ARCHIVE_CLIENTS_FILE: CLIENTS_SCHEMA,
+    CATEGORIES_FILE: CATEGORIES_SCHEMA,
+    ARCHIVE_CATEGORIES_FILE: CATEGORIES_SCHEMA,
+    DAYS_OFF_FILE: DAYS_OFF_SCHEMA,
+    PERIOD_FILE: PERIOD_SCHEMA,
+    GOALS_FILE: GOALS_SCHEMA,
+}.items()}
+
+def table_schema(file_path: str):
+    """Schema for a data/ path (either separator) or a partition of one, or None for untyped files."""
+    owner = partition_owner(file_path)
+    return TABLE_SCHEMAS.get(owner or os.path.normpath(file_path))
+
+# read_csv dtype per column type. Dates are read as text and parsed with an
+# explicit ISO format; ints go through float64 so blanks / "4.0" don't fail.
+READ_DTYPES = {"text": str, "float": "float64", "int": "float64", "date": str}
+
+def conform_table(df, schema):
+    """Coerce df to schema: add missing columns, fix dtypes, schema columns first."""
+    df = df.copy()
+    for col, (kind, default) in schema.items():
+        if col not in df.columns:
+            df[col] = default
+        if kind == "text":
+            df[col] = df[col].fillna("").astype(str).str.strip()
+        elif kind == "date":
+            if not pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = pd.to_datetime(
+                    df[col].astype(str).str.strip(), format="ISO8601", errors="coerce"
+                )
+        else:
+            values = pd.to_numeric(df[col], errors="coerce")
+            if default is not None:
+                values = values.fillna(default)
+            df[col] = values.astype(int) if kind == "int" else values.astype(float)
+    return df[list(schema) + [c for c in df.columns if c not in schema]]
+
+def empty_table(schema):
+    return conform_table(pd.DataFrame(columns=list(schema)), schema)
+
+def read_table(file_path: str, schema):
+    """Read a CSV with the schema's dtypes and columns, then conform it."""
+    read_args = dict(
+        usecols=lambda c: c in schema,
+        skipinitialspace=True,  # tolerates headers / values saved as ", HoursGoal"
+    )
+    try:
+        df = pd.read_csv(
+            file_path,
+            dtype={col: READ_DTYPES[kind] for col, (kind, _) in schema.items()},
+            **read_args,
+        )
+    except ValueError:
+        # A hand-edited non-numeric cell: read as text and let conform_table coerce it
+        df = pd.read_csv(file_path, dtype=str, **read_args)
+    return conform_table(df, schema)
+
+# -------------------------------------------------
+# Storage Backend (CSV, or Parquet / Feather with CSV export)
+# -------------------------------------------------
+STORAGE_SUFFIXES = {"parquet": ".parquet", "feather": ".feather"}
+STORAGE_WARNING = None
+if STORAGE_BACKEND != "csv":
+    try:
+        import pyarrow  # noqa: F401  (engine for both parquet and feather)
+    except ImportError:
+        STORAGE_WARNING = f"STORAGE_BACKEND={STORAGE_BACKEND!r} needs pyarrow; using CSV."
+        STORAGE_BACKEND = "csv"
+    if STORAGE_BACKEND not in STORAGE_SUFFIXES and STORAGE_BACKEND != "csv":
+        STORAGE_WARNING = f"Unknown STORAGE_BACKEND {STORAGE_BACKEND!r}; using CSV."
+        STORAGE_BACKEND = "csv"
+
+def storage_path(file_path: str):
+    """Local file a table is read from / written to (the CSV itself under the csv backend)."""
+    if STORAGE_BACKEND == "csv" or table_schema(file_path) is None or partition_spec(file_path):
+        return file_path
+    return os.path.splitext(file_path)[0] + STORAGE_SUFFIXES[STORAGE_BACKEND]
+
+def table_exists(file_path: str):
+    if partition_spec(file_path):
+        return os.path.exists(manifest_path(file_path)) or os.path.exists(file_path)
+    return os.path.exists(file_path) or os.path.exists(storage_path(file_path))
+
+def write_binary_table(df, path: str):
+    """Atomically write df as parquet / feather (zstd-compressed)."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp_")
+    os.close(fd)
+    try:
+        if STORAGE_BACKEND == "parquet":
+            df.to_parquet(tmp_path, index=False, compression="zstd")
+        else:
+            df.reset_index(drop=True).to_feather(tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def read_binary_table(path: str, schema):
+    """Read only the schema's columns (column projection); older files fall back to a full read."""
+    reader = pd.read_parquet if STORAGE_BACKEND == "parquet" else pd.read_feather
+    try:
+        df = reader(path, columns=list(schema))
+    except (KeyError, ValueError):
+        df = reader(path)
+    return conform_table(df, schema)
+
+def refresh_storage(file_path: str):
+    """
+    Return the path to read file_path from, first re-importing the CSV into
+    binary storage if the CSV is newer (fresh from a GitHub sync or hand-edited).
+    """
+    path = storage_path(file_path)
+    if path == file_path:
+        return path
+    csv_version, binary_version = file_version(file_path), file_version(path)
+    if csv_version and (binary_version is None or csv_version[0] > binary_version[0]):
+        write_binary_table(read_table(file_path, table_schema(file_path)), path)
+        mtime = file_version(path)[0]
+        os.utime(file_path, ns=(mtime, mtime))
+    return path
+
+def export_csv(file_path: str):
+    """Write file_path's CSV from binary storage if the binary copy is newer (safe off the script thread)."""
+    path = storage_path(file_path)
+    if path == file_path:
+        return
+    csv_version, binary_version = file_version(file_path), file_version(path)
+    if binary_version is None or (csv_version and csv_version[0] >= binary_version[0]):
+        return
+    df = read_binary_table(path, table_schema(file_path))
+    write_file_atomic(file_path, df.to_csv(index=False, date_format=DATE_FORMAT).encode("utf-8"))
+    # Same mtime as its source, so refresh_storage doesn't re-import our own export
+    os.utime(file_path, ns=(binary_version[0], binary_version[0]))
+
+def export_all_csv():
+    for table in TABLE_SCHEMAS:
+        for file_path in table_files(table):
+            export_csv(file_path)
+
+# -------------------------------------------------
+# Data Access (cached, schema-typed DataFrames)
+# -------------------------------------------------
+# Every page reads through load_table(): the parsed + typed DataFrame is
+# cached per (path, mtime, size), so a rerun that doesn't touch a file parses
+# zero CSVs. Every write goes through save_table(), which writes the canonical
+# form and drops the old entry.
+def file_version(file_path: str):
+    """(mtime_ns, size) of a file, or None if it doesn't exist: the cache key for its contents."""
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def read_table_cached(file_path: str, version):
+    schema = table_schema(file_path)
+    if schema is None:
+        return pd.read_csv(file_path) if version else pd.DataFrame()
+    if not version:
+        return empty_table(schema)
+    path = storage_path(file_path)
+    return read_table(path, schema) if path == file_path else read_binary_table(path, schema)
+
+def load_table(file_path: str):
+    """Parsed, typed DataFrame for file_path (a fresh copy; safe to mutate)."""
+    if partition_spec(file_path):
+        return load_partitions(file_path)
+    return read_table_cached(file_path, file_version(refresh_storage(file_path)))
+
+def save_table(df, file_path: str):
+    """Write df to file_path's storage in canonical form and invalidate its cached parse."""
+    if partition_spec(file_path):
+        write_partitions(file_path, df)
+        return
+    schema = table_schema(file_path)
+    if schema is not None:
+        df = conform_table(df, schema)[list(schema)]
+    path = storage_path(file_path)
+    old_version = file_version(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if path == file_path:
+        # Atomic, so the push worker never reads (and commits) a half-written CSV
+        write_file_atomic(file_path, df.to_csv(index=False, date_format=DATE_FORMAT).encode("utf-8"))
+    else:
+        write_binary_table(df, path)
+    if old_version:
+        read_table_cached.clear(file_path, old_version)
+
+def csv_header(file_path: str):
+    with open(file_path, newline="", encoding="utf-8") as f:
+        return [c.strip() for c in next(csv.reader(f), [])]
+
+def append_table(rows, file_path: str):
+    """
+    Append rows to file_path without rewriting it, so logging one entry costs
+    O(new rows) instead of O(history). Falls back to a full save_table() when
+    the file is missing, its header isn't in schema order, or storage is
+    binary (parquet / feather can't be appended in place).
+    """
+    if partition_spec(file_path):
+        append_partitions(file_path, rows)
+        return
+    schema = table_schema(file_path)
+    rows = conform_table(rows, schema)[list(schema)]
+    path = storage_path(file_path)
+    old_version = file_version(path)
+    if path != file_path or not old_version or csv_header(file_path) != list(schema):
+        save_table(pd.concat([load_table(file_path), rows], ignore_index=True), file_path)
+        return
+
+    with open(file_path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        needs_newline = f.read(1) != b"\n"
+    with open(file_path, "a", newline="", encoding="utf-8") as f:
+        if needs_newline:
+            f.write(os.linesep)
+        rows.to_csv(f, header=False, index=False, date_format=DATE_FORMAT)
+    read_table_cached.clear(file_path, old_version)
+    db_append_rows(file_path, rows, old_version)
+
+
+# -------------------------------------------------
+# Partitioned Tables (hours by month, client tables by client)
+# -------------------------------------------------
+# hours lives in data/hours/YYYY-MM.csv plus data/hours/manifest.json
+# ({"partitions": {"2026-06": {"rows": 42}, ...}}). Writers rewrite, and the
+# push queue sends, only the partitions that changed; the query store
+# re-imports only those. A single-file table (data/hours.csv, data/todos.csv,
+# ...) is merged into the partitions and then deleted, locally and (with the
+# table's next push) in GitHub. If one comes back (e.g. pushed by an older
+# deployment) only the rows the partitions lack are merged in.
+HOURS_DIR = f"{DATA_DIR}/hours"
+UNDATED_PARTITION = "undated"
+
+# clients / categories / todos (and their archive_* twins) are split per
+# client. One shared manifest records each client's partition key and status;
+# archiving or restoring a client flips that status and moves the client's
+# files between data/<table>/ and data/archive/<table>/.
+CLIENT_MANIFEST_FILE = f"{DATA_DIR}/clients/manifest.json"
+
+def month_partition_keys(df, manifest, spec):
+    return df["Date"].dt.strftime("%Y-%m").fillna(UNDATED_PARTITION)
+
+def client_key(manifest: dict, client: str, status: str):
+    """Partition key for client, registering a new file-name-safe one (with status) if needed."""
+    for key, entry in manifest["partitions"].items():
+        if entry.get("client") == client:
+            return key
+    base = re.sub(r"[^a-z0-9]+", "-", client.lower()).strip("-") or "client"
+    key, n = base, 1
+    while key in manifest["partitions"]:
+        n += 1
+        key = f"{base}-{n}"
+    manifest["partitions"][key] = {"client": client, "status": status}
+    return key
+
+def client_partition_keys(df, manifest, spec):
+    keys = {client: client_key(manifest, client, spec["status"]) for client in df["Client"].unique()}
+    return df["Client"].map(keys)
+
+def client_table_specs(name: str):
+    """Partition specs for data/<name>.csv (active clients) and data/archive_<name>.csv (archived)."""
+    common = {"keys": client_partition_keys, "manifest": CLIENT_MANIFEST_FILE}
+    return {
+        f"{DATA_DIR}/{name}.csv": {**common, "dir": f"{DATA_DIR}/{name}", "status": "active"},
+        f"{DATA_DIR}/archive_{name}.csv": {**common, "dir": f"{DATA_DIR}/archive/{name}", "status": "archived"},
+    }
+
+PARTITIONED_TABLES = {os.path.normpath(path): spec for path, spec in {
+    HOURS_FILE: {"dir": HOURS_DIR, "keys": month_partition_keys, "count_rows": True},
+    **client_table_specs("clients"),
+    **client_table_specs("categories"),
+    **client_table_specs("todos"),
+    **client_table_specs("completed_todos"),
+}.items()}
+
+# (active, archived) tables whose per-client files move on archive / restore
+CLIENT_TABLE_PAIRS = [
+    (CLIENTS_FILE, ARCHIVE_CLIENTS_FILE),
+    (CATEGORIES_FILE, ARCHIVE_CATEGORIES_FILE),
+    (TODOS_FILE, ARCHIVE_TODOS_FILE),
+    (COMPLETED_TODOS_FILE, ARCHIVE_COMPLETED_TODOS_FILE),
+]
+
+def partition_spec(file_path: str):
+    return PARTITIONED_TABLES.get(os.path.normpath(file_path))
+
+def partition_owner(file_path: str):
+    """Logical table path if file_path is one of its partition CSVs, else None."""
+    norm = os.path.normpath(file_path)
+    if not norm.endswith(".csv"):
+        return None
+    for logical, spec in PARTITIONED_TABLES.items():
+        if os.path.dirname(norm) == os.path.normpath(spec["dir"]):
+            return logical
+    return None
+
+def manifest_path(file_path: str):
+    spec = partition_spec(file_path)
+    return spec.get("manifest") or f"{spec['dir']}/manifest.json"
+
+def partition_path(file_path: str, key: str):
+    return f"{partition_spec(file_path)['dir']}/{key}.csv"
+
+def load_manifest(file_path: str):
+    try:
+        with open(manifest_path(file_path), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+    manifest.setdefault("partitions", {})
+    manifest.setdefault("sources", {})
+    if "source" in manifest:
+        # Single-table manifests used to keep one top-level "source"
+        manifest["sources"][os.path.basename(file_path)] = manifest.pop("source")
+    return manifest
+
+def save_manifest(file_path: str, manifest: dict):
+    write_file_atomic(
+        manifest_path(file_path),
+        (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode("utf-8"),
+    )
+
+def manifest_keys(manifest: dict, spec):
+    """Keys of spec's partitions: those the manifest gives its status (all of them for unstatused tables)."""
+    status = spec.get("status")
+    return sorted(
+        key for key, entry in manifest["partitions"].items()
+        if status is None or entry.get("status") == status
+    )
+
+def migrate_legacy_table(file_path: str):
+    """
+    Merge a single-file table into its partitions, then delete the file. Rows
+    the partitions already hold are skipped, so a re-import never overwrites
+    entries made since the last one.
+    """
+    if not os.path.exists(file_path):
+        return
+    source_name = os.path.basename(file_path)
+    manifest = load_manifest(file_path)
+    sha = local_blob_sha(file_path)
+    # Same bytes as already imported: a sync brought back a file not yet deleted in GitHub
+    if sha != manifest["sources"].get(source_name, {}).get("sha"):
+        schema = table_schema(file_path)
+        frames = [
+            load_table(partition_path(file_path, key))
+            for key in manifest_keys(manifest, partition_spec(file_path))
+        ]
+        current = pd.concat(frames, ignore_index=True) if frames else empty_table(schema)
+        added = rows_not_in(read_table(file_path, schema), current)
+        write_partitions(file_path, pd.concat([current, added], ignore_index=True))
+        manifest = load_manifest(file_path)
+        manifest["sources"][source_name] = {"sha": sha}
+        save_manifest(file_path, manifest)
+    os.remove(file_path)
+
+def partition_keys(file_path: str):
+    migrate_legacy_table(file_path)
+    return manifest_keys(load_manifest(file_path), partition_spec(file_path))
+
+def table_files(file_path: str):
+    """
+    Files that make up file_path on disk and in GitHub: the manifest + the
+    partitions of every table listed in it (so a pushed manifest never names a
+    file GitHub lacks), or just the file. The tables' single-file paths are
+    listed too, so a push deletes a migrated legacy file from GitHub.
+    """
+    manifest = manifest_path(file_path) if partition_spec(file_path) else file_path
+    tables = [t for t in PARTITIONED_TABLES if os.path.normpath(manifest_path(t)) == os.path.normpath(manifest)]
+    if not tables:
+        return [file_path]
+    return [manifest_path(tables[0])] + [
+        partition_path(table, key) for table in tables for key in partition_keys(table)
+    ] + tables
+
+def load_partitions(file_path: str):
+    frames = [load_table(partition_path(file_path, key)) for key in partition_keys(file_path)]
+    if not frames:
+        return empty_table(table_schema(file_path))
+    return pd.concat(frames, ignore_index=True)
+
+def same_rows(a, b):
+    """Would a and b serialise to the same CSV? (dtype-insensitive row comparison)"""
+    return len(a) == len(b) and (
+        a.to_csv(index=False, date_format=DATE_FORMAT) == b.to_csv(index=False, date_format=DATE_FORMAT)
+    )
+
+def locate_rows(rows, other):
+    """
+    Position in other of each row of rows (all columns compared, NaN == NaN;
+    repeats match successive occurrences), -1 where other has no such row.
+    """
+    cols = list(rows.columns)
+    left = rows[cols].assign(_n=rows.groupby(cols, dropna=False, sort=False).cumcount())
+    right = other[cols].assign(
+        _n=other.groupby(cols, dropna=False, sort=False).cumcount(), _pos=np.arange(len(other))
+    )
+    found = left.merge(right, on=cols + ["_n"], how="left")["_pos"]
+    return pd.Series(found.fillna(-1).astype(int).to_numpy(), index=rows.index)
+
+def rows_not_in(rows, other):
+    """rows minus one matching row of other per occurrence (all columns compared, NaN == NaN)."""
+    return rows[(locate_rows(rows, other) < 0).to_numpy()]
+
+def write_partitions(file_path: str, df):
+    """Save df as file_path's partitions, rewriting only the ones whose rows changed."""
+    spec = partition_spec(file_path)
+    schema = table_schema(file_path)
+    df = conform_table(df, schema)[list(schema)]
+    manifest = load_manifest(file_path)
+    before = json.dumps(manifest, sort_keys=True)
+    df, keys = redirect_misfiled_rows(file_path, df, spec["keys"](df, manifest, spec), manifest, spec)
+    groups = {key: rows for key, rows in df.groupby(keys, sort=False)}
+    for key in sorted(set(manifest_keys(manifest, spec)) | set(groups)):
+        rows = groups.get(key, df.iloc[0:0]).reset_index(drop=True)
+        path = partition_path(file_path, key)
+        if spec.get("count_rows"):
+            manifest["partitions"][key] = {"rows": len(rows)}
+        # Partitions that lose all their rows keep an empty file, so the push carries the deletion
+        if table_exists(path) and same_rows(load_table(path), rows):
+            continue
+        save_table(rows, path)
+    if json.dumps(manifest, sort_keys=True) != before or not os.path.exists(manifest_path(file_path)):
+        save_manifest(file_path, manifest)
+
+def append_partitions(file_path: str, rows):
+    """Append rows to the partitions they belong to (O(new rows))."""
+    migrate_legacy_table(file_path)
+    spec = partition_spec(file_path)
+    schema = table_schema(file_path)
+    rows = conform_table(rows, schema)[list(schema)]
+    manifest = load_manifest(file_path)
+    rows, keys = redirect_misfiled_rows(file_path, rows, spec["keys"](rows, manifest, spec), manifest, spec)
+    for key, part in rows.groupby(keys, sort=False):
+        append_table(part, partition_path(file_path, key))
+        if spec.get("count_rows"):
+            count = manifest["partitions"].get(key, {}).get("rows", 0)
+            manifest["partitions"][key] = {"rows": count + len(part)}
+    save_manifest(file_path, manifest)
+
+def client_sibling(file_path: str):
+    """The other table of file_path's (active, archived) pair."""
+    for pair in CLIENT_TABLE_PAIRS:
+        norm = [os.path.normpath(table) for table in pair]
+        if os.path.normpath(file_path) in norm:
+            return pair[1 - norm.index(os.path.normpath(file_path))]
+    return None
+
+def redirect_misfiled_rows(file_path: str, df, keys, manifest: dict, spec):
+    """
+    Send rows whose client the manifest files under another status (e.g. a
+    task added for a client archived meanwhile) to that status's table, where
+    they are read and pushed. Returns the (rows, keys) left for file_path.
+    """
+    if not spec.get("status"):
+        return df, keys
+    statuses = keys.map(lambda key: manifest["partitions"][key].get("status"))
+    misfiled = (statuses != spec["status"]).to_numpy()
+    if misfiled.any():
+        append_table(df[misfiled], client_sibling(file_path))
+    return df[~misfiled], keys[~misfiled]
+
+def set_client_status(client: str, status: str):
+    """
+    Archive ("archived") or restore ("active") a client without re-serialising
+    any rows: flip its status in the client manifest and move its partition
+    files (CSV and any binary copy) to the matching directory. Returns the
+    paths to push; the moved-from paths are pushed as deletions.
+    """
+    for table, _ in CLIENT_TABLE_PAIRS:
+        migrate_legacy_table(table)
+    for _, table in CLIENT_TABLE_PAIRS:
+        migrate_legacy_table(table)
+    manifest = load_manifest(CLIENTS_FILE)
+    key = client_key(manifest, client, status)
+    manifest["partitions"][key]["status"] = status
+
+    touched = [CLIENT_MANIFEST_FILE]
+    for active_table, archived_table in CLIENT_TABLE_PAIRS:
+        src_table, dst_table = (active_table, archived_table) if status == "archived" else (archived_table, active_table)
+        src, dst = partition_path(src_table, key), partition_path(dst_table, key)
+        if table_exists(src) and table_exists(dst):
+            # Rows already filed under the new status (e.g. pulled by a sync) stay, next to the moved ones
+            save_table(pd.concat([load_table(dst), load_table(src)], ignore_index=True), dst)
+            for src_file in dict.fromkeys([src, storage_path(src)]):
+                if os.path.exists(src_file):
+                    os.remove(src_file)
+        else:
+            for src_file, dst_file in dict.fromkeys([(src, dst), (storage_path(src), storage_path(dst))]):
+                if os.path.exists(src_file):
+                    os.makedirs(os.path.dirname(dst_file), exist_ok=True)
+                    os.replace(src_file, dst_file)
+        touched += [src, dst]
+    save_manifest(CLIENTS_FILE, manifest)
+    return touched
+
+# -------------------------------------------------
+# Hot / Cold To-Dos
+# -------------------------------------------------
+# todos holds only open tasks (small, read on every Home rerun); completed
+# tasks move to completed_todos, which only Data Entry pages through. The
+# archive_* twins are split the same way.
+TODO_STORES = [
+    (TODOS_FILE, COMPLETED_TODOS_FILE),
+    (ARCHIVE_TODOS_FILE, ARCHIVE_COMPLETED_TODOS_FILE),
+]
+
+def save_shown_rows(file_path: str, editors):
+    """
+    Write back data editors' changes to file_path. editors is [(shown, edited)]:
+    the rows each editor was given (e.g. one page) and what it returned, whose
+    index labels are shown's for kept rows and new for added ones. Edited rows
+    stay where they were, deleted ones are dropped, added ones go at the end;
+    rows no editor showed are untouched. Returns the files changed (none when
+    nothing did, so an unchanged save rewrites and pushes nothing).
+    """
+    schema = table_schema(file_path)
+    table = load_table(file_path).reset_index(drop=True)
+    result, dropped, added = table.copy(), [], []
+    for shown, edited in editors:
+        shown = conform_table(shown, schema)[list(schema)]
+        edited = conform_table(edited, schema)[list(schema)]
+        positions = locate_rows(shown, table)
+        positions = positions[positions >= 0]
+        kept = positions[positions.index.isin(edited.index)]
+        for col in schema:
+            result.iloc[kept.to_numpy(), result.columns.get_loc(col)] = edited.loc[kept.index, col].to_numpy()
+        dropped += positions[~positions.index.isin(edited.index)].tolist()
+        added.append(edited[~edited.index.isin(kept.index)])
+    result = pd.concat(
+        [result.drop(index=dropped)] + [rows for rows in added if len(rows) > 0], ignore_index=True
+    )
+    if same_rows(result, table):
+        return []
+    save_table(result, file_path)
+    return [file_path]
+
+def settle_todos():
+    """
+    Move completed rows that reached an open-task store (an import of the old
+    single-file todos.csv, a sync) to its completed store. Returns the files changed.
+    """
+    changed = []
+    for hot_file, cold_file in TODO_STORES:
+        hot = load_table(hot_file)
+        done = hot["DateCompleted"].notna()
+        if not done.any():
+            continue
+        # Rows the completed store already has (e.g. a re-import) are not added twice
+        moved = rows_not_in(hot[done], load_table(cold_file))
+        if len(moved) > 0:
+            append_table(moved, cold_file)
+        save_table(hot[~done], hot_file)
+        changed += [hot_file, cold_file]
+    return changed
+
+def save_todo_rows(editors):
+    """
+    save_shown_rows() for to-do editors showing rows from either store: each
+    edited row is filed as open or completed by DateCompleted (a row that
+    changes store is dropped from one and added to the other). Returns the
+    files changed.
+    """
+    editors = [(shown, conform_table(edited, TODOS_SCHEMA)) for shown, edited in editors]
+    saved = []
+    for store, completed in [(TODOS_FILE, False), (COMPLETED_TODOS_FILE, True)]:
+        saved += save_shown_rows(store, [
+            (shown, edited[edited["DateCompleted"].notna() == completed]) for shown, edited in editors
+        ])
+    return saved
+
+# -------------------------------------------------
+# Query Store (SQLite, indexed on Date / Client / completion)
+# -------------------------------------------------
+# A local SQLite copy of the larger tables, so pages run indexed range and
+# aggregate queries instead of scanning a whole DataFrame. Each table is
+# re-imported from its data/ file (the snapshot GitHub sync pulls and pushes)
+# whenever that file's version changes; writes still go through save_table().
+TABLE_DB_FILE = os.path.join(DATA_DIR, ".tables.sqlite")
+
+# Every stored row also carries _search: its cells as lowercase text joined by
+# SEARCH_SEPARATOR, built when the row is imported / appended. Searches are
+# instr() lookups on that one column instead of per-cell Python scans.
+SEARCH_SEPARATOR = "\x1f"
+SEARCH_MODES = ["All words", "Exact text"]
+
+HOURS_INDEXES = [("Date",), ("Client", "Date")]
+TODOS_INDEXES = [("DateCompleted",), ("Client", "DateCompleted"), ("Priority", "DateCreated")]
+DB_TABLES = {os.path.normpath(path): spec for path, spec in {
+    HOURS_FILE: ("hours", HOURS_INDEXES),
+    UNENTERED_HOURS_FILE: ("unentered_hours", HOURS_INDEXES),
+    ARCHIVE_HOURS_FILE: ("archive_hours", HOURS_INDEXES),
+    TODOS_FILE: ("todos", TODOS_INDEXES),
+    ARCHIVE_TODOS_FILE: ("archive_todos", TODOS_INDEXES),
+    COMPLETED_TODOS_FILE: ("completed_todos", TODOS_INDEXES),
+    ARCHIVE_COMPLETED_TODOS_FILE: ("archive_completed_todos", TODOS_INDEXES),
+    DAYS_OFF_FILE: ("days_off", [("Date",)]),
+    ARCHIVE_CLIENTS_FILE: ("archive_clients", [("Client",)]),
+    ARCHIVE_CATEGORIES_FILE: ("archive_categories", [("Client",)]),
+}.items()}
+
+@st.cache_resource
+def get_table_db():
+    """One SQLite connection per process, shared by every session under a lock."""
+    conn = sqlite3.connect(TABLE_DB_FILE, check_same_thread=False)
+    conn.execute("CREATE TABLE IF NOT EXISTS _table_versions (name TEXT PRIMARY KEY, version TEXT)")
+    conn.commit()
+    return {"conn": conn, "lock": threading.Lock()}
+
+# Bumped when the stored row layout changes (e.g. the _search column), forcing a re-import
+DB_ROW_LAYOUT = "search:1"
+
+def db_version(path: str, version, schema):
+    """What _table_versions records for a table: its storage file, that file's version and the columns."""
+    return json.dumps([path, version, list(schema), DB_ROW_LAYOUT])
+
+def search_text(df):
+    """Lowercase text of every cell in a row, one string per row (the _search column)."""
+    text = pd.Series("", index=df.index)
+    for col in df.columns:
+        text = text + SEARCH_SEPARATOR + df[col].astype(str).str.lower()
+    return text
+
+def db_rows(df, schema):
+    for col, (kind, _) in schema.items():
+        if kind == "date":
+            # ISO text sorts and compares correctly in SQL
+            df[col] = df[col].dt.strftime(DATE_FORMAT)
+    df["_search"] = search_text(df[list(schema)].fillna(""))
+    return df
+
+def create_db_table(conn, name: str, df, indexes):
+    df.to_sql(name, conn, if_exists="replace", index=False)
+    for cols in indexes:
+        conn.execute(
+            f'CREATE INDEX IF NOT EXISTS "ix_{name}_{"_".join(cols)}" ON "{name}" ({", ".join(cols)})'
+        )
+
+def db_table(file_path: str):
+    """SQLite table name for file_path, re-importing the file first if it changed."""
+    name, indexes = DB_TABLES[os.path.normpath(file_path)]
+    if partition_spec(file_path):
+        sync_db_partitions(file_path, name, indexes)
+        return name
+    schema = table_schema(file_path)
+    path = refresh_storage(file_path)
+    version = db_version(path, file_version(path), schema)
+    db = get_table_db()
+    with db["lock"]:
+        row = db["conn"].execute(
+            "SELECT version FROM _table_versions WHERE name = ?", (name,)
+        ).fetchone()
+    if row and row[0] == version:
+        return name
+
+    df = db_rows(load_table(file_path), schema)
+    with db["lock"]:
+        conn = db["conn"]
+        create_db_table(conn, name, df, indexes)
+        conn.execute("INSERT OR REPLACE INTO _table_versions VALUES (?, ?)", (name, version))
+        conn.commit()
+    return name
+
+# _table_versions value marking a table as kept per partition ("<name>:<key>" rows hold each version)
+PARTITIONED_DB_LAYOUT = "partitioned:2"
+
+def sync_db_partitions(file_path: str, name: str, indexes):
+    """Bring a partitioned table's store up to date, re-importing only partitions whose files changed."""
+    schema = table_schema(file_path)
+    wanted = {}
+    for key in partition_keys(file_path):
+        path = refresh_storage(partition_path(file_path, key))
+        wanted[f"{name}:{key}"] = (key, db_version(path, file_version(path), schema))
+
+    db = get_table_db()
+    with db["lock"]:
+        conn = db["conn"]
+        layout = conn.execute("SELECT version FROM _table_versions WHERE name = ?", (name,)).fetchone()
+        if not layout or layout[0] != PARTITIONED_DB_LAYOUT:
+            # First import, or the table was built from the single-file layout
+            empty = db_rows(empty_table(schema), schema).assign(_partition="")
+            create_db_table(conn, name, empty, indexes + [("_partition",)])
+            conn.execute("DELETE FROM _table_versions WHERE name GLOB ?", (f"{name}:*",))
+            conn.execute("INSERT OR REPLACE INTO _table_versions VALUES (?, ?)", (name, PARTITIONED_DB_LAYOUT))
+            conn.commit()
+        stored = dict(conn.execute(
+            "SELECT name, version FROM _table_versions WHERE name GLOB ?", (f"{name}:*",)
+        ).fetchall())
+
+    for version_name in set(stored) - set(wanted):
+        with db["lock"]:
+            conn = db["conn"]
+            conn.execute(f'DELETE FROM "{name}" WHERE _partition = ?', (version_name.split(":", 1)[1],))
+            conn.execute("DELETE FROM _table_versions WHERE name = ?", (version_name,))
+            conn.commit()
+    for version_name, (key, version) in wanted.items():
+        if stored.get(version_name) == version:
+            continue
+        df = db_rows(load_table(partition_path(file_path, key)), schema).assign(_partition=key)
+        with db["lock"]:
+            conn = db["conn"]
+            conn.execute(f'DELETE FROM "{name}" WHERE _partition = ?', (key,))
+            df.to_sql(name, conn, if_exists="append", index=False)
+            conn.execute("INSERT OR REPLACE INTO _table_versions VALUES (?, ?)", (version_name, version))
+            conn.commit()
+
+def db_target(file_path: str):
+    """(table, _table_versions name, partition key) the store keeps file_path's rows under, or None."""
+    owner = partition_owner(file_path)
+    if owner is not None and owner in DB_TABLES:
+        name = DB_TABLES[owner][0]
+        key = os.path.splitext(os.path.basename(file_path))[0]
+        return name, f"{name}:{key}", key
+    spec = DB_TABLES.get(os.path.normpath(file_path))
+    return (spec[0], spec[0], None) if spec else None
+
+def db_append_rows(file_path: str, rows, old_version):
+    """Insert rows just appended to file_path, if the store was in sync with the file before the append."""
+    target = db_target(file_path)
+    if target is None:
+        return
+    name, version_name, key = target
+    schema = table_schema(file_path)
+    path = storage_path(file_path)
+    rows = db_rows(rows.copy(), schema)
+    if key is not None:
+        rows["_partition"] = key
+    db = get_table_db()
+    with db["lock"]:
+        conn = db["conn"]
+        row = conn.execute("SELECT version FROM _table_versions WHERE name = ?", (version_name,)).fetchone()
+        if not row or row[0] != db_version(path, old_version, schema):
+            return  # out of date anyway; db_table() re-imports on the next query
+        rows.to_sql(name, conn, if_exists="append", index=False)
+        conn.execute(
+            "UPDATE _table_versions SET version = ? WHERE name = ?",
+            (db_version(path, file_version(path), schema), version_name),
+        )
+        conn.commit()
+
+def query_db(sql: str, params=()):
+    """Run a query against the store (use db_table() in the SQL to name tables)."""
+    db = get_table_db()
+    with db["lock"]:
+        return pd.read_sql_query(sql, db["conn"], params=list(params))
+
+def query_table(file_path: str, where: str = "1 = 1", params=(), order_by: str = None, limit: int = None, offset: int = 0):
+    """Rows of file_path matching an SQL WHERE clause, typed like load_table() (file order on ties)."""
+    sql = f"SELECT * FROM {db_table(file_path)} WHERE {where}"
+    sql += f" ORDER BY {order_by}, rowid" if order_by else " ORDER BY rowid"
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params = tuple(params) + (limit, offset)
+    schema = table_schema(file_path)
+    return conform_table(query_db(sql, params), schema)[list(schema)]
+
+def count_table(file_path: str, where: str = "1 = 1", params=()):
+    return int(query_db(f"SELECT COUNT(*) AS n FROM {db_table(file_path)} WHERE {where}", params)["n"].iloc[0])
+
+def sql_placeholders(values):
+    return ", ".join("?" for _ in values)
+
+def sql_search(query: str, mode: str = "All words"):
+    """
+    (WHERE clause, params) matching rows whose _search text contains query,
+    case-insensitively: every whitespace-separated word somewhere in the row
+    ("All words") or the whole query as typed ("Exact text"). Always literal,
+    never a pattern.
+    """
+    query = query.lower()
+    terms = [query] if mode == "Exact text" else query.split()
+    if not terms:
+        return "1 = 1", ()
+    return "(" + " AND ".join("instr(_search, ?) > 0" for _ in terms) + ")", tuple(terms)
+
+# -------------------------------------------------
+# Hours Rollup (day / week / month / quarter x client)
+# -------------------------------------------------
+# A compact aggregate of the hours table kept in the query store next to it:
+# one row per (level, period, client), where period is the ISO date the
+# day / week (Monday) / month / quarter starts. Reports read this instead of
+# raw hours rows. It follows the hours table one month partition at a time:
+# when a partition's imported version changes (mark-as-entered appends, a
+# History edit, a restore, a sync) only that month's day rows and the weeks,
+# month and quarter overlapping it are recomputed.
+ROLLUP_TABLE = "hours_rollup"
+ROLLUP_PERIODS = {
+    "week": "date(Period, '-' || ((CAST(strftime('%w', Period) AS INTEGER) + 6) % 7) || ' days')",
+    "month": "substr(Period, 1, 8) || '01'",
+    "quarter": (
+        "substr(Period, 1, 5) || printf('%02d', (CAST(substr(Period, 6, 2) AS INTEGER) - 1) / 3 * 3 + 1) || '-01'"
+    ),
+}
+
+def rollup_bounds(level: str, month_start):
+    """(first period, last period, first day, last day) of level's periods overlapping month_start's month."""
+    month_end = month_start + pd.offsets.MonthEnd(0)
+    if level == "week":
+        first = month_start - pd.Timedelta(days=month_start.weekday())
+        last = month_end - pd.Timedelta(days=month_end.weekday())
+        return first, last, first, last + pd.Timedelta(days=6)
+    if level == "quarter":
+        first = month_start - pd.offsets.QuarterBegin(1, startingMonth=1) if not month_start.is_quarter_start else month_start
+        return first, first, first, first + pd.offsets.QuarterEnd(0)
+    return month_start, month_start, month_start, month_end
+
+def rollup_version():
+    """Token that changes whenever the rollup does (a cache key for what is built from it)."""
+    db = get_table_db()
+    with db["lock"]:
+        row = db["conn"].execute("SELECT version FROM _table_versions WHERE name = ?", (ROLLUP_TABLE,)).fetchone()
+    return row[0] if row else None
+
+def sync_hours_rollup():
+    """Bring the rollup up to date with the hours table, re-aggregating only months that changed."""
+    hours = db_table(HOURS_FILE)
+    db = get_table_db()
+    with db["lock"]:
+        conn = db["conn"]
+        conn.execute(
+            f'CREATE TABLE IF NOT EXISTS "{ROLLUP_TABLE}" (Level TEXT, Period TEXT, Client TEXT, Hours REAL)'
+        )
+        conn.execute(f'CREATE INDEX IF NOT EXISTS "ix_{ROLLUP_TABLE}_Level_Period" ON "{ROLLUP_TABLE}" (Level, Period)')
+        versions = dict(conn.execute(
+            "SELECT name, version FROM _table_versions WHERE name GLOB ? OR name GLOB ?",
+            (f"{hours}:*", f"{ROLLUP_TABLE}:*"),
+        ).fetchall())
+        current = {name.split(":", 1)[1]: v for name, v in versions.items() if name.startswith(f"{hours}:")}
+        rolled = {name.split(":", 1)[1]: v for name, v in versions.items() if name.startswith(f"{ROLLUP_TABLE}:")}
+        changed = sorted(key for key in set(current) | set(rolled) if current.get(key) != rolled.get(key))
+        if not changed:
+            return
+        for key in changed:
+            if key != UNDATED_PARTITION:
+                conn.execute(
+                    f'DELETE FROM "{ROLLUP_TABLE}" WHERE Level = ? AND Period GLOB ?', ("day", f"{key}-*")
+                )
+                conn.execute(
+                    f'INSERT INTO "{ROLLUP_TABLE}" SELECT ?, Date, Client, SUM(Hours) FROM "{hours}" '
+                    "WHERE _partition = ? AND Date IS NOT NULL GROUP BY Date, Client",
+                    ("day", key),
+                )
+            if key in current:
+                conn.execute("INSERT OR REPLACE INTO _table_versions VALUES (?, ?)", (f"{ROLLUP_TABLE}:{key}", current[key]))
+            else:
+                conn.execute("DELETE FROM _table_versions WHERE name = ?", (f"{ROLLUP_TABLE}:{key}",))
+        for key in changed:
+            if key == UNDATED_PARTITION:
+                continue
+            month_start = pd.Timestamp(f"{key}-01")
+            for level, period in ROLLUP_PERIODS.items():
+                first, last, first_day, last_day = (
+                    d.strftime(DATE_FORMAT) for d in rollup_bounds(level, month_start)
+                )
+                conn.execute(
+                    f'DELETE FROM "{ROLLUP_TABLE}" WHERE Level = ? AND Period BETWEEN ? AND ?', (level, first, last)
+                )
+                conn.execute(
+                    f'INSERT INTO "{ROLLUP_TABLE}" SELECT ?, {period} AS P, Client, SUM(Hours) FROM "{ROLLUP_TABLE}" '
+                    "WHERE Level = 'day' AND Period BETWEEN ? AND ? GROUP BY P, Client",
+                    (level, first_day, last_day),
+                )
+        conn.execute(
+            "INSERT OR REPLACE INTO _table_versions VALUES (?, ?)", (ROLLUP_TABLE, str(time.time_ns()))
+        )
+        conn.commit()
+
+def rollup_hours(level: str, start_d=None, end_d=None):
+    """Period / Client / Hours rollup rows at level, optionally limited to periods in [start_d, end_d]."""
+    sync_hours_rollup()
+    where, params = "Level = ?", [level]
+    if start_d is not None:
+        where += " AND Period BETWEEN ? AND ?"
+        params += [start_d.strftime(DATE_FORMAT), end_d.strftime(DATE_FORMAT)]
+    df = query_db(f'SELECT Period, Client, Hours FROM "{ROLLUP_TABLE}" WHERE {where} ORDER BY Period, Client', params)
+    df["Period"] = pd.to_datetime(df["Period"], format="ISO8601")
+    return df
+
+# -------------------------------------------------
+# Daily Hours Index (prefix sums)
+# -------------------------------------------------
+# Per-day x per-client cumulative hours over the day rollup, so any window
+# total is two row lookups. Built once per process, then kept up to date one
+# month at a time: when the rollup changes only the months whose rollup
+# version moved are re-read, and their days are patched into the prefix sums
+# (the index grows for new dates and clients, e.g. appended hours).
+
+@st.cache_resource
+def get_hours_index_state():
+    return {"lock": threading.Lock(), "version": None, "months": {}, "index": None}
+
+def empty_hours_index():
+    """{"start": first day, "clients": Index, "daily": days x clients hours, "cum": (days + 1) x clients prefix sums}."""
+    return {"start": None, "clients": pd.Index([]), "daily": np.zeros((0, 0)), "cum": np.zeros((1, 0))}
+
+def patch_hours_index(index, first, last):
+    """A copy of index with the days first..last replaced by the day rollup's current rows."""
+    span = rollup_hours("day", first, last).pivot_table(
+        index="Period", columns="Client", values="Hours", aggfunc="sum", fill_value=0.0
+    )
+    clients = index["clients"].union(span.columns, sort=False)
+    daily = pd.DataFrame(index["daily"], columns=index["clients"]).reindex(columns=clients, fill_value=0.0)
+    cum = pd.DataFrame(index["cum"], columns=index["clients"]).reindex(columns=clients, fill_value=0.0)
+    daily, cum = np.array(daily, dtype=float), np.array(cum, dtype=float)
+    first = np.datetime64(first, "D")
+    start = first if index["start"] is None else min(index["start"], first)
+    if index["start"] is not None and start < index["start"]:
+        # Earlier days: zero rows in front (running sums start at 0 either way)
+        pad = int((index["start"] - start).astype(np.int64))
+        daily = np.vstack([np.zeros((pad, len(clients))), daily])
+        cum = np.vstack([np.zeros((pad, len(clients))), cum])
+    a = int((first - start).astype(np.int64))
+    b = a + int((np.datetime64(last, "D") - first).astype(np.int64))
+    if b >= len(daily):
+        # Later days: rows that repeat the final running sum
+        grow = b + 1 - len(daily)
+        daily = np.vstack([daily, np.zeros((grow, len(clients)))])
+        cum = np.vstack([cum, np.repeat(cum[-1:], grow, axis=0)])
+    days = pd.date_range(pd.Timestamp(first), periods=b - a + 1, freq="D")
+    new = span.reindex(index=days, columns=clients, fill_value=0.0).to_numpy(dtype=float)
+    delta = new - daily[a:b + 1]
+    daily[a:b + 1] = new
+    cum[a + 1:b + 2] += np.cumsum(delta, axis=0)
+    cum[b + 2:] += delta.sum(axis=0)
+    return {"start": start, "clients": clients, "daily": daily, "cum": cum}
+
+def get_hours_index():
+    sync_hours_rollup()
+    state = get_hours_index_state()
+    version = rollup_version()
+    with state["lock"]:
+        if state["index"] is not None and state["version"] == version:
+            return state["index"]
+        months = dict(query_db(
+            "SELECT name, version FROM _table_versions WHERE name GLOB ?", (f"{ROLLUP_TABLE}:*",)
+        ).itertuples(index=False, name=None))
+        months = {name.split(":", 1)[1]: v for name, v in months.items()}
+        months.pop(UNDATED_PARTITION, None)
+        index = state["index"] or empty_hours_index()
+        for key in sorted(key for key in set(months) | set(state["months"]) if months.get(key) != state["months"].get(key)):
+            month_start = pd.Timestamp(f"{key}-01")
+            index = patch_hours_index(index, month_start, month_start + pd.offsets.MonthEnd(0))
+        state.update(version=version, months=months, index=index)
+        return index
+
+def index_rows(index, dates, end=False):
+    """Prefix-sum rows before dates (or through them, if end), clamped to the index."""
+    if index["start"] is None:
+        return np.zeros(np.shape(dates), dtype=np.int64)
+    offsets = (np.asarray(dates, dtype="datetime64[D]") - index["start"]).astype(np.int64) + int(end)
+    return np.clip(offsets, 0, len(index["cum"]) - 1)
+
+def hours_by_client(start_d, end_d):
+    """Logged hours per client with start_d <= Date <= end_d."""
+    index = get_hours_index()
+    totals = index["cum"][index_rows(index, end_d, end=True)] - index["cum"][index_rows(index, start_d)]
+    # Differences of running sums pick up float noise; hours are never finer than this
+    return pd.Series(totals.round(6), index=index["clients"], dtype=float)
+
+def hours_between(start_d, end_d):
+    """Total logged hours with start_d <= Date <= end_d."""
+    return float(hours_by_client(start_d, end_d).sum())
+
+def monthly_hours():
+    """MonthDate / ActualHours for every month with logged hours."""
+    monthly = rollup_hours("month").groupby("Period", as_index=False)["Hours"].sum()
+    return monthly.rename(columns={"Period": "MonthDate", "Hours": "ActualHours"})
+
+# -------------------------------------------------
+# Weekly Snapshot figures (cached + prefetched)
+# -------------------------------------------------
+# Finished Weekly Snapshot figures, keyed by (week start, rollup version,
+# client colours), shared by every session. After a week is drawn its
+# neighbours are built on a background thread, so Previous / Next week
+# clicks are usually served from memory.
+WEEK_FIGURE_CACHE_SIZE = 32
+
+@st.cache_resource
+def get_week_figures():
+    return {"lock": threading.Lock(), "figures": {}, "pool": ThreadPoolExecutor(max_workers=1)}
+
+def build_weekly_figure(week_start, client_colors: dict):
+    """Weekly Snapshot line chart for the Mon-Sun week at week_start (worker-thread safe; no st.*)."""
+    week_end = week_start + pd.Timedelta(days=6)
+    weekly_data = query_db(
+        f'SELECT Period AS Date, Client, Hours FROM "{ROLLUP_TABLE}" WHERE Level = ? AND Period BETWEEN ? AND ?',
+        ("day", week_start.strftime(DATE_FORMAT), week_end.strftime(DATE_FORMAT)),
+    )
+    weekly_data["Date"] = pd.to_datetime(weekly_data["Date"], format="ISO8601")
+
+    weekdays = pd.date_range(week_start, week_end, freq="D")
+    weekdays = weekdays[weekdays.weekday < 5]
+    by_client = weekly_data.pivot_table(
+        index="Date", columns="Client", values="Hours", aggfunc="sum", fill_value=0
+    ).reindex(weekdays, fill_value=0)
+    colors = by_client.columns.map(client_colors).fillna("#FFFFFF")
+    day_labels = weekdays.strftime("%a")
+
+    fig_weekly = go.Figure()
+    for client, color in zip(by_client.columns, colors):
+        fig_weekly.add_trace(go.Scatter(
+            x=day_labels,
+            y=by_client[client].to_numpy(),
+            mode="lines+markers",
+            name=client,
+            line=dict(color=color, width=4),
+            marker=dict(size=10),
+            hovertemplate="Client: " + str(client) + "<br>Day: %{x}<br>Hours: %{y}<extra></extra>"
+        ))
+
+    fig_weekly.update_layout(
+        plot_bgcolor="#0f0f23",
+        paper_bgcolor="#0f0f23",
+        font=dict(color="#FFFFFF", size=14),
+        xaxis=dict(title="Day of Week", color="#FFFFFF", tickfont=dict(color="#FFFFFF"), showgrid=True, gridcolor="#FFFFFF"),
+        yaxis=dict(title="Hours", color="#FFFFFF", tickfont=dict(color="#FFFFFF"), showgrid=True, gridcolor="#FFFFFF"),
+        legend=dict(font=dict(color="#FFFFFF", size=18, family="Arial Bold"), orientation="h", yanchor="bottom", y=-0.3, xanchor="center", x=0.5),
+        margin=dict(l=40, r=40, t=40, b=80)
+    )
+    return fig_weekly
+
+def cached_weekly_figure(week_start, client_colors: dict, version):
+    cache = get_week_figures()
+    key = (week_start, version, tuple(sorted(client_colors.items())))
+    with cache["lock"]:
+        fig = cache["figures"].get(key)
+    if fig is None:
+        fig = build_weekly_figure(week_start, client_colors)
+        with cache["lock"]:
+            figures = cache["figures"]
+            figures[key] = fig
+            while len(figures) > WEEK_FIGURE_CACHE_SIZE:
+                figures.pop(next(iter(figures)))  # oldest first
+    return fig
+
+def weekly_snapshot_figure(week_start, client_colors: dict):
+    """Figure for week_start (cached), then prefetch the weeks either side of it."""
+    sync_hours_rollup()
+    version = rollup_version()
+    fig = cached_weekly_figure(week_start, client_colors, version)
+    pool = get_week_figures()["pool"]
+    for step in (-1, 1):
+        pool.submit(cached_weekly_figure, week_start + pd.Timedelta(weeks=step), client_colors, version)
+    return fig
+
+# -------------------------------------------------
+# Work Calendar (business days minus days off)
+# -------------------------------------------------
+# Mon-Fri with every day off as a holiday, built once per days_off version:
+# workday counts are np.busday_count lookups instead of date lists + set
+# lookups, and take arrays of ranges as easily as one.
+WORK_WEEKMASK = "1111100"
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def work_calendar(version):
+    days_off = load_table(DAYS_OFF_FILE)["Date"].dropna()
+    return np.busdaycalendar(weekmask=WORK_WEEKMASK, holidays=days_off.to_numpy(dtype="datetime64[D]"))
+
+def get_work_calendar():
+    return work_calendar(file_version(refresh_storage(DAYS_OFF_FILE)))
+
+def busday_span(start_d, end_d, busdaycal=None):
+    """Business days in [start_d, end_d] inclusive (0 if empty); scalars or arrays of dates."""
+    start_d = np.asarray(start_d, dtype="datetime64[D]")
+    end_d = np.asarray(end_d, dtype="datetime64[D]") + np.timedelta64(1, "D")
+    if busdaycal is None:
+        counts = np.busday_count(start_d, end_d, weekmask=WORK_WEEKMASK)
+    else:
+        counts = np.busday_count(start_d, end_d, busdaycal=busdaycal)
+    # busday_count goes negative for reversed ranges
+    return np.maximum(counts, 0)
+
+def workday_counts(start_d, end_d):
+    """(business days, days off on business days) in [start_d, end_d]; scalars or arrays."""
+    bdays = busday_span(start_d, end_d)
+    return bdays, bdays - busday_span(start_d, end_d, get_work_calendar())
+
+# Sync Files from GitHub (all files in one concurrent stage)
+# (partitioned tables are synced as their manifest + the partition files it lists)
+SYNC_FILES = [
+    "data/period_settings.csv",
+    "data/hours/manifest.json",
+    "data/clients/manifest.json",
+    "data/goals.csv",
+    "data/days_off.csv",
+    "data/unentered_hours.csv",
+    "data/style.css",
+]
+sync_state = sync_gate(SYNC_FILES)
+if GITHUB_TOKEN:
+    get_push_worker()  # resumes pushes left in the durable queue
+
+# Ensure files exist locally (create empty CSVs if missing, then attempt to push if you have a token)
+init_files = [
+    "data/clients.csv",
+    "data/hours.csv",
+    "data/goals.csv",
+    "data/categories.csv",
+    "data/todos.csv",
+    "data/days_off.csv",
+    "data/period_settings.csv",
+    "data/unentered_hours.csv",
+]
+created_files = []
+for file in init_files:
+    if not table_exists(file):
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+        save_table(empty_table(table_schema(file)), file)
+        created_files.append(file)
+if created_files:
+    # Push only if token exists (safe on public)
+    commit_files_to_github(created_files, f"Initialize {', '.join(created_files)}")
+
+settled_files = settle_todos()
+if settled_files:
+    commit_files_to_github(settled_files, "Moved completed to-dos out of the open list")
+
+# -------------------------------------------------
+# Sidebar Navigation
+# -------------------------------------------------
+st.sidebar.title("Navigation")
+pages = ["Home", "Reports", "Data Entry", "Archive"]
+selected_page = st.sidebar.radio("Go to", pages)
+
+# Per-file sync latency (slowest file ~= total wall time when fetched concurrently)
+with st.sidebar.expander("GitHub Sync"):
+    st.button("Refresh from GitHub", key="sync_refresh", on_click=request_sync)
+    st.caption(
+        f"Synced {len(sync_state['results'])} files in {sync_state['wall_time']:.2f}s "
+        f"({int(time.time() - sync_state['last_sync'])}s ago)"
+        + (f" @ {sync_state['head_sha'][:7]}" if sync_state["head_sha"] else "")
+    )
+    st.dataframe(
+        pd.DataFrame([
+            {
+                "File": os.path.basename(r["file"]),
+                "Status": str(r["status"]) if r["status"] is not None else "—",
+                "ms": round(r["elapsed"] * 1000),
+            }
+            for r in sync_state["results"]
+        ]),
+        hide_index=True,
+    )
+    if STORAGE_BACKEND != "csv":
+        st.caption(f"Storage: {STORAGE_BACKEND} (CSVs exported on push)")
+        st.button("Export CSVs now", key="export_csv", on_click=export_all_csv)
+
+if STORAGE_WARNING:
+    st.sidebar.warning(STORAGE_WARNING)
+
+# Write-behind push status
+push_queue = load_push_queue()
+if push_queue["pending"] and push_queue["last_error"]:
+    st.sidebar.error(
+        f"GitHub push failed, {len(push_queue['pending'])} file(s) waiting "
+        f"(attempt {push_queue['attempts']}): {push_queue['last_error'][:200]}"
+    )
+    st.sidebar.button("Retry push now", key="push_retry", on_click=retry_pushes_now)
+elif push_queue["pending"]:
+    st.sidebar.caption(
+        f"Pushing {len(push_queue['pending'])} file(s) to GitHub: "
+        + ", ".join(os.path.basename(fp) for fp in push_queue["pending"])
+    )
+
+
+
+st.markdown("""
+<style>
+/* Dark Theme for Streamlit App */
+:root {
+  --bg-primary: #0f0f23;
+  --bg-secondary: #1a1a2e;
+  --bg-tertiary: #16213e;
+  --text-primary: #FFFFFF;
+  --text-secondary: #a1a1aa;
+  --accent: #9333ea;
+  --accent-hover: #a855f7;
+  --border: #27272a;
+  
+  /* Priority Colors */
+  --priority-high: #ef4444;
+  --priority-medium: #f97316;
+  --priority-low: #22c55e;
+  
+  /* Client Colors - Match these in your Streamlit app */
+  --client-1: #3b82f6;
+  --client-2: #10b981;
+  --client-3: #f59e0b;
+  --client-4: #ec4899;
+  --client-5: #8b5cf6;
+  --client-6: #06b6d4;
+}
+
+
+
+.stTextInput > div > div > input,
+.stNumberInput > div > div > input,
+.stTextArea textarea,
+.stSelectbox > div > div,
+.stDateInput > div > div > input {
+    color: #FFFFFF !important; /* Force white text */
+    font-size: 16px !important;
+    padding: 0.75rem !important;
+}
+/* Main Background */
+.stApp {
+  background-color: var(--bg-primary) !important;
+  color: var(--text-primary) !important;
+}
+
+/* Sidebar */
+section[data-testid="stSidebar"] {
+  background-color: var(--bg-secondary) !important;
+  border-right: 1px solid var(--border) !important;
+}
+
+/* Sidebar text and navigation */
+section[data-testid="stSidebar"] * {
+  color: var(--text-primary) !important;
+}
+
+section[data-testid="stSidebar"] label {
+  color: var(--text-primary) !important;
+  font-weight: 500 !important;
+}
+
+/* Radio buttons in sidebar navigation */
+section[data-testid="stSidebar"] [role="radiogroup"] label {
+  color: var(--text-primary) !important;
+}
+
+/* Selected navigation item */
+section[data-testid="stSidebar"] [data-baseweb="radio"] input:checked ~ div {
+  background-color: var(--accent) !important;
+  border-color: var(--accent) !important;
+}
+
+/* Headers */
+h1, h2, h3, h4, h5, h6 {
+  color: var(--text-primary) !important;
+  font-weight: 600 !important;
+}
+
+h1 {
+  font-size: 2rem !important;
+  margin-bottom: 1.5rem !important;
+}
+
+/* Tabs */
+.stTabs [data-baseweb="tab-list"] {
+  background-color: var(--bg-secondary) !important;
+  border-radius: 0.5rem !important;
+  padding: 0.25rem !important;
+  gap: 0.5rem !important;
+}
+
+.stTabs [data-baseweb="tab"] {
+  background-color: transparent !important;
+  color: var(--text-secondary) !important;
+  border-radius: 0.375rem !important;
+  padding: 0.5rem 1rem !important;
+  transition: all 0.2s !important;
+}
+
+.stTabs [aria-selected="true"] {
+  background-color: var(--accent) !important;
+  color: white !important;
+}
+
+/* Input Fields */
+.stTextInput > div > div > input,
+.stNumberInput > div > div > input,
+.stTextArea textarea,
+.stSelectbox > div > div,
+.stDateInput > div > div > input {
+  background-color: var(--bg-tertiary) !important;
+  color: var(--text-primary) !important;
+  border: 1px solid var(--border) !important;
+  border-radius: 0.375rem !important;
+  padding: 0.5rem !important;
+}
+
+.stTextInput > div > div > input:focus,
+.stNumberInput > div > div > input:focus,
+.stTextArea textarea:focus,
+.stSelectbox > div > div:focus,
+.stDateInput > div > div > input:focus {
+  border-color: var(--accent) !important;
+  box-shadow: 0 0 0 1px var(--accent) !important;
+}
+
+/* Buttons */
+.stButton > button {
+  background-color: var(--accent) !important;
+  color: white !important;
+  border: none !important;
+  border-radius: 0.375rem !important;
+  padding: 0.5rem 1.5rem !important;
+  font-weight: 500 !important;
+  transition: all 0.2s !important;
+}
+
+.stButton > button:hover {
+  background-color: var(--accent-hover) !important;
+  transform: translateY(-1px) !important;
+}
+
+/* Data Editor / DataFrame */
+.stDataFrame {
+  background-color: var(--bg-secondary) !important;
+  border-radius: 0.5rem !important;
+  overflow: hidden !important;
+}
+
+.stDataFrame [data-testid="stDataFrameResizable"] {
+  background-color: var(--bg-secondary) !important;
+}
+
+
+
+/* Priority Color Coding for To-Do List */
+.todo-high {
+  border-left: 4px solid var(--priority-high) !important;
+  background-color: rgba(239, 68, 68, 0.1) !important;
+  padding: 0.75rem !important;
+  margin: 0.5rem 0 !important;
+  border-radius: 0.375rem !important;
+}
+
+.todo-medium {
+  border-left: 4px solid var(--priority-medium) !important;
+  background-color: rgba(249, 158, 6, 0.1) !important;
+  padding: 0.75rem !important;
+  margin: 0.5rem 0 !important;
+  border-radius: 0.375rem !important;
+}
+
+.todo-low {
+  border-left: 4px solid var(--priority-low) !important;
+  background-color: rgba(34, 197, 94, 0.1) !important;
+  padding: 0.75rem !important;
+  margin: 0.5rem 0 !important;
+  border-radius: 0.375rem !important;
+}
+
+/* Priority Badges */
+.priority-badge {
+  display: inline-block;
+  padding: 0.25rem 0.75rem;
+  border-radius: 9999px;
+  font-size: 0.75rem;
+  font-weight: 600;
+  text-transform: uppercase;
+  letter-spacing: 0.05em;
+}
+
+.priority-high-badge {
+  background-color: var(--priority-high);
+  color: red;
+}
+
+.priority-medium-badge {
+  background-color: var(--priority-medium);
+  color: green;
+}
+
+.priority-low-badge {
+  background-color: var(--priority-low);
+  color: white;
+}
+
+.stMetric label {
+  color: var(--text-secondary) !important;
+}
+
+.stMetric [data-testid="stMetricValue"] {
+  color: var(--text-primary) !important;
+}
+
+/* Charts */
+.js-plotly-plot .plotly {
+  background-color: var(--bg-secondary) !important;
+  border-radius: 0.5rem !important;
+}
+
+.js-plotly-plot .plotly .bg {
+  fill: var(--bg-secondary) !important;
+}
+
+
+/* Success/Error Messages */
+.stSuccess {
+  background-color: rgba(34, 197, 94, 0.1) !important;
+  border-left: 4px solid var(--priority-low) !important;
+  color: var(--text-primary) !important;
+}
+
+.stError {
+  background-color: rgba(239, 68, 68, 0.1) !important;
+  border-left: 4px solid var(--priority-high) !important;
+  color: var(--text-primary) !important;
+}
+
+.stWarning {
+  background-color: rgba(249, 158, 6, 0.1) !important;
+  border-left: 4px solid var(--priority-medium) !important;
+  color: var(--text-primary) !important;
+}
+
+/* Scrollbar */
+::-webkit-scrollbar {
+  width: 8px;
+  height: 8px;
+}
+
+::-webkit-scrollbar-track {
+  background: var(--bg-primary);
+}
+
+::-webkit-scrollbar-thumb {
+  background: var(--border);
+  border-radius: 4px;
+}
+
+::-webkit-scrollbar-thumb:hover {
+  background: #3f3f46;
+}
+
+/* Radio Buttons and Checkboxes */
+.stRadio > div,
+.stCheckbox > div {
+  color: var(--text-primary) !important;
+}
+
+
+/* Make all form labels white */
+.stTextInput label,
+.stDateInput label,
+.stNumberInput label,
+.stTextArea label,
+.stSelectbox label,
+.stSlider label {
+    color: #FFFFFF !important;
+    font-weight: 600; /* Optional: make them bold */
+}
+
+/* Override the problematic padding */
+.stSelectbox > div > div {
+    padding: 0 !important; /* Remove extra padding */
+    display: flex !important;
+    align-items: center !important;
+}
+
+/* Style the actual text inside the select box */
+.stSelectbox div[data-baseweb="select"] span {
+    color: #D3D3D3 !important;
+    font-size: 16px !important;
+    line-height: 1.4 !important;
+}
+
+/* Dropdown options */
+ul[role="listbox"] li {
+    color: #D3D3D3 !important;
+    font-size: 16px !important;
+}
+</style>
+""", unsafe_allow_html=True)
+
+
+
+# Inject custom CSS for styling
+st.markdown("""
+<style>
+/* Dark background for the entire app */
+body {
+    background-color: #121212;
+    color: #e0e0e0;
+}
+
+/* Table styling */
+[data-testid="stDataFrame"] table {
+    border-collapse: collapse;
+    width: 100%;
+    background-color: #1e1e1e;
+    color: #f5f5f5;
+    border-radius: 8px;
+    overflow: hidden;
+}
+
+/* Remove unnecessary borders */
+[data-testid="stDataFrame"] table th, 
+[data-testid="stDataFrame"] table td {
+    border: none !important;
+    padding: 8px 12px;
+}
+
+/* Header styling */
+[data-testid="stDataFrame"] table th {
+    font-size: 14px; /* Smaller headers */
+    font-weight: 600;
+    background-color: #2c2c2c;
+    color: #ffffff;
+    text-transform: uppercase;
+}
+
+/* Row hover effect */
+[data-testid="stDataFrame"] table tr:hover {
+    background-color: #333333;
+}
+
+/* Rounded corners for the table container */
+[data-testid="stDataFrame"] {
+    border-radius: 10px;
+    box-shadow: 0 4px 10px rgba(0,0,0,0.3);
+}
+</style>
+""", unsafe_allow_html=True)
+
+# -------------------------------------------------
+# To-Do edit buffer (Home priority / completion edits)
+# -------------------------------------------------
+# Priority and ✓ edits collect in st.session_state["todo_pending"] and are
+# written together: todos is saved once and pushed as one commit when the
+# user clicks Apply, after TODO_FLUSH_QUIET_SECONDS without further edits, or
+# when they leave the Home page. Edits are keyed by the task's content (its
+# TODO_IDENTITY values), not its row, so a task added or a filter changed in
+# between doesn't redirect an edit to the wrong row.
+TODO_FLUSH_QUIET_SECONDS = 5
+TODO_IDENTITY = ["Client", "Category", "Task", "DateCreated"]
+
+def todo_identities(rows):
+    """TODO_IDENTITY tuples of rows (the keys of st.session_state["todo_pending"])."""
+    return list(rows[TODO_IDENTITY].itertuples(index=False, name=None))
+
+def buffer_todo_edits(page_todos, edited_rows):
+    """
+    Merge a page editor's edited_rows ({row position: {column: value}}) into the
+    pending buffer, dropping edits that leave a task as stored (✓ unticked,
+    priority set back). Returns True if this started a new (previously empty) buffer.
+    """
+    if not edited_rows:
+        return False
+    pending = st.session_state.get("todo_pending", {})
+    started = not pending
+    before = dict(pending)
+    identities = todo_identities(page_todos)
+    for position, changes in edited_rows.items():
+        identity = identities[int(position)]
+        entry = dict(pending.get(identity, dict(zip(TODO_IDENTITY, identity))))
+        if changes.get("Priority") is not None:
+            entry["Priority"] = int(changes["Priority"])
+        if "Done" in changes:
+            entry["Done"] = bool(changes["Done"])
+        if entry.get("Priority") == page_todos["Priority"].iloc[int(position)]:
+            entry.pop("Priority")
+        if not entry.get("Done"):
+            entry.pop("Done", None)
+        if "Priority" in entry or "Done" in entry:
+            pending[identity] = entry
+        else:
+            pending.pop(identity, None)
+    if pending == before:
+        return False
+    if pending:
+        st.session_state["todo_pending"] = pending
+        st.session_state["todo_pending_at"] = time.time()
+    else:
+        st.session_state.pop("todo_pending", None)
+    return started and bool(pending)
+
+def flush_todo_edits():
+    """Write every buffered edit with one save_table and one push."""
+    pending = st.session_state.pop("todo_pending", {})
+    if not pending:
+        return
+    # Start the next render from fresh editors, so their edited_rows aren't buffered again
+    st.session_state["active_todos_editor_run"] = st.session_state.get("active_todos_editor_run", 0) + 1
+    edits = pd.DataFrame(list(pending.values())).reindex(columns=TODO_IDENTITY + ["Priority", "Done"])
+    df_todos = load_table(TODOS_FILE)
+    matched = df_todos[TODO_IDENTITY].reset_index().merge(edits, on=TODO_IDENTITY, how="inner")
+    reprioritised = matched[matched["Priority"].notna()]
+    done = matched[matched["Done"].fillna(False).astype(bool)]
+    if len(reprioritised) == 0 and len(done) == 0:
+        return
+    df_todos.loc[reprioritised["index"], "Priority"] = reprioritised["Priority"].astype(int).to_numpy()
+    messages = []
+    if len(reprioritised) > 0:
+        messages.append("Auto-updated task priority")
+    if len(done) > 0:
+        # Completed tasks move to the completed store (an append of just those rows)
+        completed = df_todos.loc[done["index"]].assign(DateCompleted=pd.Timestamp(date.today()))
+        append_table(completed, COMPLETED_TODOS_FILE)
+        df_todos = df_todos.drop(index=done["index"])
+        messages.append("Marked task as entered/completed")
+    save_table(df_todos, TODOS_FILE)
+    commit_files_to_github(["data/todos.csv", "data/completed_todos.csv"], "; ".join(messages))
+
+if selected_page != "Home":
+    flush_todo_edits()
+
+# -------------------------------------------------
+# Page: Data Entry
+# -------------------------------------------------
+
+if selected_page == "Home":
+    # Load required data (cached + normalised, see load_table)
+    df_clients = load_table(CLIENTS_FILE)
+
+
+    # -------------------------------
+    # Add To-Do Item Section
+    # -------------------------------
+    st.subheader("Add To-Do Item")
+    if len(df_clients) == 0:
+        st.warning("Add clients first!")
+    else:
+        col_date, col_client, col_task, col_priority, col_btn = st.columns([0.8, 1.5, 1.5, 3, 1])
+        with col_date:
+            todo_date = st.date_input("Date Created", datetime.today(), key="todo_date")
+        with col_client:
+            todo_client = st.selectbox("Client", df_clients["Client"].tolist(), key="todo_client")
+        with col_task:
+            todo_task = st.text_input("Task", key="todo_task")
+        with col_priority:
+            priority = st.slider("Priority", 1, 5, 3, key="todo_priority")
+        with col_btn:
+            if st.button("Add Task", key="add_task"):
+                if todo_task.strip() != "No categories":
+                    new_task = pd.DataFrame([{
+                        "Client": todo_client,
+                        "Category": "General",
+                        "Task": todo_task,
+                        "Priority": priority,
+                        "DateCreated": pd.Timestamp(todo_date),
+                        "DateCompleted": pd.NaT,
+                        "Notes": "",
+                    }])
+                    append_table(new_task, TODOS_FILE)
+                    push_to_github("data/todos.csv", "Added new task")
+                    st.success("Task added successfully!")
+                else:
+                    st.error("Please enter a valid task and category.")
+
+    # -------------------------------
+    # Active To-Dos (ONE EDITOR PER PAGE + AUTO-SAVE PRIORITY)
+    # -------------------------------
+    ACTIVE_TODOS_PAGE_SIZE = 25
+
+    # Fragment: a priority edit or ✓ tick reruns only this list
+    @st.fragment
+    def active_todos_section():
+        st.subheader("Active To-Dos")
+
+        # Reloaded here (cheap, cached) so a fragment rerun sees its own saves
+        df_clients = load_table(CLIENTS_FILE)
+
+        # Active = the open-task store, task not blank; already in display
+        # order (highest priority first, then newest) via the store's index
+        active_todos_all = query_table(TODOS_FILE, "Task != ''", order_by="Priority DESC, DateCreated DESC")
+        df_todos = active_todos_all
+
+        # Build client filter options (keep your default behavior: only clients w/ active tasks selected by default)
+        all_clients = sorted(set(df_clients["Client"].tolist() + df_todos["Client"].tolist()) - {""})
+        clients_with_active = sorted(active_todos_all["Client"].dropna().unique().tolist())
+
+        selected_clients = st.multiselect(
+            "Filter by Client",
+            options=all_clients,
+            default=clients_with_active,
+            key="filter_clients"
+        )
+
+        active_todos = active_todos_all[active_todos_all["Client"].isin(selected_clients)].copy()
+
+        if active_todos.empty:
+            st.info("No active tasks for selected clients.")
+        else:
+            # One page of tasks drawn as a single editor (cost follows the page, not the backlog)
+            page_count = -(-len(active_todos) // ACTIVE_TODOS_PAGE_SIZE)
+            page = st.number_input(
+                f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, step=1,
+                key="active_todos_page"
+            ) if page_count > 1 else 1
+            page_todos = active_todos.iloc[(page - 1) * ACTIVE_TODOS_PAGE_SIZE:page * ACTIVE_TODOS_PAGE_SIZE]
+
+            # Buffered (not yet saved) edits show through until they are flushed
+            identities = todo_identities(page_todos)
+            buffered = st.session_state.get("todo_pending", {})
+            pending = pd.DataFrame(
+                [buffered.get(identity, {}) for identity in identities], index=page_todos.index
+            ).reindex(columns=["Priority", "Done"])
+
+            page_view = pd.DataFrame({
+                "Client": page_todos["Client"],
+                "Task": page_todos["Task"],
+                "Category": page_todos["Category"],
+                "Created": page_todos["DateCreated"].dt.strftime("%Y-%m-%d").fillna(""),
+                "Priority": pending["Priority"].fillna(page_todos["Priority"]).clip(1, 5).astype(int),
+                "Done": pending["Done"].fillna(False).astype(bool),
+            }).reset_index(drop=True)
+
+            # Client -> color map (colour swatch on the Client cell)
+            client_color_map = dict(zip(df_clients["Client"], df_clients["Color"]))
+            swatches = page_view["Client"].map(client_color_map).fillna("#333333")
+
+            # The editor's edited_rows are positional: a new key whenever the page's
+            # tasks change keeps them from landing on whatever task moves into a row
+            page_tasks = hashlib.sha1(repr(identities).encode("utf-8")).hexdigest()[:12]
+            editor_key = f"active_todos_editor_{st.session_state.get('active_todos_editor_run', 0)}_{page_tasks}"
+            st.data_editor(
+                page_view.style.apply(lambda _: "border-left: 6px solid " + swatches, subset=["Client"]),
+                column_config={
+                    "Priority": st.column_config.NumberColumn("Priority", min_value=1, max_value=5, step=1),
+                    "Done": st.column_config.CheckboxColumn("✓", help="Mark as entered/completed"),
+                },
+                disabled=["Client", "Task", "Category", "Created"],
+                hide_index=True,
+                width="stretch",
+                key=editor_key,
+            )
+
+            # Every change on the page arrives as one edited-rows payload; it is only buffered here
+            if buffer_todo_edits(page_todos, st.session_state[editor_key]["edited_rows"]):
+                # Rerun the page once so todo_save_status starts its save timer
+                st.rerun()
+
+    # Fragment: polls the edit buffer, flushing it once edits have been quiet for a
+    # while. The timer only runs while there is something to flush.
+    @st.fragment(run_every=1 if st.session_state.get("todo_pending") else None)
+    def todo_save_status():
+        pending = st.session_state.get("todo_pending", {})
+        if not pending:
+            return
+        quiet_for = time.time() - st.session_state.get("todo_pending_at", 0)
+        col_status, col_apply = st.columns([4, 1], vertical_alignment="center")
+        with col_apply:
+            apply_now = st.button("Apply", key="apply_todo_edits")
+        if apply_now or quiet_for >= TODO_FLUSH_QUIET_SECONDS:
+            flush_todo_edits()
+            st.rerun()
+        with col_status:
+            st.caption(
+                f"{len(pending)} unsaved to-do change(s), saving in "
+                f"{max(TODO_FLUSH_QUIET_SECONDS - quiet_for, 0):.0f}s"
+            )
+
+    active_todos_section()
+    todo_save_status()
+
+    # -------------------------------
+    # Log Hours Section
+    # -------------------------------
+    st.subheader("Log Hours")
+    if len(df_clients) == 0:
+        st.warning("Add clients first!")
+    else:
+        col1, col2, col3, col4, col5 = st.columns([2, 2, 1, 3, 1])
+        with col1:
+            client = st.selectbox("Client", df_clients["Client"].tolist(), key="log_client")
+        with col2:
+            date_val = st.date_input("Date", datetime.today(), key="log_date")
+        with col3:
+            hours = st.number_input("Hours", min_value=0.0, step=0.25, key="log_hours")
+        with col4:
+            description = st.text_input("Description", key="log_description")
+        with col5:
+            if st.button("Save Hours", key="save_hours"):
+                new_row = {
+                    "Date": pd.Timestamp(date_val),
+                    "Client": client,
+                    "Hours": hours,
+                    "Description": description
+                }
+            
+                # Append just this row (creates the file if it doesn't exist yet)
+                append_table(pd.DataFrame([new_row]), UNENTERED_HOURS_FILE)
+                push_to_github(
+                    "data/unentered_hours.csv",
+                    "Added new unentered hours"
+                )
+            
+                st.success("Hours added to unentered backlog.")
+             
+    # -------------------------------
+    # Unentered Hours (Persistent Backlog)
+    # -------------------------------
+    # Fragment: the filters and the editor rerun only this section
+    @st.fragment
+    def unentered_hours_section():
+        st.subheader("Unentered Hours")
+    
+        # Normalised by the loader (columns ensured, text stripped, Hours numeric)
+        raw = load_table(UNENTERED_HOURS_FILE)
+    
+        # Parse dates -> keep as date (not timestamp)
+        raw["Date"] = raw["Date"].dt.date
+    
+        # IMPORTANT: Strip any previously-saved TOTAL rows (cleans “polluted” files)
+        is_total = raw["Description"].str.upper().eq("TOTAL")
+        stale_total_count = int(is_total.sum())
+        raw = raw[~is_total].copy()
+    
+        if stale_total_count > 0:
+            st.info(
+                f"Found {stale_total_count} stale TOTAL row(s) in unentered_hours.csv. "
+                "They will not be used and will be removed next time you save."
+            )
+    
+        # Drop empty rows
+        raw = raw.dropna(subset=["Date"])
+        raw = raw[raw["Client"] != ""].copy()
+        # -----------------
+        # Filters
+        # -----------------
+        st.markdown("### Filters")
+    
+        filtered_raw = raw.copy()
+    
+        if len(raw) > 0:
+    
+            # Available dates from unentered_hours.csv only, newest first
+            available_dates = sorted(
+                raw["Date"].dropna().unique(),
+                reverse=True
+            )
+    
+            selected_dates = st.multiselect(
+                "Dates",
+                options=available_dates,
+                default=available_dates,
+                format_func=lambda x: x.strftime("%Y-%m-%d"),
+                key="unentered_date_filter"
+            )
+    
+            # Apply date filter
+            if selected_dates:
+                filtered_raw = filtered_raw[
+                    filtered_raw["Date"].isin(selected_dates)
+                ].copy()
+            else:
+                filtered_raw = filtered_raw.iloc[0:0].copy()
+    
+            # Available clients after selected date filter
+            available_clients = sorted(
+                filtered_raw["Client"]
+                .dropna()
+                .astype(str)
+                .unique()
+                .tolist()
+            )
+    
+            selected_unentered_client = st.selectbox(
+                "Client",
+                options=["All Clients"] + available_clients,
+                index=0,
+                key="unentered_client_filter"
+            )
+    
+            # Apply client filter
+            if selected_unentered_client != "All Clients":
+                filtered_raw = filtered_raw[
+                    filtered_raw["Client"] == selected_unentered_client
+                ].copy()
+    
+        else:
+            filtered_raw = raw.copy()
+    
+        # -----------------
+        # Build editable display table
+        # -----------------
+        if filtered_raw.empty:
+            st.info("No unentered hours match the selected filters.")
+    
+            edited_unentered = empty_table(HOURS_SCHEMA)
+    
+        else:
+            # Detail rows for editing
+            detail = filtered_raw.copy()
+            detail["Date"] = pd.to_datetime(
+                detail["Date"],
+                errors="coerce"
+            ).dt.strftime("%Y-%m-%d")
+    
+            detail = detail.sort_values(
+                by=["Client", "Date"]
+            ).reset_index(drop=True)
+    
+            # Computed totals for display only
+            totals = (
+                filtered_raw.groupby(
+                    ["Client", "Date"],
+                    as_index=False
+                )["Hours"]
+                .sum()
+                .sort_values(
+                    by=["Date", "Client"]
+                )
+                .reset_index(drop=True)
+            )
+    
+            totals["Description"] = "TOTAL"
+            totals["Date"] = pd.to_datetime(
+                totals["Date"],
+                errors="coerce"
+            ).dt.strftime("%Y-%m-%d")
+    
+            # Display details first, totals at bottom
+            unentered_display = pd.concat(
+                [detail, totals],
+                ignore_index=True
+            )
+    
+            edited_unentered = st.data_editor(
+                unentered_display,
+                num_rows="dynamic",
+                hide_index=True,
+                key="unentered_hours_editor"
+            )
+    
+        col_save, col_mark = st.columns([1, 1])
+    
+        # -----------------
+        # Save edits
+        # IMPORTANT:
+        # This saves the currently filtered/visible rows only.
+        # -----------------
+        with col_save:
+            if st.button("Save Unentered Changes", key="save_unentered_changes"):
+    
+                # Normalize again from edited grid
+                cleaned = conform_table(edited_unentered.dropna(how="all"), HOURS_SCHEMA)
+    
+                # Keep ONLY detail rows, exclude TOTAL rows
+                cleaned = cleaned[
+                    ~cleaned["Description"].str.upper().eq("TOTAL")
+                ].copy()
+    
+                # Drop junk rows
+                cleaned = cleaned.dropna(subset=["Date"])
+                cleaned = cleaned[cleaned["Client"] != ""].copy()
+    
+                # Save only real rows from current edited table
+                save_table(cleaned, UNENTERED_HOURS_FILE)
+    
+                push_to_github(
+                    "data/unentered_hours.csv",
+                    "Updated unentered hours backlog"
+                )
+    
+                st.success("Unentered hours saved. Totals are computed, not stored.")
+                st.rerun()
+    
+        # -----------------
+        # Mark as entered
+        # -----------------
+        with col_mark:
+    
+            detail_only = conform_table(edited_unentered, HOURS_SCHEMA)
+    
+            # Exclude TOTAL rows
+            detail_only = detail_only[
+                ~detail_only["Description"].str.upper().eq("TOTAL")
+            ].copy()
+    
+            detail_only = detail_only[detail_only["Client"] != ""].copy()
+    
+            clients_in_table = sorted(
+                detail_only["Client"]
+                .dropna()
+                .unique()
+                .tolist()
+            )
+    
+            if clients_in_table:
+                selected_client_to_enter = st.selectbox(
+                    "Mark entries as entered by client",
+                    clients_in_table,
+                    key="mark_unentered_client"
+                )
+    
+                if st.button("✓", key="mark_unentered_entered"):
+    
+                    to_post = detail_only[
+                        detail_only["Client"] == selected_client_to_enter
+                    ].copy()
+    
+                    # Load full unentered file again so clearing does not accidentally depend on filtered view
+                    full_unentered = load_table(UNENTERED_HOURS_FILE)
+                    hour_cols = list(HOURS_SCHEMA)
+    
+                    # Append to hours.csv (only the posted rows are written)
+                    append_table(to_post[hour_cols], HOURS_FILE)
+    
+                    # Remove only rows that were actually posted from the full unentered file
+                    rows_to_remove = full_unentered[hour_cols].merge(
+                        to_post[hour_cols].drop_duplicates(),
+                        on=hour_cols,
+                        how="left",
+                        indicator=True
+                    )["_merge"].eq("both").to_numpy()
+    
+                    remaining = full_unentered.loc[~rows_to_remove].copy()
+    
+                    save_table(remaining, UNENTERED_HOURS_FILE)
+    
+                    # Both files in one commit so the backlog and hours.csv never disagree
+                    commit_files_to_github(
+                        ["data/hours.csv", "data/unentered_hours.csv"],
+                        f"Entered hours for {selected_client_to_enter}"
+                    )
+    
+                    st.success(
+                        f"Hours for {selected_client_to_enter} marked as entered."
+                    )
+    
+                    st.rerun()
+    
+            else:
+                st.info("No unentered hours.")
+
+    unentered_hours_section()
+
+
+elif selected_page == "Reports":
+    st.title("Reports")
+
+    # -----------------------------
+    # File paths (use global constants where possible)
+    # -----------------------------
+    HOURS_FILE = os.path.join(DATA_DIR, "hours.csv")
+    DAYS_OFF_FILE = os.path.join(DATA_DIR, "days_off.csv")
+    CLIENTS_FILE = os.path.join(DATA_DIR, "clients.csv")
+    PERIOD_FILE = os.path.join(DATA_DIR, "period_settings.csv")
+    ARCHIVE_CLIENTS = os.path.join(DATA_DIR, "archive_clients.csv")
+
+    # -----------------------------
+    # Ensure required files exist (safe defaults)
+    # Missing hours/days off/client files load as empty tables (see load_table).
+    # -----------------------------
+    # period_settings.csv is single-row source of truth
+    if not os.path.exists(PERIOD_FILE):
+        # Create a default single-row period + goal
+        today_tmp = date.today()
+        save_table(pd.DataFrame([{
+            "StartDate": str(date(today_tmp.year, 1, 1)),
+            "EndDate": str(date(today_tmp.year, 12, 31)),
+            "HoursGoal": 0
+        }]), PERIOD_FILE)
+        push_to_github("data/period_settings.csv", "Initialized period_settings.csv (single row)")
+
+    # -----------------------------
+    # Load data (hours + time off are queried per date range from the SQLite store)
+    # -----------------------------
+    df_clients_active = load_table(CLIENTS_FILE)
+    df_archive = load_table(ARCHIVE_CLIENTS)
+
+    # Combine active + archive clients for charts/colors
+    df_clients = pd.concat([df_clients_active, df_archive], ignore_index=True)
+
+    # -----------------------------
+    # Load period settings (single row)
+    # -----------------------------
+    period_settings = load_table(PERIOD_FILE)
+
+    period_start = period_settings["StartDate"].iloc[0]
+    period_end = period_settings["EndDate"].iloc[0]
+    hours_goal = period_settings["HoursGoal"].iloc[0]
+
+    if pd.isna(period_start) or pd.isna(period_end) or pd.isna(hours_goal):
+        st.error("period_settings.csv must contain valid StartDate, EndDate, and HoursGoal (single row).")
+        st.stop()
+
+    period_start = period_start.date()
+    period_end = period_end.date()
+    hours_goal = float(hours_goal)
+
+    now = datetime.today()
+    today = now.date()
+
+    # -----------------------------
+    # Helper functions (business-day aware)
+    # -----------------------------
+    def business_days(start_d: date, end_d: date):
+        """Number of business days (Mon-Fri) between start_d and end_d inclusive."""
+        return int(busday_span(start_d, end_d))
+
+    def time_off_count(start_d: date, end_d: date):
+        """Count time off days in [start_d, end_d] that are business days (weekdays only)."""
+        return int(workday_counts(start_d, end_d)[1])
+
+    def clamp_to_period(start_d: date, end_d: date):
+        """Clamp a date range to the performance period."""
+        s = max(start_d, period_start)
+        e = min(end_d, period_end)
+        if s > e:
+            return None, None
+        return s, e
+
+    # -----------------------------
+    # Period-scoped slices
+    # -----------------------------
+    # Hours to date in period (only dates within [period_start, min(today, period_end)])
+    period_to_date_end = min(today, period_end)
+    if period_to_date_end < period_start:
+        hours_to_date_in_period = 0.0
+    else:
+        hours_to_date_in_period = hours_between(period_start, period_to_date_end)
+
+    remaining_hours_in_period = max(hours_goal - hours_to_date_in_period, 0.0)
+
+    # Remaining business days in period: "weekdays left" -> exclude today
+    remaining_start = max(period_start, (pd.Timestamp(today) + pd.Timedelta(days=1)).date())
+    remaining_bdays = business_days(remaining_start, period_end)
+    remaining_time_off = time_off_count(remaining_start, period_end) if remaining_bdays else 0
+    remaining_workdays = max(remaining_bdays - remaining_time_off, 0)
+
+    # BAN 1: Required Avg Hours/Day for remainder of period
+    if remaining_workdays > 0:
+        req_avg_hours_per_day = remaining_hours_in_period / remaining_workdays
+    else:
+        req_avg_hours_per_day = 0.0
+
+    # Week boundaries (Mon-Fri)
+    start_of_week = (pd.Timestamp(today) - pd.Timedelta(days=pd.Timestamp(today).weekday())).date()  # Monday
+    end_of_week = (pd.Timestamp(start_of_week) + pd.Timedelta(days=4)).date()  # Friday
+
+    # Clamp week to period
+    wk_s, wk_e = clamp_to_period(start_of_week, end_of_week)
+    if wk_s is None:
+        week_workdays_in_period = 0
+        time_off_this_week = 0
+        actual_hours_this_week = 0.0
+    else:
+        week_workdays_in_period = business_days(wk_s, wk_e)
+        time_off_this_week = time_off_count(wk_s, wk_e)
+        actual_hours_this_week = hours_between(wk_s, wk_e)
+
+    # BAN 2 & Row2 Goal week hours
+    goal_hours_this_week = req_avg_hours_per_day * max(week_workdays_in_period - time_off_this_week, 0)
+
+    # Month boundaries (calendar month)
+    month_start = date(today.year, today.month, 1)
+    month_end = date(today.year, today.month, calendar.monthrange(today.year, today.month)[1])
+
+    # Clamp month to period
+    mo_s, mo_e = clamp_to_period(month_start, month_end)
+    if mo_s is None:
+        month_workdays_in_period = 0
+        time_off_this_month = 0
+        actual_hours_this_month = 0.0
+    else:
+        month_workdays_in_period = business_days(mo_s, mo_e)
+        time_off_this_month = time_off_count(mo_s, mo_e)
+        actual_hours_this_month = hours_between(mo_s, min(today, mo_e))
+
+    # Month goal based on BAN daily requirement * planned working days in month (period-only, weekdays only)
+    month_goal_hours = req_avg_hours_per_day * max(month_workdays_in_period - time_off_this_month, 0)
+
+    # Remaining workdays in month (exclude today for "remaining")
+    remaining_month_start = max(mo_s, (pd.Timestamp(today) + pd.Timedelta(days=1)).date())
+    if mo_s is None or remaining_month_start > mo_e:
+        remaining_month_workdays = 0
+        remaining_month_time_off = 0
+    else:
+        rem_month_bdays = business_days(remaining_month_start, mo_e)
+        remaining_month_time_off = time_off_count(remaining_month_start, mo_e)
+        remaining_month_workdays = max(rem_month_bdays - remaining_month_time_off, 0)
+
+    # BAN 3: Required Avg Hours/Workday to hit THIS month's goal
+    remaining_month_hours_needed = max(month_goal_hours - actual_hours_this_month, 0.0)
+    if remaining_month_workdays > 0:
+        req_avg_hours_per_day_month = remaining_month_hours_needed / remaining_month_workdays
+    else:
+        req_avg_hours_per_day_month = 0.0
+
+    # Pace since start of period excluding time off (your Q10)
+    period_elapsed_end = min(today, period_end)
+    if period_elapsed_end < period_start:
+        pace_period = 0.0
+    else:
+        elapsed_bdays = business_days(period_start, period_elapsed_end)
+        elapsed_time_off = time_off_count(period_start, period_elapsed_end) if elapsed_bdays else 0
+        elapsed_workdays = max(elapsed_bdays - elapsed_time_off, 0)
+        if elapsed_workdays > 0:
+            pace_period = hours_to_date_in_period / elapsed_workdays
+        else:
+            pace_period = 0.0
+    
+     # ===========================
+    # BANS — WEEK / MONTH / PERIOD
+    # ===========================
+    
+    def ban_row(label, avg_req, goal, actual, delta_label, delta_value):
+        st.markdown(f"### {label}")
+        c1, c2, c3 = st.columns([2, 1, 1])
+    
+        with c1:
+            st.metric(
+                "Avg Hours / Day (Required)",
+                f"{avg_req:.2f}",
+                delta=f"{delta_label}: {delta_value:.2f}"
+            )
+        with c2:
+            st.metric("Goal Hours", f"{goal:.2f}")
+        with c3:
+            st.metric("Actual Hours", f"{actual:.2f}")
+    
+        st.markdown("---")
+    
+    
+    st.markdown('<div class="form-box">', unsafe_allow_html=True)
+    
+    # WEEK
+    remaining_week_days = max(week_workdays_in_period - time_off_this_week, 1)
+    req_avg_week = max(
+        (goal_hours_this_week - actual_hours_this_week) / remaining_week_days,
+        0
+    )
+    
+    ban_row(
+        "WEEK",
+        req_avg_week,
+        goal_hours_this_week,
+        actual_hours_this_week,
+        "Change since week start",
+        req_avg_week - req_avg_hours_per_day
+    )
+    
+    # MONTH
+    ban_row(
+        "MONTH",
+        req_avg_hours_per_day_month,
+        month_goal_hours,
+        actual_hours_this_month,
+        "Change since month start",
+        req_avg_hours_per_day_month - req_avg_hours_per_day
+    )
+    
+    # PERIOD
+    ban_row(
+        "PERIOD",
+        req_avg_hours_per_day,
+        hours_goal,
+        hours_to_date_in_period,
+        "Change since period start",
+        req_avg_hours_per_day - pace_period
+    )
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    # -----------------------------
+    # ROW 3: Weekly Snapshot (KEEP AS IS)
+    # -----------------------------
+    # Client colors map (safe fallback)
+    client_colors = {}
+    if "Client" in df_clients.columns:
+        if "Color" in df_clients.columns:
+            named_clients = df_clients.dropna(subset=["Client"])
+            client_colors = dict(zip(named_clients["Client"], named_clients["Color"]))
+
+    if "week_offset" not in st.session_state:
+        st.session_state.week_offset = 0
+
+    def shift_week(step):
+        st.session_state.week_offset += step
+
+    # Fragment: Previous / Next week reruns only this chart
+    @st.fragment
+    def weekly_snapshot(client_colors):
+        st.markdown('<div class="form-box">', unsafe_allow_html=True)
+        today_ts = pd.Timestamp.today()
+        start_of_week_ts = (today_ts + pd.Timedelta(weeks=st.session_state.week_offset)).normalize() - pd.Timedelta(days=today_ts.weekday())
+        end_of_week_ts = start_of_week_ts + pd.Timedelta(days=6)
+        week_label = f"{start_of_week_ts.strftime('%b %d')} - {end_of_week_ts.strftime('%b %d')}"
+
+        st.subheader(f"Weekly Snapshot: Billed Hours by Client ({week_label})")
+
+        nav_col1, nav_col2 = st.columns([1, 1])
+        with nav_col1:
+            st.button("⬅ Previous Week", on_click=shift_week, args=(-1,))
+        with nav_col2:
+            st.button("Next Week ➡", on_click=shift_week, args=(1,))
+
+        fig_weekly = weekly_snapshot_figure(start_of_week_ts, client_colors)
+        st.plotly_chart(fig_weekly, use_container_width=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    weekly_snapshot(client_colors)
+
+    # -----------------------------
+    # ROW 4: Monthly Planned vs Actual + Pie (30 days default + date range picker)
+    # -----------------------------
+    st.markdown('<div class="form-box">', unsafe_allow_html=True)
+    col_left, col_right = st.columns([2, 1])
+
+    # Build all-time monthly actuals (month boundaries in the daily hours index)
+    monthly_actual_all = monthly_hours()
+
+    # Build monthly planned for months in period only
+    # PlannedHours(month) = BAN1_req_avg_hours_per_day * (business days in month within period - time off in month within period)
+    # (all months counted in one pass, each window clamped to the period)
+    period_months = pd.date_range(start=period_start, end=period_end, freq="MS")
+    # Total business days in the full period
+    period_bdays, period_time_off = workday_counts(period_start, period_end)
+    period_total_workdays = max(int(period_bdays - period_time_off), 1)
+    month_starts = period_months.to_numpy(dtype="datetime64[D]")
+    month_ends = np.minimum((period_months + pd.offsets.MonthEnd(0)).to_numpy(dtype="datetime64[D]"), np.datetime64(period_end))
+    bdays_in_month, off_in_month = workday_counts(month_starts, month_ends)
+    workdays_in_month = np.maximum(bdays_in_month - off_in_month, 0)
+
+    planned_df = pd.DataFrame({
+        "MonthDate": period_months,
+        "PlannedHours": hours_goal * (workdays_in_month / period_total_workdays),
+    })
+
+    # Merge for plotting across the full timeline:
+    # - actual: all-time months
+    # - planned: only months in the performance period (others remain NaN)
+    merged_monthly = monthly_actual_all.merge(planned_df, on="MonthDate", how="left")
+    merged_monthly["MonthLabel"] = merged_monthly["MonthDate"].dt.strftime("%b %Y")
+
+    with col_left:
+        st.subheader("Monthly Actual vs Planned Hours")
+
+        fig_line = go.Figure()
+        # Planned line (only shows where PlannedHours exists)
+        fig_line.add_trace(go.Scatter(
+            x=merged_monthly["MonthLabel"],
+            y=merged_monthly["PlannedHours"],
+            mode="lines+markers",
+            name="Planned Hours (Period Only)",
+            line=dict(color="#ff0000", width=3),
+            marker=dict(color="#ff0000", size=8),
+            connectgaps=False
+        ))
+        # Actual line (all-time)
+        fig_line.add_trace(go.Scatter(
+            x=merged_monthly["MonthLabel"],
+            y=merged_monthly["ActualHours"],
+            mode="lines+markers",
+            name="Actual Hours (All Time)",
+            line=dict(color="#00ff2f", width=3),
+            marker=dict(color="#00ff2f", size=8)
+        ))
+
+        fig_line.update_layout(
+            showlegend=True,
+            plot_bgcolor="#0f0f23",
+            paper_bgcolor="#0f0f23",
+            font=dict(color="#FFFFFF", size=14),
+            xaxis=dict(type="category", title="Month", color="#FFFFFF", tickfont=dict(color="#FFFFFF"), showgrid=True, gridcolor="#FFFFFF"),
+            yaxis=dict(title="Hours", color="#FFFFFF", tickfont=dict(color="#FFFFFF"), showgrid=True, gridcolor="#FFFFFF"),
+            margin=dict(l=40, r=40, t=40, b=40)
+        )
+        st.plotly_chart(fig_line, use_container_width=True)
+
+    # Fragment: changing the pie range reruns only the pie
+    @st.fragment
+    def pie_by_client(client_colors):
+        st.subheader("Hours by Client (Rolling Window)")
+
+        # Default rolling 30-day window
+        default_end = date.today()
+        default_start = (pd.Timestamp(default_end) - pd.Timedelta(days=30)).date()
+
+        pie_start, pie_end = st.date_input(
+            "Pie Date Range",
+            value=(default_start, default_end),
+            key="pie_date_range"
+        )
+
+        # Ensure correct ordering
+        if pie_start > pie_end:
+            st.error("Pie start date must be on or before end date.")
+            filtered_pie = pd.DataFrame(columns=["Client", "Hours"])
+        else:
+            pie_hours = hours_by_client(pie_start, pie_end)
+            filtered_pie = pie_hours[pie_hours != 0].rename_axis("Client").reset_index(name="Hours")
+
+        if len(filtered_pie) > 0:
+            pie_fig = px.pie(
+                filtered_pie,
+                names="Client",
+                values="Hours",
+                color="Client",
+                color_discrete_map=client_colors if client_colors else None
+            )
+            pie_fig.update_layout(
+                showlegend=True,
+                plot_bgcolor="#0f0f23",
+                paper_bgcolor="#0f0f23",
+                font=dict(color="#FFFFFF", size=14),
+                legend=dict(font=dict(color="#FFFFFF", size=14), orientation="v", x=1.05, y=0.5, bgcolor="rgba(0,0,0,0)")
+            )
+            st.plotly_chart(pie_fig, use_container_width=True)
+        else:
+            st.info("No hours logged in the selected pie date range.")
+
+    with col_right:
+        pie_by_client(client_colors)
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+
+
+
+
+
+
+
+    
+
+
+
+
+elif selected_page == "Data Entry":
+    st.title("History")
+
+    # Load data (cached + normalised; hours / todos are queried per client filter below)
+    df_clients = load_table(CLIENTS_FILE)
+    df_categories = load_table(CATEGORIES_FILE)
+
+    #--------------------------
+    # Enter data
+    #--------------------------
+    #--------------------------
+    # Enter data
+    #--------------------------
+    st.subheader("Add Client Category")
+    
+    col1, col2, col3 = st.columns([2, 2, 1])
+    
+    with col1:
+        category_client = st.selectbox(
+            "Client",
+            df_clients["Client"].tolist(),
+            key="de_category_client"   # unique key (avoid collisions with other pages)
+        )
+    
+    with col2:
+        category_name = st.text_input(
+            "Category",
+            key="de_category_name"
+        )
+    
+    with col3:
+        if st.button("Save Category", key="de_save_category"):
+            if str(category_name).strip() == "":
+                st.error("Category cannot be blank.")
+            else:
+                # Only store what categories.csv actually needs: Client + Category
+                new_row = {"Client": str(category_client), "Category": str(category_name).strip()}
+                df_categories = pd.concat([df_categories, pd.DataFrame([new_row])], ignore_index=True)
+    
+                # Optional: prevent duplicates (same client/category)
+                df_categories = df_categories.drop_duplicates(subset=["Client", "Category"]).reset_index(drop=True)
+    
+                # Save correct dataframe -> correct file
+                save_table(df_categories, CATEGORIES_FILE)
+    
+                # Push correct file
+                push_to_github("data/categories.csv", "Added/updated category")
+    
+                st.success("Hours logged successfully!")
+
+    # -------------------------
+    # Client Filter
+    # -------------------------
+    st.markdown('\n', unsafe_allow_html=True)
+    # -------------------------
+    # Time Off (PTO) Section
+    # -------------------------
+    st.markdown("\n", unsafe_allow_html=True)
+    st.subheader("Time Off")
+    
+    # Load days_off.csv (empty table if missing; Date parsed by the loader)
+    days_off_df = load_table(DAYS_OFF_FILE)
+    days_off_df = days_off_df.dropna(subset=["Date"]).copy()
+    
+    left_col, right_col = st.columns(2)
+    
+    with left_col:
+        st.markdown("### Add Time Off")
+    
+        start_date = st.date_input("Start Date", value=date.today(), key="pto_start_date")
+        end_date = st.date_input("End Date", value=date.today(), key="pto_end_date")
+        weekdays_only = st.checkbox("Weekdays only (Mon–Fri)", value=True, key="pto_weekdays_only")
+    
+        if start_date > end_date:
+            st.error("Start Date must be on or before End Date.")
+        else:
+            if st.button("Save Time Off", key="save_time_off"):
+                # Expand range into individual dates (stored as one row per date)
+                rng = pd.date_range(start=start_date, end=end_date, freq="D")
+                if weekdays_only:
+                    rng = [d for d in rng if d.weekday() < 5]  # Mon-Fri only
+    
+                new_dates = pd.DataFrame({"Date": [d.strftime("%Y-%m-%d") for d in rng]})
+    
+                # Combine + de-duplicate
+                combined = pd.concat(
+                    [days_off_df.assign(Date=days_off_df["Date"].dt.strftime("%Y-%m-%d")), new_dates],
+                    ignore_index=True
+                ).drop_duplicates(subset=["Date"])
+    
+                # Save back (keep schema: Date)
+                combined = combined.sort_values("Date").reset_index(drop=True)
+                save_table(combined, DAYS_OFF_FILE)
+    
+                # Push to GitHub (optional; uses your existing helper)
+                push_to_github("data/days_off.csv", "Updated days off / time off")
+    
+                st.success("Time off saved!")
+    
+    with right_col:
+        st.markdown("### Upcoming Time Off (Editable)")
+    
+        # Build an editable view of upcoming time off dates
+        today_dt = pd.to_datetime(date.today())
+        upcoming_df = days_off_df[days_off_df["Date"] >= today_dt].copy()
+        upcoming_df = upcoming_df.sort_values("Date").reset_index(drop=True)
+    
+        # Display as strings for editing consistency
+        upcoming_display = upcoming_df.copy()
+        upcoming_display["Date"] = upcoming_display["Date"].dt.strftime("%Y-%m-%d")
+    
+        edited_upcoming = st.data_editor(
+            upcoming_display[["Date"]],
+            num_rows="dynamic",        # allows delete rows + add rows
+            hide_index=True,
+            key="pto_upcoming_editor"
+        )
+    
+        col_save, col_delete = st.columns([1, 1])
+    
+        with col_save:
+            if st.button("Save Upcoming Changes", key="pto_save_upcoming"):
+                # Clean + validate
+                cleaned = conform_table(edited_upcoming.dropna(how="all"), DAYS_OFF_SCHEMA)
+                cleaned = cleaned.dropna(subset=["Date"]).copy()
+    
+                # Enforce weekdays only
+                cleaned = cleaned[cleaned["Date"].dt.weekday < 5].copy()
+    
+                # Merge back with past time-off dates (so editing upcoming doesn't wipe history)
+                past_df = days_off_df[days_off_df["Date"] < today_dt].copy()
+                combined = pd.concat([past_df, cleaned], ignore_index=True)
+    
+                # De-dupe + sort
+                combined = combined.drop_duplicates(subset=["Date"]).sort_values("Date").reset_index(drop=True)
+    
+                save_table(combined, DAYS_OFF_FILE)
+                push_to_github("data/days_off.csv", "Updated upcoming time off (editable table)")
+                st.success("Upcoming time off updated!")
+    
+        with col_delete:
+            # Optional: quick multi-delete without editing rows
+            if len(upcoming_display) > 0:
+                to_delete = st.multiselect(
+                    "Delete selected dates",
+                    upcoming_display["Date"].tolist(),
+                    key="pto_delete_dates"
+                )
+                if st.button("Delete Selected", key="pto_delete_selected"):
+                    if to_delete:
+                        remaining = days_off_df.copy()
+                        remaining["DateStr"] = remaining["Date"].dt.strftime("%Y-%m-%d")
+                        remaining = remaining[~remaining["DateStr"].isin(to_delete)].copy()
+                        remaining = remaining.drop(columns=["DateStr"])
+                        remaining = remaining.drop_duplicates(subset=["Date"]).sort_values("Date").reset_index(drop=True)
+    
+                        save_table(remaining, DAYS_OFF_FILE)
+                        push_to_github("data/days_off.csv", "Deleted selected time off dates")
+                        st.success("Selected dates deleted!")
+                    else:
+                        st.info("No dates selected.")
+            else:
+                st.info("No upcoming time off saved.")
+
+    st.subheader("Filter by Client")
+    all_clients = query_db(
+        f"SELECT Client FROM {db_table(HOURS_FILE)} WHERE Client != '' "
+        f"UNION SELECT Client FROM {db_table(TODOS_FILE)} WHERE Client != '' "
+        f"UNION SELECT Client FROM {db_table(COMPLETED_TODOS_FILE)} WHERE Client != '' ORDER BY Client"
+    )["Client"].tolist()
+    selected_clients = st.multiselect("Select Clients", all_clients, default=all_clients)
+    st.markdown('\n', unsafe_allow_html=True)
+
+    # Apply client filter (indexed IN query; no selection = every row)
+    client_filter, client_params = "1 = 1", ()
+    if len(selected_clients) > 0:
+        client_filter, client_params = f"Client IN ({sql_placeholders(selected_clients)})", tuple(selected_clients)
+
+    # -------------------------
+    # Search Filter
+    # -------------------------
+    st.markdown('\n', unsafe_allow_html=True)
+    col_search, col_mode = st.columns([4, 1])
+    with col_search:
+        search_query = st.text_input("Search (applies to both tables):").strip().lower()
+    with col_mode:
+        search_mode = st.radio("Match", SEARCH_MODES, horizontal=True, key="search_mode")
+
+    # Client filter + search in one indexed query per table (search reads the prebuilt _search column)
+    search_clause, search_params = sql_search(search_query, search_mode)
+    history_filter = f"{client_filter} AND {search_clause}"
+    history_params = tuple(client_params) + search_params
+    hours_count = count_table(HOURS_FILE, history_filter, history_params)
+    # Open tasks only; completed ones are paged from their store below
+    open_todos_count = count_table(TODOS_FILE, history_filter, history_params)
+
+    # -------------------------
+    # Editable Hours + To-Do History
+    # -------------------------
+    # Both histories are read one page at a time, sorted in SQL, so what each
+    # rerun sends to the browser is bounded by the page size, not the history.
+    # Saving replaces only the rows on the page (save_shown_rows). Blank
+    # values sort last either way, as pandas' sort_values did.
+    HISTORY_PAGE_SIZES = [25, 50, 100, 250]
+    HOURS_SORTS = {
+        "Date (Newest)": "Date IS NULL, Date DESC",
+        "Date (Oldest)": "Date IS NULL, Date ASC",
+        "Hours (High to Low)": "Hours IS NULL, Hours DESC",
+        "Hours (Low to High)": "Hours IS NULL, Hours ASC",
+    }
+    TODO_SORTS = {
+        "Priority (High to Low)": "Priority IS NULL, Priority DESC",
+        "Priority (Low to High)": "Priority IS NULL, Priority ASC",
+        "Date Created (Newest)": "DateCreated IS NULL, DateCreated DESC",
+        "Date Created (Oldest)": "DateCreated IS NULL, DateCreated ASC",
+    }
+    st.markdown('\n', unsafe_allow_html=True)
+    history_page_size = st.selectbox("Rows per page", HISTORY_PAGE_SIZES, index=1, key="history_page_size")
+    col1, col2 = st.columns(2)
+
+    # Editable Hours History
+    with col1:
+        st.subheader("Logged Hours History")
+        if hours_count == 0:
+            st.info("No hours logged for selected client(s) or search term.")
+        else:
+            sort_hours_by = st.selectbox("Sort Hours By", list(HOURS_SORTS))
+
+            page_count = max(-(-hours_count // history_page_size), 1)
+            # A narrower filter / bigger page can leave the cursor past the last page
+            if st.session_state.get("hours_history_page", 1) > page_count:
+                st.session_state["hours_history_page"] = page_count
+            page = st.number_input(
+                f"Hours ({hours_count}), page (of {page_count})",
+                min_value=1, max_value=page_count, step=1, key="hours_history_page"
+            )
+            hours_page = query_table(
+                HOURS_FILE, history_filter, history_params, order_by=HOURS_SORTS[sort_hours_by],
+                limit=history_page_size, offset=(page - 1) * history_page_size,
+            )
+
+            edited_hours = st.data_editor(
+                hours_page[["Date", "Client", "Hours", "Description"]],
+                num_rows="dynamic", width="stretch", hide_index=True,
+                key=f"hours_history_editor_{page}"
+            )
+
+            if st.button("Save Hours Changes"):
+                cleaned_hours = edited_hours.dropna(how="all")
+                cleaned_hours = cleaned_hours[(cleaned_hours != "").any(axis=1)]
+                if save_shown_rows(HOURS_FILE, [(hours_page, cleaned_hours)]):
+                    push_to_github("data/hours.csv", "Updated hours history (removed empty rows)")
+                st.success("Hours history updated! Empty rows deleted.")
+
+    # Editable To-Do History
+    with col2:
+        st.subheader("To-Do History")
+
+        # Completed tasks: counted + read one page at a time, filtered in SQL
+        completed_filter, completed_params = history_filter, history_params
+        completed_count = count_table(COMPLETED_TODOS_FILE, completed_filter, completed_params)
+
+        if open_todos_count == 0 and completed_count == 0:
+            st.info("No tasks recorded for selected client(s) or search term.")
+        else:
+            sort_todos_by = st.selectbox("Sort To-Dos By", list(TODO_SORTS))
+            # Open tasks are the small hot store, shown whole
+            filtered_todos = query_table(
+                TODOS_FILE, history_filter, history_params, order_by=TODO_SORTS[sort_todos_by]
+            )
+            todo_cols = ["Client", "Category", "Task", "Priority", "DateCreated", "DateCompleted", "Notes"]
+
+            st.caption(f"Open ({len(filtered_todos)})")
+            edited_todos = st.data_editor(
+                filtered_todos[todo_cols].reset_index(drop=True),
+                num_rows="dynamic", width="stretch", hide_index=True
+            )
+
+            page_count = max(-(-completed_count // history_page_size), 1)
+            if st.session_state.get("completed_todos_page", 1) > page_count:
+                st.session_state["completed_todos_page"] = page_count
+            page = st.number_input(
+                f"Completed ({completed_count}), page (of {page_count})",
+                min_value=1, max_value=page_count, step=1, key="completed_todos_page"
+            )
+            completed_page = query_table(
+                COMPLETED_TODOS_FILE, completed_filter, completed_params,
+                order_by=TODO_SORTS[sort_todos_by],
+                limit=history_page_size, offset=(page - 1) * history_page_size,
+            )
+            edited_completed = st.data_editor(
+                completed_page[todo_cols],
+                num_rows="dynamic", width="stretch", hide_index=True,
+                key=f"completed_todos_editor_{page}"
+            )
+
+            if st.button("Save To-Do Changes"):
+                editors = []
+                for shown, edited in [(filtered_todos, edited_todos), (completed_page, edited_completed)]:
+                    cleaned = edited.dropna(how="all")
+                    editors.append((shown, cleaned[(cleaned != "").any(axis=1)]))
+                # Only the rows shown (open + this completed page) are replaced
+                saved_files = save_todo_rows(editors)
+                if saved_files:
+                    commit_files_to_github(saved_files, "Updated To-Do history (removed empty rows)")
+                st.success("To-Do history updated! Empty rows deleted.")
+
+    # =========================================================
+    # Period Settings (Bottom of Data Entry)
+    # =========================================================
+    st.markdown("\n", unsafe_allow_html=True)
+    st.subheader("Performance Period Settings")
+    
+    # Loader strips header whitespace (your " HoursGoal" header), ensures the
+    # columns exist and coerces dates + HoursGoal (handles " 653")
+    period_df = load_table(PERIOD_FILE)
+    
+    # Default values (use first row if it exists)
+    default_start = period_df["StartDate"].iloc[0].date() if len(period_df) > 0 and pd.notna(period_df["StartDate"].iloc[0]) else date.today()
+    default_end = period_df["EndDate"].iloc[0].date() if len(period_df) > 0 and pd.notna(period_df["EndDate"].iloc[0]) else date.today()
+    default_goal = float(period_df["HoursGoal"].iloc[0]) if len(period_df) > 0 and pd.notna(period_df["HoursGoal"].iloc[0]) else 0.0
+    
+    # Quick entry row (start/end/hours + save)
+    c1, c2, c3, c4 = st.columns([1, 1, 1, 1])
+    with c1:
+        ps_start = st.date_input("Start Date", value=default_start, key="ps_start")
+    with c2:
+        ps_end = st.date_input("End Date", value=default_end, key="ps_end")
+    with c3:
+        ps_goal = st.number_input("Hours Goal", min_value=0.0, step=1.0, value=default_goal, key="ps_goal")
+    with c4:
+        if st.button("Save Period", key="ps_save_period", use_container_width=True):
+            if ps_start > ps_end:
+                st.error("Start Date must be on or before End Date.")
+            else:
+                # Store as a single-row settings file (overwrite row 0)
+                new_settings = pd.DataFrame([{
+                    "StartDate": ps_start.strftime("%Y-%m-%d"),
+                    "EndDate": ps_end.strftime("%Y-%m-%d"),
+                    "HoursGoal": ps_goal
+                }])
+    
+                save_table(new_settings, PERIOD_FILE)
+                push_to_github("data/period_settings.csv", "Updated period settings (dates + hours goal)")
+                st.success("Period settings saved!")
+    
+    # Editable view (for quick edits)
+    st.markdown("### Edit period_settings.csv")
+    editable = period_df.copy()
+    # Convert back to strings for display/editing
+    editable["StartDate"] = editable["StartDate"].dt.strftime("%Y-%m-%d")
+    editable["EndDate"] = editable["EndDate"].dt.strftime("%Y-%m-%d")
+    editable["HoursGoal"] = editable["HoursGoal"].fillna(0)
+    
+    edited_period = st.data_editor(
+        editable[["StartDate", "EndDate", "HoursGoal"]],
+        num_rows="dynamic",
+        hide_index=True,
+        key="ps_editor"
+    )
+    
+    if st.button("Save Period Settings Changes", key="ps_save_editor"):
+        # Validate and coerce
+        cleaned = conform_table(edited_period.dropna(how="all"), PERIOD_SCHEMA)
+        cleaned["HoursGoal"] = cleaned["HoursGoal"].fillna(0)
+    
+        cleaned = cleaned.dropna(subset=["StartDate", "EndDate"])
+    
+        # Validate date order per row
+        bad_rows = cleaned[cleaned["StartDate"] > cleaned["EndDate"]]
+        if len(bad_rows) > 0:
+            st.error("One or more rows have StartDate after EndDate. Fix and try again.")
+        else:
+            save_table(cleaned.reset_index(drop=True), PERIOD_FILE)
+            push_to_github("data/period_settings.csv", "Edited period settings table")
+            st.success("period_settings.csv updated!")
+
+
+
+
+elif selected_page == "Archive":
+    st.title("Archive Clients")
+
+    # Load active data
+    df_clients = load_table(CLIENTS_FILE)
+
+    # Archive file paths
+    ARCHIVE_CLIENTS = os.path.join(DATA_DIR, "archive_clients.csv")
+    ARCHIVE_TODOS = os.path.join(DATA_DIR, "archive_todos.csv")
+    ARCHIVE_HOURS = os.path.join(DATA_DIR, "archive_hours.csv")
+
+    # Ensure archive hours exist (the per-client archive tables live in the client manifest)
+    if not table_exists(ARCHIVE_HOURS):
+        save_table(empty_table(table_schema(ARCHIVE_HOURS)), ARCHIVE_HOURS)
+
+    # Load archive data
+    df_archive_clients = load_table(ARCHIVE_CLIENTS)
+
+    # -------------------------------
+    # Archive Client Action
+    # -------------------------------
+    st.markdown('<div class="form-box">', unsafe_allow_html=True)
+    st.subheader("Archive a Client")
+    if len(df_clients) == 0:
+        st.warning("No clients available to archive.")
+    else:
+        selected_client = st.selectbox("Select Client to Archive", df_clients["Client"].tolist(), key="archive_client")
+        if st.button("Archive Client"):
+            # Move the client's clients/categories/todos files to data/archive/ (no rows rewritten)
+            moved_files = set_client_status(selected_client, "archived")
+
+            # Push to GitHub (single commit)
+            commit_files_to_github(moved_files, f"Archived client {selected_client}")
+
+            st.success(f"Client '{selected_client}' archived successfully!")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # -------------------------------
+    # Undo Archive Client Action
+    # -------------------------------
+    st.markdown('<div class="form-box">', unsafe_allow_html=True)
+    st.subheader("Undo Archive")
+    if len(df_archive_clients) == 0:
+        st.warning("No archived clients available.")
+    else:
+        undo_client = st.selectbox("Select Archived Client to Restore", df_archive_clients["Client"].tolist(), key="undo_client")
+        if st.button("Restore Client"):
+            # Move the client's files back to active
+            moved_files = set_client_status(undo_client, "active")
+
+            # Hours archived by older versions still sit in archive_hours.csv
+            restored_hours = query_table(ARCHIVE_HOURS, "Client = ?", (undo_client,))
+            if len(restored_hours) > 0:
+                append_table(restored_hours, HOURS_FILE)
+                save_table(query_table(ARCHIVE_HOURS, "Client != ?", (undo_client,)), ARCHIVE_HOURS)
+                moved_files += ["data/hours.csv", "data/archive_hours.csv"]
+
+            # Push to GitHub (single commit)
+            commit_files_to_github(moved_files, f"Restored client {undo_client}")
+
+            st.success(f"Client '{undo_client}' restored successfully!")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # -------------------------------
+    # Edit Client Colors
+    # -------------------------------
+    st.markdown('<div class="form-box">', unsafe_allow_html=True)
+    st.subheader("Edit Client Colors")
+    if len(df_clients) > 0:
+        for i, row in df_clients.iterrows():
+            col1, col2 = st.columns([2, 1])
+            with col1:
+                st.text(row["Client"])
+            with col2:
+                default_color = (
+                    row["Color"]
+                    if isinstance(row["Color"], str) and row["Color"].startswith("#") and len(row["Color"]) == 7
+                    else "#1f77b4"
+                )
+                
+                new_color = st.color_picker("", default_color, key=f"color_{i}")
+                df_clients.at[i, "Color"] = new_color
+        if st.button("Save Color Changes"):
+            save_table(df_clients, CLIENTS_FILE)
+            st.success("Client colors updated!")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # -------------------------------
+    # Show Archive History Tables
+    # -------------------------------
+    st.markdown('<div class="form-box">', unsafe_allow_html=True)
+    st.subheader("Archive History")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("### Archived Hours")
+        st.dataframe(query_table(ARCHIVE_HOURS, order_by="Date DESC"), width="stretch", hide_index=True)
+    with col2:
+        st.markdown("### Archived To-Dos")
+        archived_todos = pd.concat([
+            query_table(ARCHIVE_TODOS, order_by="DateCreated DESC"),
+            query_table(ARCHIVE_COMPLETED_TODOS_FILE, order_by="DateCreated DESC"),
+        ], ignore_index=True).sort_values("DateCreated", ascending=False, kind="stable")
+        st.dataframe(archived_todos[
+            ["Client", "Category", "Task", "Priority", "DateCreated", "DateCompleted"]
+        ], width="stretch", hide_index=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+